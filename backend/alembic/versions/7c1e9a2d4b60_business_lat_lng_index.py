@@ -0,0 +1,28 @@
+"""business lat/lng index
+
+Revision ID: 7c1e9a2d4b60
+Revises: 40a725fcc4e5
+Create Date: 2026-10-17 09:12:41.203518
+
+"""
+from typing import Sequence, Union
+
+from alembic import op
+import sqlalchemy as sa
+
+
+# revision identifiers, used by Alembic.
+revision: str = '7c1e9a2d4b60'
+down_revision: Union[str, Sequence[str], None] = '40a725fcc4e5'
+branch_labels: Union[str, Sequence[str], None] = None
+depends_on: Union[str, Sequence[str], None] = None
+
+
+def upgrade() -> None:
+    """Upgrade schema."""
+    op.create_index('ix_businesses_lat_lng', 'businesses', ['lat', 'lng'], unique=False)
+
+
+def downgrade() -> None:
+    """Downgrade schema."""
+    op.drop_index('ix_businesses_lat_lng', table_name='businesses')
@@ -0,0 +1,44 @@
+"""import batch background jobs
+
+Revision ID: a7d3e9b14c52
+Revises: f5a2c8d03b71
+Create Date: 2026-10-17 18:02:11.530844
+
+"""
+from typing import Sequence, Union
+
+from alembic import op
+import sqlalchemy as sa
+
+
+# revision identifiers, used by Alembic.
+revision: str = 'a7d3e9b14c52'
+down_revision: Union[str, Sequence[str], None] = 'f5a2c8d03b71'
+branch_labels: Union[str, Sequence[str], None] = None
+depends_on: Union[str, Sequence[str], None] = None
+
+
+def upgrade() -> None:
+    """Upgrade schema."""
+    op.add_column('import_batches', sa.Column('status', sa.String(), server_default='COMPLETE', nullable=False))
+    op.add_column('import_batches', sa.Column('processed_rows', sa.Integer(), server_default='0', nullable=False))
+    op.add_column('import_batches', sa.Column('expected_rows', sa.Integer(), nullable=True))
+    op.add_column('import_batches', sa.Column('error_message', sa.String(), nullable=True))
+    op.add_column('import_batches', sa.Column('upload_path', sa.String(), nullable=True))
+    op.add_column('import_batches', sa.Column('started_at', sa.DateTime(), nullable=True))
+    op.add_column('import_batches', sa.Column('finished_at', sa.DateTime(), nullable=True))
+    op.create_index(op.f('ix_import_batches_status'), 'import_batches', ['status'], unique=False)
+    # Batches imported before jobs existed were fully read in one request.
+    op.execute('UPDATE import_batches SET processed_rows = total_rows')
+
+
+def downgrade() -> None:
+    """Downgrade schema."""
+    op.drop_index(op.f('ix_import_batches_status'), table_name='import_batches')
+    op.drop_column('import_batches', 'finished_at')
+    op.drop_column('import_batches', 'started_at')
+    op.drop_column('import_batches', 'upload_path')
+    op.drop_column('import_batches', 'error_message')
+    op.drop_column('import_batches', 'expected_rows')
+    op.drop_column('import_batches', 'processed_rows')
+    op.drop_column('import_batches', 'status')
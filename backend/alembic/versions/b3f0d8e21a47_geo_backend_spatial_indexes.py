@@ -0,0 +1,74 @@
+"""geo backend spatial indexes
+
+Revision ID: b3f0d8e21a47
+Revises: 7c1e9a2d4b60
+Create Date: 2026-10-17 13:40:05.118274
+
+"""
+from typing import Sequence, Union
+
+from alembic import op
+import sqlalchemy as sa
+
+
+# revision identifiers, used by Alembic.
+revision: str = 'b3f0d8e21a47'
+down_revision: Union[str, Sequence[str], None] = '7c1e9a2d4b60'
+branch_labels: Union[str, Sequence[str], None] = None
+depends_on: Union[str, Sequence[str], None] = None
+
+# The DDL as of this revision, copied from app/geo_backend.py so later edits
+# there do not change what this migration does.
+POSTGRES_EARTHDISTANCE_DDL = [
+    'CREATE EXTENSION IF NOT EXISTS cube',
+    'CREATE EXTENSION IF NOT EXISTS earthdistance',
+    'CREATE INDEX IF NOT EXISTS ix_businesses_earth ON businesses USING gist (ll_to_earth(lat, lng))'
+    ' WHERE lat IS NOT NULL AND lng IS NOT NULL',
+]
+
+SQLITE_RTREE_DDL = [
+    'CREATE VIRTUAL TABLE IF NOT EXISTS businesses_rtree USING rtree(id, min_lat, max_lat, min_lng, max_lng)',
+    """CREATE TRIGGER IF NOT EXISTS businesses_rtree_ai AFTER INSERT ON businesses
+            WHEN new.lat IS NOT NULL AND new.lng IS NOT NULL
+            BEGIN
+                INSERT OR REPLACE INTO businesses_rtree VALUES (new.id, new.lat, new.lat, new.lng, new.lng);
+            END""",
+    """CREATE TRIGGER IF NOT EXISTS businesses_rtree_au AFTER UPDATE OF lat, lng ON businesses
+            BEGIN
+                DELETE FROM businesses_rtree WHERE id = old.id;
+                INSERT INTO businesses_rtree SELECT new.id, new.lat, new.lat, new.lng, new.lng
+                    WHERE new.lat IS NOT NULL AND new.lng IS NOT NULL;
+            END""",
+    """CREATE TRIGGER IF NOT EXISTS businesses_rtree_ad AFTER DELETE ON businesses
+            BEGIN
+                DELETE FROM businesses_rtree WHERE id = old.id;
+            END""",
+]
+
+SQLITE_RTREE_BACKFILL = (
+    'INSERT OR REPLACE INTO businesses_rtree SELECT id, lat, lat, lng, lng FROM businesses'
+    ' WHERE lat IS NOT NULL AND lng IS NOT NULL'
+)
+
+
+def upgrade() -> None:
+    """Upgrade schema."""
+    dialect = op.get_bind().dialect.name
+    if dialect == 'postgresql':
+        for stmt in POSTGRES_EARTHDISTANCE_DDL:
+            op.execute(stmt)
+    elif dialect == 'sqlite':
+        for stmt in SQLITE_RTREE_DDL:
+            op.execute(stmt)
+        op.execute(SQLITE_RTREE_BACKFILL)
+
+
+def downgrade() -> None:
+    """Downgrade schema."""
+    dialect = op.get_bind().dialect.name
+    if dialect == 'postgresql':
+        op.execute('DROP INDEX IF EXISTS ix_businesses_earth')
+    elif dialect == 'sqlite':
+        for suffix in ('ai', 'au', 'ad'):
+            op.execute(f'DROP TRIGGER IF EXISTS businesses_rtree_{suffix}')
+        op.execute('DROP TABLE IF EXISTS businesses_rtree')
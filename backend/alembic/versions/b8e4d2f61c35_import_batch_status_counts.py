@@ -0,0 +1,45 @@
+"""import batch status counts
+
+Revision ID: b8e4d2f61c35
+Revises: e6f1b7c94d23
+Create Date: 2026-10-17 22:03:17.642091
+
+"""
+from typing import Sequence, Union
+
+from alembic import op
+import sqlalchemy as sa
+
+
+# revision identifiers, used by Alembic.
+revision: str = 'b8e4d2f61c35'
+down_revision: Union[str, Sequence[str], None] = 'e6f1b7c94d23'
+branch_labels: Union[str, Sequence[str], None] = None
+depends_on: Union[str, Sequence[str], None] = None
+
+COUNTERS = {
+    'READY': 'ready_count',
+    'NEEDS_GEOCODE': 'needs_geocode_count',
+    'NEEDS_FIX': 'needs_fix_count',
+    'DUPLICATE_PENDING': 'duplicate_pending_count',
+    'APPROVED': 'approved_count',
+    'REJECTED': 'rejected_count',
+    'MERGED': 'merged_count',
+}
+
+
+def upgrade() -> None:
+    """Upgrade schema."""
+    for column in COUNTERS.values():
+        op.add_column('import_batches', sa.Column(column, sa.Integer(), server_default='0', nullable=False))
+    for status, column in COUNTERS.items():
+        op.execute(
+            f"UPDATE import_batches SET {column} = (SELECT COUNT(*) FROM import_items "
+            f"WHERE import_items.batch_id = import_batches.id AND import_items.status = '{status}')"
+        )
+
+
+def downgrade() -> None:
+    """Downgrade schema."""
+    for column in reversed(list(COUNTERS.values())):
+        op.drop_column('import_batches', column)
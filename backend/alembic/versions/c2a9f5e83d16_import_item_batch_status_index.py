@@ -0,0 +1,28 @@
+"""import item batch/status/id index
+
+Revision ID: c2a9f5e83d16
+Revises: b8e4d2f61c35
+Create Date: 2026-10-17 22:41:52.118406
+
+"""
+from typing import Sequence, Union
+
+from alembic import op
+import sqlalchemy as sa
+
+
+# revision identifiers, used by Alembic.
+revision: str = 'c2a9f5e83d16'
+down_revision: Union[str, Sequence[str], None] = 'b8e4d2f61c35'
+branch_labels: Union[str, Sequence[str], None] = None
+depends_on: Union[str, Sequence[str], None] = None
+
+
+def upgrade() -> None:
+    """Upgrade schema."""
+    op.create_index('ix_import_items_batch_status_id', 'import_items', ['batch_id', 'status', 'id'], unique=False)
+
+
+def downgrade() -> None:
+    """Downgrade schema."""
+    op.drop_index('ix_import_items_batch_status_id', table_name='import_items')
@@ -0,0 +1,44 @@
+"""geocode cache
+
+Revision ID: c4b8f1e27a90
+Revises: a7d3e9b14c52
+Create Date: 2026-10-17 19:11:47.208163
+
+"""
+from typing import Sequence, Union
+
+from alembic import op
+import sqlalchemy as sa
+
+
+# revision identifiers, used by Alembic.
+revision: str = 'c4b8f1e27a90'
+down_revision: Union[str, Sequence[str], None] = 'a7d3e9b14c52'
+branch_labels: Union[str, Sequence[str], None] = None
+depends_on: Union[str, Sequence[str], None] = None
+
+
+def upgrade() -> None:
+    """Upgrade schema."""
+    op.create_table(
+        'geocode_cache',
+        sa.Column('id', sa.Integer(), nullable=False),
+        sa.Column('query', sa.String(), nullable=False),
+        sa.Column('provider', sa.String(), nullable=False),
+        sa.Column('lat', sa.Float(), nullable=True),
+        sa.Column('lng', sa.Float(), nullable=True),
+        sa.Column('miss', sa.Boolean(), nullable=False),
+        sa.Column('fetched_at', sa.DateTime(), nullable=False),
+        sa.PrimaryKeyConstraint('id'),
+    )
+    op.create_index('ux_geocode_cache_query_provider', 'geocode_cache', ['query', 'provider'], unique=True)
+    op.add_column('import_batches', sa.Column('geocode_lookups', sa.Integer(), server_default='0', nullable=False))
+    op.add_column('import_batches', sa.Column('geocode_cache_hits', sa.Integer(), server_default='0', nullable=False))
+
+
+def downgrade() -> None:
+    """Downgrade schema."""
+    op.drop_column('import_batches', 'geocode_cache_hits')
+    op.drop_column('import_batches', 'geocode_lookups')
+    op.drop_index('ux_geocode_cache_query_provider', table_name='geocode_cache')
+    op.drop_table('geocode_cache')
@@ -0,0 +1,28 @@
+"""business lower(name) index
+
+Revision ID: d93a6c0e5f28
+Revises: c4b8f1e27a90
+Create Date: 2026-10-17 19:48:05.731562
+
+"""
+from typing import Sequence, Union
+
+from alembic import op
+import sqlalchemy as sa
+
+
+# revision identifiers, used by Alembic.
+revision: str = 'd93a6c0e5f28'
+down_revision: Union[str, Sequence[str], None] = 'c4b8f1e27a90'
+branch_labels: Union[str, Sequence[str], None] = None
+depends_on: Union[str, Sequence[str], None] = None
+
+
+def upgrade() -> None:
+    """Upgrade schema."""
+    op.create_index('ix_businesses_name_lower', 'businesses', [sa.text('lower(name)')], unique=False)
+
+
+def downgrade() -> None:
+    """Downgrade schema."""
+    op.drop_index('ix_businesses_name_lower', table_name='businesses')
@@ -0,0 +1,29 @@
+"""import item duplicate confidence
+
+Revision ID: e6f1b7c94d23
+Revises: d93a6c0e5f28
+Create Date: 2026-10-17 21:12:44.305186
+
+"""
+from typing import Sequence, Union
+
+from alembic import op
+import sqlalchemy as sa
+
+
+# revision identifiers, used by Alembic.
+revision: str = 'e6f1b7c94d23'
+down_revision: Union[str, Sequence[str], None] = 'd93a6c0e5f28'
+branch_labels: Union[str, Sequence[str], None] = None
+depends_on: Union[str, Sequence[str], None] = None
+
+
+def upgrade() -> None:
+    """Upgrade schema."""
+    op.add_column('import_items', sa.Column('duplicate_confidence', sa.Float(), nullable=True))
+    op.execute('UPDATE import_items SET duplicate_confidence = 1.0 WHERE duplicate_of_business_id IS NOT NULL')
+
+
+def downgrade() -> None:
+    """Downgrade schema."""
+    op.drop_column('import_items', 'duplicate_confidence')
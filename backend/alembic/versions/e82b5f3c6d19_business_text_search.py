@@ -0,0 +1,74 @@
+"""business full-text search index
+
+Revision ID: e82b5f3c6d19
+Revises: d41c7a9e0f15
+Create Date: 2026-10-17 16:20:13.402186
+
+"""
+from typing import Sequence, Union
+
+from alembic import op
+import sqlalchemy as sa
+
+
+# revision identifiers, used by Alembic.
+revision: str = 'e82b5f3c6d19'
+down_revision: Union[str, Sequence[str], None] = 'd41c7a9e0f15'
+branch_labels: Union[str, Sequence[str], None] = None
+depends_on: Union[str, Sequence[str], None] = None
+
+# The DDL as of this revision, copied from app/text_search.py so later edits
+# there do not change what this migration does.
+POSTGRES_TSVECTOR_DDL = [
+    "ALTER TABLE businesses ADD COLUMN IF NOT EXISTS search_vector tsvector GENERATED ALWAYS AS ("
+    "setweight(to_tsvector('english', coalesce(name, '')), 'A') || "
+    "setweight(to_tsvector('english', coalesce(city, '')), 'B') || "
+    "setweight(to_tsvector('english', coalesce(address1, '')), 'B') || "
+    "setweight(to_tsvector('english', coalesce(description, '')), 'C')) STORED",
+    'CREATE INDEX IF NOT EXISTS ix_businesses_search_vector ON businesses USING gin (search_vector)',
+]
+
+SQLITE_FTS5_DDL = [
+    """CREATE VIRTUAL TABLE IF NOT EXISTS businesses_fts USING fts5(
+            name, description, city, address1, content='businesses', content_rowid='id', tokenize='porter unicode61'
+        )""",
+    """CREATE TRIGGER IF NOT EXISTS businesses_fts_ai AFTER INSERT ON businesses
+            BEGIN
+                INSERT INTO businesses_fts(rowid, name, description, city, address1) VALUES (new.id, new.name, new.description, new.city, new.address1);
+            END""",
+    """CREATE TRIGGER IF NOT EXISTS businesses_fts_au AFTER UPDATE OF name, description, city, address1 ON businesses
+            BEGIN
+                INSERT INTO businesses_fts(businesses_fts, rowid, name, description, city, address1) VALUES ('delete', old.id, old.name, old.description, old.city, old.address1);
+                INSERT INTO businesses_fts(rowid, name, description, city, address1) VALUES (new.id, new.name, new.description, new.city, new.address1);
+            END""",
+    """CREATE TRIGGER IF NOT EXISTS businesses_fts_ad AFTER DELETE ON businesses
+            BEGIN
+                INSERT INTO businesses_fts(businesses_fts, rowid, name, description, city, address1) VALUES ('delete', old.id, old.name, old.description, old.city, old.address1);
+            END""",
+]
+
+SQLITE_FTS5_REBUILD = "INSERT INTO businesses_fts(businesses_fts) VALUES ('rebuild')"
+
+
+def upgrade() -> None:
+    """Upgrade schema."""
+    dialect = op.get_bind().dialect.name
+    if dialect == 'postgresql':
+        for stmt in POSTGRES_TSVECTOR_DDL:
+            op.execute(stmt)
+    elif dialect == 'sqlite':
+        for stmt in SQLITE_FTS5_DDL:
+            op.execute(stmt)
+        op.execute(SQLITE_FTS5_REBUILD)
+
+
+def downgrade() -> None:
+    """Downgrade schema."""
+    dialect = op.get_bind().dialect.name
+    if dialect == 'postgresql':
+        op.execute('DROP INDEX IF EXISTS ix_businesses_search_vector')
+        op.execute('ALTER TABLE businesses DROP COLUMN IF EXISTS search_vector')
+    elif dialect == 'sqlite':
+        for suffix in ('ai', 'au', 'ad'):
+            op.execute(f'DROP TRIGGER IF EXISTS businesses_fts_{suffix}')
+        op.execute('DROP TABLE IF EXISTS businesses_fts')
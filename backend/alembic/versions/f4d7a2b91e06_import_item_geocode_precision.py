@@ -0,0 +1,29 @@
+"""import item geocode precision
+
+Revision ID: f4d7a2b91e06
+Revises: c2a9f5e83d16
+Create Date: 2026-10-17 23:58:04.391752
+
+"""
+from typing import Sequence, Union
+
+from alembic import op
+import sqlalchemy as sa
+
+
+# revision identifiers, used by Alembic.
+revision: str = 'f4d7a2b91e06'
+down_revision: Union[str, Sequence[str], None] = 'c2a9f5e83d16'
+branch_labels: Union[str, Sequence[str], None] = None
+depends_on: Union[str, Sequence[str], None] = None
+
+
+def upgrade() -> None:
+    """Upgrade schema."""
+    # Existing items stay NULL: whether their coordinates were geocoded or came with the row is not recorded.
+    op.add_column('import_items', sa.Column('geocode_precision', sa.String(), nullable=True))
+
+
+def downgrade() -> None:
+    """Downgrade schema."""
+    op.drop_column('import_items', 'geocode_precision')
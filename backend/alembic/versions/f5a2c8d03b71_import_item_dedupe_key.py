@@ -0,0 +1,30 @@
+"""import item dedupe key
+
+Revision ID: f5a2c8d03b71
+Revises: e82b5f3c6d19
+Create Date: 2026-10-17 17:05:38.914027
+
+"""
+from typing import Sequence, Union
+
+from alembic import op
+import sqlalchemy as sa
+
+
+# revision identifiers, used by Alembic.
+revision: str = 'f5a2c8d03b71'
+down_revision: Union[str, Sequence[str], None] = 'e82b5f3c6d19'
+branch_labels: Union[str, Sequence[str], None] = None
+depends_on: Union[str, Sequence[str], None] = None
+
+
+def upgrade() -> None:
+    """Upgrade schema."""
+    op.add_column('import_items', sa.Column('dedupe_key', sa.String(), nullable=True))
+    op.create_index('ix_import_items_batch_dedupe', 'import_items', ['batch_id', 'dedupe_key'], unique=False)
+
+
+def downgrade() -> None:
+    """Downgrade schema."""
+    op.drop_index('ix_import_items_batch_dedupe', table_name='import_items')
+    op.drop_column('import_items', 'dedupe_key')
@@ -0,0 +1,127 @@
+# backend/app/catalog.py
+# Catalog version counter and conditional GETs for public business reads.
+#
+# catalog_state holds one row whose version is bumped, inside the same
+# transaction, by every write that changes what the public sees (approvals,
+# deletions, imports, merges). Read endpoints derive a weak ETag from that
+# version plus the request path and query, so a client that already has the
+# current body gets 304 Not Modified after a single primary-key lookup,
+# without the businesses table being queried. The version is shared by every
+# worker, so any of them can answer a revalidation.
+#
+# After a write commits, the spatial index and the caches built on it are
+# synced in process a moment later; a body rendered in between would show the
+# old catalog under the new version. A writer counts as pending from its bump
+# until that sync (or a rollback), and while any is, reads go out uncacheable.
+
+import hashlib
+import threading
+from typing import Dict, Optional
+
+from fastapi import Request, Response
+from sqlalchemy import event, insert, select, update
+from sqlalchemy.engine import Engine
+from sqlalchemy.orm import Session
+
+from . import models
+from .spatial_index import business_index
+
+CATALOG_ROW_ID = 1
+
+_state = models.CatalogState.__table__
+
+_pending_lock = threading.Lock()
+_pending_syncs = 0
+_writer = threading.local()
+
+
+def _begin_sync() -> None:
+    global _pending_syncs
+    if getattr(_writer, "pending", False):
+        return
+    _writer.pending = True
+    with _pending_lock:
+        _pending_syncs += 1
+
+
+def _end_sync() -> None:
+    global _pending_syncs
+    if not getattr(_writer, "pending", False):
+        return
+    _writer.pending = False
+    with _pending_lock:
+        _pending_syncs -= 1
+
+
+def _committed(session: Session) -> None:
+    session.info.pop("catalog_bumped", None)  # now pending until business_index syncs
+
+
+def _transaction_ended(session: Session, transaction) -> None:
+    if transaction.parent is None and session.info.pop("catalog_bumped", False):
+        _end_sync()  # rolled back or closed uncommitted: nothing to sync
+
+
+business_index.add_sync_listener(_end_sync)
+event.listen(Session, "after_commit", _committed)
+event.listen(Session, "after_transaction_end", _transaction_ended)
+
+
+def ensure_catalog_state(bind: Engine) -> None:
+    """Create the counter row if it is missing (idempotent, run at startup)."""
+    with bind.begin() as conn:
+        exists = conn.execute(select(_state.c.id).where(_state.c.id == CATALOG_ROW_ID)).first()
+        if not exists:
+            conn.execute(insert(_state).values(id=CATALOG_ROW_ID, version=0))
+
+
+def bump_catalog_version(db: Session) -> None:
+    """Advance the catalog version as part of the caller's pending transaction.
+
+    The caller syncs ``business_index`` after committing; until then reads go out uncacheable.
+    """
+    _begin_sync()
+    db.info["catalog_bumped"] = True
+    result = db.execute(
+        update(_state).where(_state.c.id == CATALOG_ROW_ID).values(version=_state.c.version + 1)
+    )
+    if result.rowcount == 0:
+        db.execute(insert(_state).values(id=CATALOG_ROW_ID, version=1))
+
+
+def catalog_version(db: Session) -> int:
+    return db.execute(select(_state.c.version).where(_state.c.id == CATALOG_ROW_ID)).scalar() or 0
+
+
+def catalog_etag(db: Session, request: Request) -> Optional[str]:
+    """Weak ETag for a catalog read: catalog version + path + sorted query string.
+
+    None while a write in this process has committed but not yet synced the
+    in-process index and caches: the body may not match the version yet.
+    """
+    version = catalog_version(db)
+    if _pending_syncs:  # read after the version, so a pending write it includes is seen
+        return None
+    query = "&".join(f"{k}={v}" for k, v in sorted(request.query_params.multi_items()))
+    digest = hashlib.sha1(f"{request.url.path}?{query}".encode("utf-8")).hexdigest()[:16]
+    return f'W/"{version}-{digest}"'
+
+
+def etag_headers(etag: Optional[str], cache_control: str = "no-cache") -> Dict[str, str]:
+    """Headers for a revalidatable response: browsers keep it and send If-None-Match."""
+    if etag is None:
+        return {"Cache-Control": "no-store"}  # rendered mid-sync, so not to be reused
+    return {"ETag": etag, "Cache-Control": cache_control}
+
+
+def not_modified(request: Request, etag: Optional[str], cache_control: str = "no-cache") -> Optional[Response]:
+    """A 304 response when If-None-Match already names ``etag`` (weak comparison), else None."""
+    header = request.headers.get("if-none-match")
+    if not header or etag is None:
+        return None
+    wanted = etag.removeprefix("W/")
+    for candidate in header.split(","):
+        candidate = candidate.strip()
+        if candidate == "*" or candidate.removeprefix("W/") == wanted:
+            return Response(status_code=304, headers=etag_headers(etag, cache_control))
+    return None
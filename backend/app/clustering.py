@@ -0,0 +1,122 @@
+# backend/app/clustering.py
+# Grid-based marker clustering for zoomed-out map views.
+#
+# Each zoom level gets a Web Mercator grid of CELLS_PER_TILE x CELLS_PER_TILE
+# cells per 256px map tile (64px cells, close to the client-side cluster
+# radius). A cell aggregates count, coordinate sums for the centroid and the
+# lowest business id as a sample. Grids are built once per zoom from the
+# spatial index and dropped as soon as the index version moves, so a viewport
+# lookup only probes the cells the bbox covers.
+
+import threading
+from typing import Dict, Iterable, List, NamedTuple, Tuple
+
+from sqlalchemy.orm import Session
+
+from . import models
+from .geo import BBox, mercator_x, mercator_y
+from .geo_backend import geo_backend
+from .spatial_index import SpatialIndex, business_index
+
+CELLS_PER_TILE = 4
+MAX_CLUSTER_ZOOM = 22
+
+Cell = Tuple[int, int]
+
+
+class Cluster(NamedTuple):
+    lat: float
+    lng: float
+    count: int
+    sample_id: int
+
+
+def _cell_scale(zoom: int) -> int:
+    return (1 << zoom) * CELLS_PER_TILE
+
+
+def _cell_of(lat: float, lng: float, scale: int) -> Cell:
+    cx = min(scale - 1, int(mercator_x(lng) * scale))
+    cy = min(scale - 1, int(mercator_y(lat) * scale))
+    return cx, cy
+
+
+def _aggregate(points: Iterable[Tuple[int, float, float]], zoom: int) -> Dict[Cell, List]:
+    """cell -> [count, sum_lat, sum_lng, sample_id]"""
+    scale = _cell_scale(zoom)
+    grid: Dict[Cell, List] = {}
+    for biz_id, lat, lng in points:
+        cell = _cell_of(lat, lng, scale)
+        agg = grid.get(cell)
+        if agg is None:
+            grid[cell] = [1, lat, lng, biz_id]
+        else:
+            agg[0] += 1
+            agg[1] += lat
+            agg[2] += lng
+            if biz_id < agg[3]:
+                agg[3] = biz_id
+    return grid
+
+
+def _to_cluster(agg: List) -> Cluster:
+    count, sum_lat, sum_lng, sample_id = agg
+    return Cluster(sum_lat / count, sum_lng / count, count, sample_id)
+
+
+def _cells_in_bbox(grid: Dict[Cell, List], bbox: BBox, zoom: int) -> List[Cluster]:
+    west, south, east, north = bbox
+    scale = _cell_scale(zoom)
+    x0, y0 = _cell_of(north, west, scale)
+    x1, y1 = _cell_of(south, east, scale)
+    span = (x1 - x0 + 1) * (y1 - y0 + 1)
+    if span <= len(grid):
+        found = [grid[(cx, cy)] for cx in range(x0, x1 + 1) for cy in range(y0, y1 + 1) if (cx, cy) in grid]
+    else:
+        found = [agg for (cx, cy), agg in grid.items() if x0 <= cx <= x1 and y0 <= cy <= y1]
+    return sorted((_to_cluster(agg) for agg in found), key=lambda c: c.sample_id)
+
+
+class ClusterCache:
+    """Per-zoom cluster grids derived from a spatial index."""
+
+    def __init__(self, index: SpatialIndex):
+        self._index = index
+        self._lock = threading.Lock()
+        self._version = -1
+        self._grids: Dict[int, Dict[Cell, List]] = {}
+
+    def _grid(self, zoom: int) -> Dict[Cell, List]:
+        with self._lock:
+            if self._index.version != self._version:
+                self._grids = {}
+                self._version = self._index.version
+            grid = self._grids.get(zoom)
+            if grid is None:
+                version, entries = self._index.snapshot()
+                if version != self._version:
+                    self._grids = {}
+                    self._version = version
+                grid = _aggregate(((e.id, e.lat, e.lng) for e in entries), zoom)
+                self._grids[zoom] = grid
+            return grid
+
+    def clusters(self, db: Session, bbox: BBox, zoom: int) -> List[Cluster]:
+        zoom = max(0, min(MAX_CLUSTER_ZOOM, zoom))
+        if not self._index.enabled:
+            return _clusters_from_db(db, bbox, zoom)
+        self._index.ensure_loaded(db)
+        return _cells_in_bbox(self._grid(zoom), bbox, zoom)
+
+
+def _clusters_from_db(db: Session, bbox: BBox, zoom: int) -> List[Cluster]:
+    """Uncached path for deployments that run without the in-process index."""
+    q = db.query(models.Business.id, models.Business.lat, models.Business.lng).filter(
+        models.Business.is_approved.is_(True)
+    )
+    rows = geo_backend.filter_bbox(q, bbox).all()
+    grid = _aggregate(((biz_id, float(lat), float(lng)) for biz_id, lat, lng in rows), zoom)
+    return _cells_in_bbox(grid, bbox, zoom)
+
+
+cluster_cache = ClusterCache(business_index)
@@ -1,23 +1,64 @@
 # backend/app/crud.py
-from typing import Optional, List, Tuple
+from typing import Any, Optional, List, Sequence, Tuple
 from sqlalchemy.orm import Session, selectinload
-from sqlalchemy import and_, or_
+from sqlalchemy import and_, or_, select
 from . import models, schemas
 from .models_user import BusinessMembership, MembershipRole, User, UserRole
+from .catalog import bump_catalog_version
+from .geo import EARTH_RADIUS_KM, haversine_km, radius_bbox
+from .geo_backend import geo_backend
+from .spatial_index import business_index
+from .text_search import text_search
 from datetime import datetime
 import math
 
 
-def _haversine_km(lat1: float, lon1: float, lat2: float, lon2: float) -> float:
-    """Compute great-circle distance between two lat/lon pairs in kilometers."""
-    R = 6371.0
-    phi1 = math.radians(lat1)
-    phi2 = math.radians(lat2)
-    dphi = math.radians(lat2 - lat1)
-    dlambda = math.radians(lon2 - lon1)
-    a = math.sin(dphi / 2) ** 2 + math.cos(phi1) * math.cos(phi2) * math.sin(dlambda / 2) ** 2
-    c = 2 * math.atan2(math.sqrt(a), math.sqrt(1 - a))
-    return R * c
+def _load_businesses_in_order(
+    db: Session,
+    ids: List[int],
+    distances: Optional[List[float]] = None,
+) -> List[models.Business]:
+    """Hydrate businesses with a single IN query, preserving the order of ``ids``.
+
+    When ``distances`` is given, each business gets a transient ``distance_km``.
+    """
+    if not ids:
+        return []
+    rows = db.query(models.Business).filter(models.Business.id.in_(ids)).all()
+    by_id = {b.id: b for b in rows}
+    ordered = []
+    for pos, biz_id in enumerate(ids):
+        biz = by_id.get(biz_id)
+        if biz is None:
+            continue
+        if distances is not None:
+            biz.distance_km = distances[pos]
+        ordered.append(biz)
+    return ordered
+
+
+def _load_rows_in_order(
+    db: Session,
+    columns: Sequence[Any],
+    ids: List[int],
+    distances: Optional[List[float]] = None,
+) -> List[tuple]:
+    """Column-only counterpart of ``_load_businesses_in_order``.
+
+    Returns plain tuples of ``columns`` (plus the distance last, when given) straight
+    from a Core select, with no ORM instances or identity-map bookkeeping.
+    """
+    if not ids:
+        return []
+    stmt = select(models.Business.id, *columns).where(models.Business.id.in_(ids))
+    by_id = {row[0]: tuple(row[1:]) for row in db.connection().execute(stmt)}
+    ordered = []
+    for pos, biz_id in enumerate(ids):
+        values = by_id.get(biz_id)
+        if values is None:
+            continue
+        ordered.append(values if distances is None else values + (distances[pos],))
+    return ordered
 
 
 def search_businesses(
@@ -30,45 +71,232 @@ def search_businesses(
     near_lat: Optional[float] = None,
     near_lng: Optional[float] = None,
     radius_km: Optional[float] = None,
+    after_id: Optional[int] = None,
+    after_distance: Optional[float] = None,
 ) -> List[models.Business]:
     """Search approved businesses with optional bbox and/or radius filters.
 
     - bbox: filters by viewport rectangle (simple between conditions; no anti-meridian handling).
-    - near_lat/lng + radius_km: post-filters and sorts by distance using Haversine.
+    - near_lat/lng + radius_km: prefilters on an indexed region around the point, then
+      ranks nearest-first; skip/limit always apply after ranking. How the prefilter and
+      ranking run depends on the dialect's geo backend (see geo_backend.py).
+    - after_id (+ after_distance for radius searches): keyset cursor; returns rows sorting
+      strictly after (id) or (distance, id). Results of radius searches carry ``distance_km``.
+
+    Approved-only spatial queries are answered from the in-process spatial index when
+    it is enabled, with only the requested page hydrated from the database.
     """
-    q = db.query(models.Business)
+    return _search(
+        db,
+        None,
+        skip=skip,
+        limit=limit,
+        approved_only=approved_only,
+        bbox=bbox,
+        near_lat=near_lat,
+        near_lng=near_lng,
+        radius_km=radius_km,
+        after_id=after_id,
+        after_distance=after_distance,
+    )
+
+
+def search_business_rows(
+    db: Session,
+    columns: Sequence[Any],
+    *,
+    skip: int = 0,
+    limit: int = 100,
+    approved_only: bool = True,
+    bbox: Optional[Tuple[float, float, float, float]] = None,
+    near_lat: Optional[float] = None,
+    near_lng: Optional[float] = None,
+    radius_km: Optional[float] = None,
+    after_id: Optional[int] = None,
+    after_distance: Optional[float] = None,
+) -> List[tuple]:
+    """``search_businesses`` projected onto ``columns`` (Business column attributes).
+
+    Same filters, order and paging, but rows are tuples selected with Core instead of
+    hydrated ORM objects. Radius searches append the distance in km as the last value.
+    """
+    return _search(
+        db,
+        columns,
+        skip=skip,
+        limit=limit,
+        approved_only=approved_only,
+        bbox=bbox,
+        near_lat=near_lat,
+        near_lng=near_lng,
+        radius_km=radius_km,
+        after_id=after_id,
+        after_distance=after_distance,
+    )
+
+
+def _search(
+    db: Session,
+    columns: Optional[Sequence[Any]],
+    *,
+    skip: int,
+    limit: int,
+    approved_only: bool,
+    bbox: Optional[Tuple[float, float, float, float]],
+    near_lat: Optional[float],
+    near_lng: Optional[float],
+    radius_km: Optional[float],
+    after_id: Optional[int],
+    after_distance: Optional[float],
+) -> list:
+    near = near_lat is not None and near_lng is not None and radius_km is not None
+    after = (after_distance, after_id) if near and after_id is not None else None
+    if approved_only and business_index.enabled and (bbox is not None or near):
+        return _search_with_index(
+            db,
+            columns,
+            skip=skip,
+            limit=limit,
+            bbox=bbox,
+            near_lat=near_lat,
+            near_lng=near_lng,
+            radius_km=radius_km,
+            after_id=after_id,
+            after=after,
+        )
+
+    q = db.query(models.Business) if columns is None else db.query(*columns)
     if approved_only:
         q = q.filter(models.Business.is_approved.is_(True))
 
     if bbox is not None:
-        west, south, east, north = bbox
-        q = q.filter(
-            and_(
-                models.Business.lat.isnot(None),
-                models.Business.lng.isnot(None),
-                models.Business.lng >= west,
-                models.Business.lng <= east,
-                models.Business.lat >= south,
-                models.Business.lat <= north,
-            )
-        )
+        q = geo_backend.filter_bbox(q, bbox)
+
+    if not near:
+        if after_id is not None:
+            q = q.filter(models.Business.id > after_id)
+        q = q.order_by(models.Business.id.asc()).offset(skip).limit(limit)
+        if columns is None:
+            return q.all()
+        return [tuple(row) for row in db.connection().execute(q.statement)]
+
+    # Rank (distance, id) pairs only, then hydrate the requested page.
+    page = geo_backend.rank_within(q, near_lat, near_lng, radius_km, skip=skip, limit=limit, after=after)
+    return _load_page(db, columns, page)
+
+
+def _load_page(db: Session, columns: Optional[Sequence[Any]], page: List[Tuple[float, int]]) -> list:
+    ids = [biz_id for _, biz_id in page]
+    distances = [d for d, _ in page]
+    if columns is None:
+        return _load_businesses_in_order(db, ids, distances)
+    return _load_rows_in_order(db, columns, ids, distances)
 
-    # Pull a reasonable superset before Python-side distance filter/sort
-    base_items = q.offset(skip).limit(max(limit, 1000) if (bbox or radius_km) else limit).all()
 
-    # Apply radius/distance if requested
+def _search_with_index(
+    db: Session,
+    columns: Optional[Sequence[Any]],
+    *,
+    skip: int,
+    limit: int,
+    bbox: Optional[Tuple[float, float, float, float]],
+    near_lat: Optional[float],
+    near_lng: Optional[float],
+    radius_km: Optional[float],
+    after_id: Optional[int],
+    after: Optional[Tuple[float, int]],
+) -> list:
+    business_index.ensure_loaded(db)
     if near_lat is not None and near_lng is not None and radius_km is not None:
-        enriched = []
-        for b in base_items:
-            if b.lat is None or b.lng is None:
+        hits = business_index.query_radius(near_lat, near_lng, radius_km, k=skip + limit, bbox=bbox, after=after)
+        return _load_page(db, columns, hits[skip : skip + limit])
+
+    ids = [e.id for e in business_index.query_bbox(bbox) if after_id is None or e.id > after_id]
+    page = ids[skip : skip + limit]
+    if columns is None:
+        return _load_businesses_in_order(db, page)
+    return _load_rows_in_order(db, columns, page)
+
+
+def search_businesses_text(
+    db: Session,
+    text_query: str,
+    *,
+    skip: int = 0,
+    limit: int = 20,
+    bbox: Optional[Tuple[float, float, float, float]] = None,
+    near_lat: Optional[float] = None,
+    near_lng: Optional[float] = None,
+    radius_km: Optional[float] = None,
+) -> List[models.Business]:
+    """Keyword search over approved businesses, best match first (ties by id).
+
+    Matching, stemming and ranking come from the dialect's text index (see
+    text_search.py). bbox and near/radius_km narrow the same query through the geo
+    backend's indexed rectangle; the radius itself is checked on the streamed
+    candidates, which stop as soon as the page is full. Each business carries
+    ``score`` and, for radius searches, ``distance_km``.
+    """
+    q = db.query(models.Business.id, models.Business.lat, models.Business.lng).filter(
+        models.Business.is_approved.is_(True)
+    )
+    matched = text_search.match(q, text_query)
+    if matched is None:
+        return []
+    q, score = matched
+    if bbox is not None:
+        q = geo_backend.filter_bbox(q, bbox)
+    near = near_lat is not None and near_lng is not None and radius_km is not None
+    if near:
+        q = geo_backend.filter_bbox(q, radius_bbox(near_lat, near_lng, radius_km))
+    q = q.add_columns(score.label("score")).order_by(score.desc(), models.Business.id.asc())
+
+    hits: List[Tuple[int, float, Optional[float]]] = []  # (id, score, distance_km)
+    if not near:
+        hits = [(biz_id, float(s), None) for biz_id, _, _, s in q.offset(skip).limit(limit)]
+    else:
+        seen = 0
+        for biz_id, lat, lng, s in q.yield_per(500):
+            d = haversine_km(near_lat, near_lng, float(lat), float(lng))
+            if d > radius_km:
                 continue
-            d = _haversine_km(near_lat, near_lng, float(b.lat), float(b.lng))
-            if d <= radius_km:
-                enriched.append((d, b))
-        enriched.sort(key=lambda x: x[0])
-        return [b for _, b in enriched][:limit]
+            seen += 1
+            if seen > skip:
+                hits.append((biz_id, float(s), d))
+                if len(hits) >= limit:
+                    break
 
-    return base_items[:limit]
+    items = _load_businesses_in_order(db, [h[0] for h in hits])
+    by_id = {h[0]: h for h in hits}
+    for biz in items:
+        _, biz.score, biz.distance_km = by_id[biz.id]
+    return items
+
+
+# Expanding-ring k-NN without the index: start small, widen 4x until k rows are inside.
+_NEAREST_START_KM = 2.0
+_NEAREST_MAX_KM = math.pi * EARTH_RADIUS_KM
+
+
+def nearest_businesses(db: Session, *, lat: float, lng: float, k: int = 20) -> List[models.Business]:
+    """The k approved businesses closest to a point, regardless of distance.
+
+    Uses a best-first search over the spatial index when it is enabled. Otherwise
+    runs radius searches over widening rings and stops at the first ring that holds
+    k rows; every row outside that ring is farther away, so the answer is exact.
+    Each business carries ``distance_km``.
+    """
+    if business_index.enabled:
+        business_index.ensure_loaded(db)
+        hits = business_index.nearest(lat, lng, k)
+        return _load_businesses_in_order(db, [biz_id for _, biz_id in hits], [d for d, _ in hits])
+
+    radius = _NEAREST_START_KM
+    while True:
+        items = search_businesses(db, limit=k, near_lat=lat, near_lng=lng, radius_km=radius)
+        if len(items) >= k or radius >= _NEAREST_MAX_KM:
+            return items
+        radius = min(radius * 4, _NEAREST_MAX_KM)
 
 
 def get_business(db: Session, business_id: int) -> Optional[models.Business]:
@@ -123,8 +351,11 @@ def create_business(
         )
         db.add(membership)
 
+    if approved:
+        bump_catalog_version(db)
     db.commit()
     db.refresh(db_obj)
+    business_index.sync(db_obj)
     return db_obj
 
 
@@ -155,8 +386,11 @@ def delete_business(
         if not membership:
             return None
 
+    if obj.is_approved:
+        bump_catalog_version(db)
     db.delete(obj)
     db.commit()
+    business_index.discard(business_id)
     return obj
 
 
@@ -170,8 +404,10 @@ def approve_business(db: Session, business_id: int, *, acting_user: Optional[Use
     biz.is_approved = True
     biz.approved_at = datetime.utcnow()
     biz.approved_by_id = acting_user.id if acting_user else None
+    bump_catalog_version(db)
     db.commit()
     db.refresh(biz)
+    business_index.sync(biz)
     return biz
 
 
@@ -252,7 +488,12 @@ def search_submissions(
     owner_id: Optional[int] = None,
     skip: int = 0,
     limit: int = 50,
+    after: Optional[Tuple[datetime, int]] = None,
 ) -> Tuple[List[models.BusinessSubmission], int]:
+    """Admin submission search, newest first.
+
+    ``after`` is a (created_at, id) keyset cursor from the previous page.
+    """
     q = db.query(models.BusinessSubmission).options(selectinload(models.BusinessSubmission.vetting))
     if status:
         q = q.filter(models.BusinessSubmission.status == status)
@@ -269,7 +510,23 @@ def search_submissions(
             )
         )
     total = q.count()
-    items = q.order_by(models.BusinessSubmission.created_at.desc()).offset(skip).limit(limit).all()
+    if after is not None:
+        after_created, after_id = after
+        q = q.filter(
+            or_(
+                models.BusinessSubmission.created_at < after_created,
+                and_(
+                    models.BusinessSubmission.created_at == after_created,
+                    models.BusinessSubmission.id < after_id,
+                ),
+            )
+        )
+    items = (
+        q.order_by(models.BusinessSubmission.created_at.desc(), models.BusinessSubmission.id.desc())
+        .offset(skip)
+        .limit(limit)
+        .all()
+    )
     return items, total
 
 
@@ -317,8 +574,10 @@ def approve_business_submission(db: Session, submission_id: int, *, reviewer: Us
         submission.reviewed_by_id = reviewer.id
         submission.review_notes = None
 
+        bump_catalog_version(db)
         db.commit()
         db.refresh(existing_business)
+        business_index.sync(existing_business)
         return existing_business
 
     # Create approved Business
@@ -384,6 +643,7 @@ def reject_submission(
     if not submission:
         return None
 
+    removed_business_id = None
     if submission.created_business_id is not None:
         business = (
             db.query(models.Business)
@@ -391,6 +651,9 @@ def reject_submission(
             .first()
         )
         if business:
+            removed_business_id = business.id
+            if business.is_approved:
+                bump_catalog_version(db)
             db.delete(business)
         submission.created_business_id = None
 
@@ -401,4 +664,6 @@ def reject_submission(
 
     db.commit()
     db.refresh(submission)
+    if removed_business_id is not None:
+        business_index.discard(removed_business_id)
     return submission
@@ -1,5 +1,6 @@
 # backend/app/crud_user.py
-from sqlalchemy import func, or_
+from datetime import datetime
+from sqlalchemy import and_, func, or_
 from sqlalchemy.orm import Session
 from typing import List, Optional, Tuple
 from .models import BusinessSubmission
@@ -36,8 +37,12 @@ def search_pure_consumers(
     query: Optional[str] = None,
     skip: int = 0,
     limit: int = 20,
+    after: Optional[Tuple[datetime, int]] = None,
 ) -> Tuple[List[User], int]:
-    """Users with role=USER who have never submitted a business."""
+    """Users with role=USER who have never submitted a business.
+
+    ``after`` is a (created_at, id) keyset cursor from the previous page.
+    """
     base = (
         db.query(User)
         .outerjoin(BusinessSubmission, BusinessSubmission.owner_id == User.id)
@@ -48,8 +53,13 @@ def search_pure_consumers(
         like = f"%{query.strip()}%"
         base = base.filter(or_(User.email.ilike(like), User.display_name.ilike(like)))
     total = base.with_entities(func.count(func.distinct(User.id))).scalar() or 0
+    if after is not None:
+        after_created, after_id = after
+        base = base.filter(
+            or_(User.created_at < after_created, and_(User.created_at == after_created, User.id < after_id))
+        )
     items = (
-        base.order_by(User.created_at.desc())
+        base.order_by(User.created_at.desc(), User.id.desc())
         .offset(skip)
         .limit(limit)
         .all()
@@ -0,0 +1,336 @@
+# backend/app/dedupe.py
+# Fuzzy duplicate scoring for import rows against existing businesses.
+#
+# A row and a business are compared on three signals: name similarity (Dice
+# coefficient over the word trigrams of the normalized name, with legal
+# suffixes like "LLC" dropped, so word order and "Joe's"/"Joes" don't matter),
+# distance (1 at the same point, 0 at DUPLICATE_RADIUS_KM or beyond) and street
+# address similarity (0 when both have different house numbers). The
+# confidence is their weighted mean over the signals both sides have; a name
+# below NAME_FLOOR never matches, and neither does a pair with no location
+# signal at all.
+#
+# Comparisons are blocked so matching stays near-linear: businesses with
+# coordinates sit in grid cells about DUPLICATE_RADIUS_KM wide (geohash-style,
+# with cell widths stretched by latitude) and a row only visits the 3x3 cells
+# around it; every business is also filed under (ZIP, name word), which is how
+# rows or businesses without coordinates find each other.
+
+import math
+import os
+from functools import lru_cache
+from typing import Dict, Iterable, List, NamedTuple, Optional, Sequence, Set, Tuple
+
+from sqlalchemy import and_, bindparam, func, or_, select
+from sqlalchemy.orm import Session
+
+from . import models
+from .geo import EARTH_RADIUS_KM, haversine_km, radius_bbox
+from .text_normalize import normalize
+
+DUPLICATE_THRESHOLD = float(os.getenv("DUPLICATE_THRESHOLD", "0.8"))
+DUPLICATE_RADIUS_KM = float(os.getenv("DUPLICATE_RADIUS_KM", "0.25"))
+NAME_FLOOR = 0.5
+
+NAME_WEIGHT = 0.5
+GEO_WEIGHT = 0.3
+ADDRESS_WEIGHT = 0.2
+
+_NAME_NOISE = {"the", "and", "llc", "inc", "co", "corp", "corporation", "company", "ltd", "llp", "pllc"}
+_STREET_ABBREVIATIONS = {
+    "street": "st",
+    "avenue": "ave",
+    "av": "ave",
+    "road": "rd",
+    "boulevard": "blvd",
+    "drive": "dr",
+    "lane": "ln",
+    "place": "pl",
+    "court": "ct",
+    "highway": "hwy",
+    "parkway": "pkwy",
+    "square": "sq",
+    "suite": "ste",
+    "north": "n",
+    "south": "s",
+    "east": "e",
+    "west": "w",
+}
+_CELL_DEG = math.degrees(DUPLICATE_RADIUS_KM / EARTH_RADIUS_KM)
+_BBOX_SLOTS = 64
+
+
+class DuplicateMatch(NamedTuple):
+    business_id: int
+    confidence: float
+
+
+class Profile(NamedTuple):
+    """Precomputed comparison features of a business or an import row."""
+
+    id: int
+    name_grams: frozenset
+    name_words: Tuple[str, ...]
+    house_number: Optional[str]
+    street_grams: Optional[frozenset]
+    zip5: Optional[str]
+    lat: Optional[float]
+    lng: Optional[float]
+
+
+def _trigrams(words: Iterable[str]) -> frozenset:
+    grams = set()
+    for word in words:
+        padded = f"  {word} "
+        grams.update(padded[i:i + 3] for i in range(len(padded) - 2))
+    return frozenset(grams)
+
+
+def _dice(a: frozenset, b: frozenset) -> float:
+    if not a or not b:
+        return 0.0
+    return 2 * len(a & b) / (len(a) + len(b))
+
+
+def name_words(name: str) -> Tuple[str, ...]:
+    """Normalized name words without apostrophes and legal suffixes."""
+    words = normalize(name.replace("'", "").replace("’", "")).split()
+    kept = tuple(w for w in words if w not in _NAME_NOISE)
+    return kept or tuple(words)
+
+
+def _street(address1: Optional[str]) -> Tuple[Optional[str], Optional[frozenset]]:
+    words = [_STREET_ABBREVIATIONS.get(w, w) for w in normalize(address1 or "").split()]
+    if not words:
+        return None, None
+    house = words[0] if words[0][:1].isdigit() else None
+    rest = words[1:] if house else words
+    return house, _trigrams(rest) if rest else None
+
+
+def _zip5(zip_code: Optional[str]) -> Optional[str]:
+    text = (zip_code or "").strip()
+    return text[:5].lower() or None
+
+
+def profile(
+    id: int,
+    name: str,
+    address1: Optional[str],
+    zip_code: Optional[str],
+    lat: Optional[float],
+    lng: Optional[float],
+) -> Profile:
+    words = name_words(name)
+    house, street_grams = _street(address1)
+    if lat is None or lng is None:
+        lat = lng = None
+    return Profile(id, _trigrams(words), words, house, street_grams, _zip5(zip_code), lat, lng)
+
+
+def row_profile(row: dict, id: int = 0) -> Profile:
+    """Profile of an import row dict (ImportItem column names)."""
+    return profile(id, row["name"], row.get("address1"), row.get("zip"), row.get("lat"), row.get("lng"))
+
+
+def name_similarity(a: Profile, b: Profile) -> float:
+    return _dice(a.name_grams, b.name_grams)
+
+
+def address_similarity(a: Profile, b: Profile) -> Optional[float]:
+    """None when either side has no street address."""
+    if a.street_grams is None and a.house_number is None:
+        return None
+    if b.street_grams is None and b.house_number is None:
+        return None
+    if a.house_number and b.house_number and a.house_number != b.house_number:
+        return 0.0
+    if a.street_grams is None or b.street_grams is None:
+        return 0.5
+    return _dice(a.street_grams, b.street_grams)
+
+
+def geo_similarity(a: Profile, b: Profile) -> Optional[float]:
+    """None when either side has no coordinates."""
+    if a.lat is None or b.lat is None:
+        return None
+    distance = haversine_km(a.lat, a.lng, b.lat, b.lng)
+    return max(0.0, 1.0 - distance / DUPLICATE_RADIUS_KM)
+
+
+def confidence(a: Profile, b: Profile) -> Optional[float]:
+    """Weighted similarity in [0, 1], or None when the pair cannot be a duplicate."""
+    name = name_similarity(a, b)
+    if name < NAME_FLOOR:
+        return None
+    total = NAME_WEIGHT * name
+    weight = NAME_WEIGHT
+    for score, signal_weight in ((geo_similarity(a, b), GEO_WEIGHT), (address_similarity(a, b), ADDRESS_WEIGHT)):
+        if score is not None:
+            total += signal_weight * score
+            weight += signal_weight
+    if weight == NAME_WEIGHT:
+        return None
+    return total / weight
+
+
+def _cell_row(lat: float) -> int:
+    return math.floor(lat / _CELL_DEG)
+
+
+def _cell_col(row: int, lng: float) -> int:
+    # Cells in a row are as wide (in km) as they are tall at the row's poleward edge.
+    edge = min(89.0, max(abs(row), abs(row + 1)) * _CELL_DEG)
+    return math.floor(lng * math.cos(math.radians(edge)) / _CELL_DEG)
+
+
+def _cell(lat: float, lng: float) -> Tuple[int, int]:
+    row = _cell_row(lat)
+    return row, _cell_col(row, lng)
+
+
+def _neighbourhood(lat: float, lng: float) -> Iterable[Tuple[int, int]]:
+    row = _cell_row(lat)
+    for r in (row - 1, row, row + 1):
+        col = _cell_col(r, lng)
+        for c in (col - 1, col, col + 1):
+            yield r, c
+
+
+class DuplicateIndex:
+    """Blocked lookup of the most likely duplicate among a set of business profiles."""
+
+    def __init__(self, businesses: Iterable[Profile] = (), threshold: float = DUPLICATE_THRESHOLD):
+        self.threshold = threshold
+        self.comparisons = 0
+        self._cells: Dict[Tuple[int, int], List[Profile]] = {}
+        self._zip_words: Dict[Tuple[str, str], List[Profile]] = {}
+        # (ZIP, word) entries of businesses without coordinates, for rows that have them
+        self._zip_words_ungeocoded: Dict[Tuple[str, str], List[Profile]] = {}
+        for business in businesses:
+            self.add(business)
+
+    def add(self, business: Profile) -> None:
+        if business.lat is not None:
+            self._cells.setdefault(_cell(business.lat, business.lng), []).append(business)
+        if business.zip5:
+            for word in set(business.name_words):
+                key = (business.zip5, word)
+                self._zip_words.setdefault(key, []).append(business)
+                if business.lat is None:
+                    self._zip_words_ungeocoded.setdefault(key, []).append(business)
+
+    def candidates(self, row: Profile) -> Iterable[Profile]:
+        if row.lat is not None:
+            for cell in _neighbourhood(row.lat, row.lng):
+                yield from self._cells.get(cell, ())
+            # Geocoded businesses outside the cells are beyond the radius.
+            by_zip = self._zip_words_ungeocoded
+        else:
+            by_zip = self._zip_words
+        if row.zip5:
+            for word in set(row.name_words):
+                yield from by_zip.get((row.zip5, word), ())
+
+    def best_match(self, row: Profile) -> Optional[DuplicateMatch]:
+        """Highest-confidence business at or above the threshold (lowest id on ties)."""
+        best: Optional[DuplicateMatch] = None
+        seen: Set[int] = set()
+        for business in self.candidates(row):
+            if business.id in seen:
+                continue
+            seen.add(business.id)
+            self.comparisons += 1
+            score = confidence(row, business)
+            if score is None or score < self.threshold:
+                continue
+            if best is None or (score, -business.id) > (best.confidence, -best.business_id):
+                best = DuplicateMatch(business.id, score)
+        return best
+
+
+def _grown_bbox(lat_lo: float, lng_lo: float, lat_hi: float, lng_hi: float) -> Dict[str, float]:
+    """Rectangle around the given extent, grown by the match radius on every side."""
+    poleward = lat_hi if abs(lat_hi) > abs(lat_lo) else lat_lo
+    _, _, dlng, _ = radius_bbox(poleward, 0.0, DUPLICATE_RADIUS_KM)
+    return {
+        "south": radius_bbox(lat_lo, 0.0, DUPLICATE_RADIUS_KM)[1],
+        "north": radius_bbox(lat_hi, 0.0, DUPLICATE_RADIUS_KM)[3],
+        "west": lng_lo - dlng,
+        "east": lng_hi + dlng,
+    }
+
+
+# _zip5() in SQL, so "19103-1234" is loaded for rows in 19103.
+_BUSINESS_ZIP5 = func.lower(func.substr(func.trim(models.Business.zip), 1, 5))
+
+_COLUMNS = (models.Business.id, models.Business.name, models.Business.address1, models.Business.zip,
+            models.Business.lat, models.Business.lng)
+
+
+@lru_cache(maxsize=None)
+def _bbox_statement():
+    # Fixed shape, so it is compiled once; unused slots repeat the last box.
+    biz = models.Business
+    return select(*_COLUMNS).where(
+        or_(
+            *(
+                and_(
+                    biz.lat >= bindparam(f"south{i}"),
+                    biz.lat <= bindparam(f"north{i}"),
+                    biz.lng >= bindparam(f"west{i}"),
+                    biz.lng <= bindparam(f"east{i}"),
+                )
+                for i in range(_BBOX_SLOTS)
+            )
+        )
+    )
+
+
+def load_index(db: Session, rows: Sequence[Profile]) -> DuplicateIndex:
+    """DuplicateIndex over the businesses that could match any of ``rows``.
+
+    One bounding box per grid cell the rows fall in (grown by the match
+    radius), plus the rows' ZIP codes: only businesses without coordinates for
+    geocoded rows, all of them for rows without coordinates.
+    """
+    extents: Dict[Tuple[int, int], List[float]] = {}
+    zips_geocoded: Set[str] = set()
+    zips_any: Set[str] = set()
+    for row in rows:
+        if row.lat is not None:
+            extent = extents.setdefault(_cell(row.lat, row.lng), [row.lat, row.lng, row.lat, row.lng])
+            extent[0] = min(extent[0], row.lat)
+            extent[1] = min(extent[1], row.lng)
+            extent[2] = max(extent[2], row.lat)
+            extent[3] = max(extent[3], row.lng)
+            if row.zip5:
+                zips_geocoded.add(row.zip5)
+        elif row.zip5:
+            zips_any.add(row.zip5)
+
+    biz = models.Business
+    queries = []
+    boxes = [_grown_bbox(*extent) for extent in extents.values()]
+    for start in range(0, len(boxes), _BBOX_SLOTS):
+        group = boxes[start:start + _BBOX_SLOTS]
+        params = {}
+        for i in range(_BBOX_SLOTS):
+            box = group[min(i, len(group) - 1)]
+            params.update({f"{edge}{i}": value for edge, value in box.items()})
+        queries.append((_bbox_statement(), params))
+    zips_geocoded -= zips_any
+    if zips_any:
+        queries.append((select(*_COLUMNS).where(_BUSINESS_ZIP5.in_(sorted(zips_any))), {}))
+    if zips_geocoded:
+        ungeocoded = or_(biz.lat.is_(None), biz.lng.is_(None))
+        queries.append((select(*_COLUMNS).where(_BUSINESS_ZIP5.in_(sorted(zips_geocoded)), ungeocoded), {}))
+
+    index = DuplicateIndex()
+    seen: Set[int] = set()
+    for statement, params in queries:
+        for business_id, name, address1, zip_code, lat, lng in db.execute(statement, params):
+            if business_id not in seen:
+                seen.add(business_id)
+                index.add(profile(business_id, name, address1, zip_code, lat, lng))
+    return index
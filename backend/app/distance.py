@@ -0,0 +1,122 @@
+# backend/app/distance.py
+# Batch great-circle distances over contiguous coordinate arrays.
+#
+# Radius search and nearest-first sorting used to call geo.haversine_km once
+# per row. Here candidates are packed into float64 arrays, distances come out
+# of one vectorized haversine pass, and only the k nearest are fully sorted
+# (argpartition first). Tiny candidate sets skip NumPy entirely, where the
+# array setup costs more than the scalar loop.
+
+from typing import List, Optional, Sequence, Tuple
+
+import numpy as np
+
+from .geo import EARTH_RADIUS_KM, haversine_km
+
+# Below this many candidates the scalar loop wins.
+VECTORIZE_MIN_CANDIDATES = 32
+
+
+class CoordinateArrays:
+    """Candidate ids and coordinates as contiguous NumPy arrays."""
+
+    __slots__ = ("ids", "lats", "lngs")
+
+    def __init__(self, ids: np.ndarray, lats: np.ndarray, lngs: np.ndarray):
+        self.ids = np.ascontiguousarray(ids, dtype=np.int64)
+        self.lats = np.ascontiguousarray(lats, dtype=np.float64)
+        self.lngs = np.ascontiguousarray(lngs, dtype=np.float64)
+
+    @classmethod
+    def from_rows(cls, rows: Sequence[Tuple[int, float, float]]) -> "CoordinateArrays":
+        """Build from (id, lat, lng) tuples, e.g. a Core/ORM column query."""
+        packed = np.asarray(rows, dtype=np.float64).reshape(-1, 3)
+        return cls(packed[:, 0], packed[:, 1], packed[:, 2])
+
+    def __len__(self) -> int:
+        return int(self.ids.shape[0])
+
+
+def haversine_km_array(lat: float, lng: float, lats: np.ndarray, lngs: np.ndarray) -> np.ndarray:
+    """Distances (km) from one point to every coordinate pair, in one pass."""
+    phi1 = np.radians(lat)
+    phi2 = np.radians(lats)
+    dphi = phi2 - phi1
+    dlambda = np.radians(lngs - lng)
+    a = np.sin(dphi / 2) ** 2 + np.cos(phi1) * np.cos(phi2) * np.sin(dlambda / 2) ** 2
+    np.clip(a, 0.0, 1.0, out=a)
+    return 2 * EARTH_RADIUS_KM * np.arcsin(np.sqrt(a))
+
+
+def nearest_indices(distances: np.ndarray, k: Optional[int], ids: np.ndarray) -> np.ndarray:
+    """Positions of the k smallest distances, sorted by (distance, id).
+
+    ``argpartition`` isolates the k nearest in linear time so only those get sorted.
+    It splits ties at the k-th distance arbitrarily, so every row tied with it is
+    kept until the id tie-break has run; otherwise keyset pages would skip rows.
+    """
+    n = distances.shape[0]
+    if k is not None and k < n:
+        if k <= 0:
+            return np.empty(0, dtype=np.intp)
+        kth = distances[np.argpartition(distances, k - 1)[k - 1]]
+        picked = np.flatnonzero(distances <= kth)
+    else:
+        picked = np.arange(n)
+    order = np.lexsort((ids[picked], distances[picked]))
+    return picked[order][:k]
+
+
+def rank_by_distance(
+    lat: float,
+    lng: float,
+    candidates: Sequence[Tuple[int, float, float]],
+    *,
+    radius_km: Optional[float] = None,
+    k: Optional[int] = None,
+    after: Optional[Tuple[float, int]] = None,
+) -> List[Tuple[float, int]]:
+    """(distance_km, id) pairs nearest-first, optionally capped by radius and count.
+
+    ``after`` is a keyset cursor: only pairs sorting strictly after it are kept.
+    """
+    if len(candidates) < VECTORIZE_MIN_CANDIDATES:
+        ranked = []
+        for row_id, c_lat, c_lng in candidates:
+            d = haversine_km(lat, lng, float(c_lat), float(c_lng))
+            if radius_km is not None and d > radius_km:
+                continue
+            if after is not None and (d, row_id) <= after:
+                continue
+            ranked.append((d, row_id))
+        ranked.sort()
+        return ranked if k is None else ranked[:k]
+
+    return rank_arrays(lat, lng, CoordinateArrays.from_rows(candidates), radius_km=radius_km, k=k, after=after)
+
+
+def rank_arrays(
+    lat: float,
+    lng: float,
+    coords: CoordinateArrays,
+    *,
+    radius_km: Optional[float] = None,
+    k: Optional[int] = None,
+    after: Optional[Tuple[float, int]] = None,
+) -> List[Tuple[float, int]]:
+    """Vectorized form of ``rank_by_distance`` for already-packed candidates."""
+    distances = haversine_km_array(lat, lng, coords.lats, coords.lngs)
+    ids = coords.ids
+    keep = None
+    if radius_km is not None:
+        keep = distances <= radius_km
+    if after is not None:
+        after_d, after_id = after
+        past = (distances > after_d) | ((distances == after_d) & (ids > after_id))
+        keep = past if keep is None else keep & past
+    if keep is not None:
+        distances = distances[keep]
+        ids = ids[keep]
+    order = nearest_indices(distances, k, ids)
+    return list(zip(distances[order].tolist(), ids[order].tolist()))
+
@@ -0,0 +1,73 @@
+# backend/app/geo.py
+# Small spherical-geometry helpers shared by search and the spatial index.
+import math
+from typing import Tuple
+
+EARTH_RADIUS_KM = 6371.0
+
+BBox = Tuple[float, float, float, float]  # (west, south, east, north)
+
+
+def haversine_km(lat1: float, lon1: float, lat2: float, lon2: float) -> float:
+    """Compute great-circle distance between two lat/lon pairs in kilometers."""
+    R = EARTH_RADIUS_KM
+    phi1 = math.radians(lat1)
+    phi2 = math.radians(lat2)
+    dphi = math.radians(lat2 - lat1)
+    dlambda = math.radians(lon2 - lon1)
+    a = math.sin(dphi / 2) ** 2 + math.cos(phi1) * math.cos(phi2) * math.sin(dlambda / 2) ** 2
+    c = 2 * math.atan2(math.sqrt(a), math.sqrt(1 - a))
+    return R * c
+
+
+def radius_bbox(lat: float, lng: float, radius_km: float) -> BBox:
+    """Smallest lat/lng rectangle (west, south, east, north) that contains the radius circle.
+
+    Longitude spread widens toward the poles; once the circle covers a pole every
+    longitude qualifies. No anti-meridian handling, same as the bbox filter.
+    """
+    angular = radius_km / EARTH_RADIUS_KM
+    dlat = math.degrees(angular)
+    south = max(-90.0, lat - dlat)
+    north = min(90.0, lat + dlat)
+    if south <= -90.0 or north >= 90.0:
+        return -180.0, south, 180.0, north
+
+    ratio = math.sin(angular) / math.cos(math.radians(lat))
+    dlng = 180.0 if ratio >= 1 else math.degrees(math.asin(ratio))
+    return max(-180.0, lng - dlng), south, min(180.0, lng + dlng), north
+
+
+def bbox_contains(bbox: BBox, lat: float, lng: float) -> bool:
+    west, south, east, north = bbox
+    return south <= lat <= north and west <= lng <= east
+
+
+# Web Mercator, normalized so the world spans [0, 1) on both axes (y grows south).
+MAX_MERCATOR_LAT = 85.05112878
+
+
+def mercator_x(lng: float) -> float:
+    return (lng + 180.0) / 360.0
+
+
+def mercator_y(lat: float) -> float:
+    lat = max(-MAX_MERCATOR_LAT, min(MAX_MERCATOR_LAT, lat))
+    s = math.sin(math.radians(lat))
+    return 0.5 - math.log((1 + s) / (1 - s)) / (4 * math.pi)
+
+
+def tile_for(lat: float, lng: float, zoom: int) -> Tuple[int, int]:
+    """Slippy-map (x, y) of the tile containing a point at ``zoom``."""
+    n = 1 << zoom
+    return min(n - 1, int(mercator_x(lng) * n)), min(n - 1, int(mercator_y(lat) * n))
+
+
+def tile_bbox(zoom: int, x: int, y: int) -> BBox:
+    """(west, south, east, north) of a slippy-map tile."""
+    n = 1 << zoom
+
+    def lat_at(ty: int) -> float:
+        return math.degrees(math.atan(math.sinh(math.pi * (1 - 2 * ty / n))))
+
+    return x / n * 360.0 - 180.0, lat_at(y + 1), (x + 1) / n * 360.0 - 180.0, lat_at(y)
@@ -0,0 +1,234 @@
+# backend/app/geo_backend.py
+# Dialect-aware geo query backends behind crud.search_businesses.
+#
+# - PostgreSQL: earthdistance (cube) with a GiST index on ll_to_earth(lat, lng);
+#   radius queries filter with earth_box and rank with earth_distance in SQL.
+#   If the extensions cannot be created, ranking falls back to a haversine
+#   expression over the btree-indexed lat/lng prefilter.
+# - SQLite: an R*Tree virtual table mirroring business coordinates, kept in
+#   sync by triggers on the businesses table.
+# - Anything else: plain lat/lng range filters and ranking in Python.
+#
+# The backend is picked from the engine's dialect when the engine is created.
+# install() (called at startup) creates the extension/index/virtual table
+# idempotently; until it has succeeded the portable path is used.
+
+import logging
+import math
+from typing import List, Optional, Tuple
+
+from sqlalchemy import and_, column, func, or_, select, table, text
+from sqlalchemy.engine import Engine
+from sqlalchemy.exc import SQLAlchemyError
+from sqlalchemy.orm import Query
+
+from . import models
+from .database import engine
+from .distance import rank_by_distance
+from .geo import EARTH_RADIUS_KM, BBox, radius_bbox
+
+logger = logging.getLogger(__name__)
+
+Ranked = List[Tuple[float, int]]  # (distance_km, business_id), nearest first
+
+
+def _bbox_clause(bbox: BBox):
+    west, south, east, north = bbox
+    return and_(
+        models.Business.lat.isnot(None),
+        models.Business.lng.isnot(None),
+        models.Business.lat >= south,
+        models.Business.lat <= north,
+        models.Business.lng >= west,
+        models.Business.lng <= east,
+    )
+
+
+def _keyset_clause(distance, after: Tuple[float, int]):
+    after_distance, after_id = after
+    return or_(distance > after_distance, and_(distance == after_distance, models.Business.id > after_id))
+
+
+def _rank_in_sql(q: Query, distance, *, skip: int, limit: int, after: Optional[Tuple[float, int]]) -> Ranked:
+    if after is not None:
+        q = q.filter(_keyset_clause(distance, after))
+    rows = (
+        q.with_entities(distance.label("distance_km"), models.Business.id)
+        .order_by(distance.asc(), models.Business.id.asc())
+        .offset(skip)
+        .limit(limit)
+        .all()
+    )
+    return [(float(d), biz_id) for d, biz_id in rows]
+
+
+class PythonGeoBackend:
+    """Portable fallback: btree lat/lng range prefilter, distances ranked in Python."""
+
+    name = "python"
+
+    def install(self, bind: Engine) -> None:
+        """Nothing beyond ix_businesses_lat_lng, which the model already declares."""
+
+    def filter_bbox(self, q: Query, bbox: BBox) -> Query:
+        return q.filter(_bbox_clause(bbox))
+
+    def rank_within(
+        self,
+        q: Query,
+        lat: float,
+        lng: float,
+        radius_km: float,
+        *,
+        skip: int,
+        limit: int,
+        after: Optional[Tuple[float, int]] = None,
+    ) -> Ranked:
+        """One page of (distance_km, id) pairs inside the radius, nearest first."""
+        q = self.filter_bbox(q, radius_bbox(lat, lng, radius_km))
+        candidates = q.with_entities(models.Business.id, models.Business.lat, models.Business.lng).all()
+        ranked = rank_by_distance(lat, lng, candidates, radius_km=radius_km, k=skip + limit, after=after)
+        return ranked[skip : skip + limit]
+
+
+class SQLiteRTreeGeoBackend(PythonGeoBackend):
+    """R*Tree virtual table for bbox lookups; SQLite lacks trig, so ranking stays in Python."""
+
+    name = "sqlite-rtree"
+    RTREE = "businesses_rtree"
+
+    _rtree = table(RTREE, column("id"), column("min_lat"), column("max_lat"), column("min_lng"), column("max_lng"))
+
+    def __init__(self) -> None:
+        self.rtree = False
+
+    def install(self, bind: Engine) -> None:
+        try:
+            with bind.begin() as conn:
+                exists = conn.execute(
+                    text("SELECT 1 FROM sqlite_master WHERE type = 'table' AND name = :name"), {"name": self.RTREE}
+                ).first()
+                for stmt in sqlite_rtree_ddl():
+                    conn.exec_driver_sql(stmt)
+                if not exists:
+                    conn.exec_driver_sql(SQLITE_RTREE_BACKFILL)
+        except SQLAlchemyError as exc:
+            logger.warning("SQLite R*Tree unavailable (%s); using lat/lng range filters", exc)
+            return
+        self.rtree = True
+
+    def filter_bbox(self, q: Query, bbox: BBox) -> Query:
+        if not self.rtree:
+            return super().filter_bbox(q, bbox)
+        west, south, east, north = bbox
+        rt = self._rtree
+        # R*Tree stores float32 boxes rounded outward, so re-check the exact bbox on the row.
+        candidate_ids = select(rt.c.id).where(
+            rt.c.max_lat >= south,
+            rt.c.min_lat <= north,
+            rt.c.max_lng >= west,
+            rt.c.min_lng <= east,
+        )
+        return q.filter(models.Business.id.in_(candidate_ids), _bbox_clause(bbox))
+
+
+class PostgresGeoBackend(PythonGeoBackend):
+    """earthdistance + GiST on PostgreSQL; haversine SQL if the extensions are unavailable."""
+
+    name = "postgres-earthdistance"
+
+    def __init__(self) -> None:
+        self.earthdistance = False
+
+    def install(self, bind: Engine) -> None:
+        try:
+            with bind.begin() as conn:
+                for stmt in POSTGRES_EARTHDISTANCE_DDL:
+                    conn.exec_driver_sql(stmt)
+        except SQLAlchemyError as exc:
+            logger.warning("earthdistance unavailable (%s); ranking with haversine SQL instead", exc)
+            return
+        self.earthdistance = True
+
+    def rank_within(
+        self,
+        q: Query,
+        lat: float,
+        lng: float,
+        radius_km: float,
+        *,
+        skip: int,
+        limit: int,
+        after: Optional[Tuple[float, int]] = None,
+    ) -> Ranked:
+        q = q.filter(models.Business.lat.isnot(None), models.Business.lng.isnot(None))
+        if not self.earthdistance:
+            q = self.filter_bbox(q, radius_bbox(lat, lng, radius_km))
+            distance = _haversine_sql(lat, lng)
+            return _rank_in_sql(q.filter(distance <= radius_km), distance, skip=skip, limit=limit, after=after)
+
+        center = func.ll_to_earth(lat, lng)
+        point = func.ll_to_earth(models.Business.lat, models.Business.lng)
+        radius_m = radius_km * 1000.0
+        q = q.filter(func.earth_box(center, radius_m).op("@>")(point))
+        distance = func.earth_distance(center, point) / 1000.0
+        return _rank_in_sql(q.filter(distance <= radius_km), distance, skip=skip, limit=limit, after=after)
+
+
+def _haversine_sql(lat: float, lng: float):
+    """Haversine distance (km) from a fixed point to each row, as a SQL expression."""
+    dlat = func.radians(models.Business.lat - lat)
+    dlng = func.radians(models.Business.lng - lng)
+    a = func.power(func.sin(dlat / 2), 2) + math.cos(math.radians(lat)) * func.cos(
+        func.radians(models.Business.lat)
+    ) * func.power(func.sin(dlng / 2), 2)
+    return 2 * EARTH_RADIUS_KM * func.asin(func.sqrt(func.least(1.0, a)))
+
+
+POSTGRES_EARTHDISTANCE_DDL = [
+    "CREATE EXTENSION IF NOT EXISTS cube",
+    "CREATE EXTENSION IF NOT EXISTS earthdistance",
+    "CREATE INDEX IF NOT EXISTS ix_businesses_earth ON businesses USING gist (ll_to_earth(lat, lng)) "
+    "WHERE lat IS NOT NULL AND lng IS NOT NULL",
+]
+
+
+def sqlite_rtree_ddl() -> List[str]:
+    t = SQLiteRTreeGeoBackend.RTREE
+    return [
+        f"CREATE VIRTUAL TABLE IF NOT EXISTS {t} USING rtree(id, min_lat, max_lat, min_lng, max_lng)",
+        f"""CREATE TRIGGER IF NOT EXISTS {t}_ai AFTER INSERT ON businesses
+            WHEN new.lat IS NOT NULL AND new.lng IS NOT NULL
+            BEGIN
+                INSERT OR REPLACE INTO {t} VALUES (new.id, new.lat, new.lat, new.lng, new.lng);
+            END""",
+        f"""CREATE TRIGGER IF NOT EXISTS {t}_au AFTER UPDATE OF lat, lng ON businesses
+            BEGIN
+                DELETE FROM {t} WHERE id = old.id;
+                INSERT INTO {t} SELECT new.id, new.lat, new.lat, new.lng, new.lng
+                    WHERE new.lat IS NOT NULL AND new.lng IS NOT NULL;
+            END""",
+        f"""CREATE TRIGGER IF NOT EXISTS {t}_ad AFTER DELETE ON businesses
+            BEGIN
+                DELETE FROM {t} WHERE id = old.id;
+            END""",
+    ]
+
+
+SQLITE_RTREE_BACKFILL = (
+    f"INSERT OR REPLACE INTO {SQLiteRTreeGeoBackend.RTREE} "
+    "SELECT id, lat, lat, lng, lng FROM businesses WHERE lat IS NOT NULL AND lng IS NOT NULL"
+)
+
+
+def backend_for_engine(bind: Engine) -> PythonGeoBackend:
+    """Pick the geo backend for an engine's dialect."""
+    dialect = bind.dialect.name
+    if dialect == "postgresql":
+        return PostgresGeoBackend()
+    if dialect == "sqlite":
+        return SQLiteRTreeGeoBackend()
+    return PythonGeoBackend()
+
+
+geo_backend = backend_for_engine(engine)
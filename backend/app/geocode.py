@@ -1,8 +1,59 @@
+# backend/app/geocode.py
+# Address -> (lat, lng) through Mapbox (when MAPBOX_TOKEN is set), then Nominatim.
+#
+# With GEOCODE_GAZETTEER pointing at a ZIP-centroid table the offline
+# ZipGazetteer joins them, last by default (answering what the network could
+# not), first with GEOCODE_GAZETTEER_ORDER=first, or alone with "only" for
+# air-gapped installs. Its answers are ZipCentroid coords, placed at the ZIP
+# code rather than the street address; coords_precision() tells them apart.
+#
+# Every provider has its own rate limiter shared by all threads, so single
+# lookups and batches together stay within Nominatim's 1 request/second policy
+# and the Mapbox quota. geocode_many() fans a batch out over a bounded thread
+# pool and returns results in input order; identical addresses are looked up
+# once. Provider URLs can be pointed at a local fake geocoder
+# (benchmarks/fake_geocoder.py) through MAPBOX_GEOCODE_URL / NOMINATIM_URL.
+#
+# Answers are cached per (normalized query, provider) in the geocode_cache
+# table, misses included, with an in-process LRU in front; entries expire after
+# GEOCODE_CACHE_TTL (hits) or GEOCODE_MISS_TTL (misses). A batch reads all its
+# queries from the table in one statement before anything goes to the network.
+# Transport errors are never cached.
+
+import csv
 import json
+import logging
 import os
+import re
+import threading
+import time
 import urllib.parse
 import urllib.request
-from typing import Optional, Tuple
+from collections import OrderedDict
+from concurrent.futures import ThreadPoolExecutor
+from datetime import datetime, timedelta
+from typing import Dict, Iterable, Iterator, List, Optional, Sequence, Tuple, Union
+
+import numpy as np
+from sqlalchemy import select, update
+from sqlalchemy.engine import Engine
+from sqlalchemy.exc import IntegrityError, SQLAlchemyError
+
+from . import models
+from .database import engine
+
+logger = logging.getLogger(__name__)
+
+Coords = Tuple[float, float]
+Address = Tuple[Optional[str], Optional[str], Optional[str], Optional[str]]  # address1, city, state, zip
+
+GEOCODE_WORKERS = int(os.getenv("GEOCODE_WORKERS", "8"))
+GEOCODE_TIMEOUT = float(os.getenv("GEOCODE_TIMEOUT", "8"))  # seconds per request
+GEOCODE_CACHE_SIZE = int(os.getenv("GEOCODE_CACHE_SIZE", "10000"))
+GEOCODE_CACHE_TTL = float(os.getenv("GEOCODE_CACHE_TTL", str(90 * 86400)))  # seconds
+GEOCODE_MISS_TTL = float(os.getenv("GEOCODE_MISS_TTL", str(7 * 86400)))  # seconds
+GEOCODE_GAZETTEER = os.getenv("GEOCODE_GAZETTEER", "")  # ZIP centroid CSV/TSV (or its compiled .npy); unset = off
+GEOCODE_GAZETTEER_ORDER = os.getenv("GEOCODE_GAZETTEER_ORDER", "last").lower()  # last, first or only
 
 
 def _build_query(address1: str | None, city: str | None, state: str | None, zip_code: str | None) -> str:
@@ -10,64 +61,488 @@ def _build_query(address1: str | None, city: str | None, state: str | None, zip_
     return ", ".join([p.strip() for p in parts if p and str(p).strip()])
 
 
-def geocode_address(
-    address1: str | None,
-    city: str | None,
-    state: str | None,
-    zip_code: str | None,
-    *,
-    timeout_seconds: int = 8,
-) -> Optional[Tuple[float, float]]:
-    query = _build_query(address1, city, state, zip_code)
-    if not query:
+def cache_key(query: str) -> str:
+    """Case- and whitespace-insensitive form of a query, the geocode_cache key."""
+    return " ".join(query.lower().split())
+
+
+class RateLimiter:
+    """Spaces calls at least 1/rate seconds apart across threads."""
+
+    def __init__(self, rate_per_second: float):
+        self.interval = 1.0 / rate_per_second if rate_per_second > 0 else 0.0
+        self._lock = threading.Lock()
+        self._next = 0.0
+
+    def wait(self) -> None:
+        if not self.interval:
+            return
+        with self._lock:
+            now = time.monotonic()
+            slot = max(now, self._next)
+            self._next = slot + self.interval
+        if slot > now:
+            time.sleep(slot - now)
+
+
+class ZipCentroid(tuple):
+    """Coords of a ZIP code's centroid, standing in for the street address."""
+
+    __slots__ = ()
+    precision = models.GeocodePrecision.ZIP.value
+
+
+def coords_precision(coords: Optional[Coords]) -> Optional[str]:
+    """GeocodePrecision of a geocoding answer; None for no answer."""
+    if not coords:
         return None
+    return getattr(coords, "precision", models.GeocodePrecision.ADDRESS.value)
+
+
+class MapboxGeocoder:
+    name = "mapbox"
+    local = False
+
+    def __init__(self) -> None:
+        # 600 requests/minute on the default Mapbox plan
+        self.limiter = RateLimiter(float(os.getenv("MAPBOX_RATE_LIMIT", "10")))
+
+    @property
+    def enabled(self) -> bool:
+        return bool(os.getenv("MAPBOX_TOKEN"))
 
-    mapbox_token = os.getenv("MAPBOX_TOKEN")
-    if mapbox_token:
+    def lookup(self, query: str, timeout: float) -> Optional[Coords]:
         url = (
-            "https://api.mapbox.com/geocoding/v5/mapbox.places/"
+            os.getenv("MAPBOX_GEOCODE_URL", "https://api.mapbox.com/geocoding/v5/mapbox.places/")
             + urllib.parse.quote(query)
             + ".json?"
             + urllib.parse.urlencode(
                 {
-                    "access_token": mapbox_token,
+                    "access_token": os.getenv("MAPBOX_TOKEN"),
                     "limit": 1,
                     "country": "US",
                 }
             )
         )
-        try:
-            with urllib.request.urlopen(url, timeout=timeout_seconds) as resp:
-                data = json.load(resp)
-            features = data.get("features") or []
-            if features:
-                center = features[0].get("center") or []
-                if len(center) == 2:
-                    lng, lat = center
-                    return float(lat), float(lng)
-        except Exception:
-            pass
-
-    nominatim_email = os.getenv("NOMINATIM_EMAIL")
-    params = {
-        "q": query,
-        "format": "json",
-        "limit": 1,
-        "addressdetails": 0,
-        "countrycodes": "us",
-    }
-    if nominatim_email:
-        params["email"] = nominatim_email
-    url = "https://nominatim.openstreetmap.org/search?" + urllib.parse.urlencode(params)
-    try:
-        req = urllib.request.Request(url, headers={"User-Agent": "bizscribe-import/1.0"})
-        with urllib.request.urlopen(req, timeout=timeout_seconds) as resp:
+        self.limiter.wait()
+        with urllib.request.urlopen(url, timeout=timeout) as resp:
+            data = json.load(resp)
+        features = data.get("features") or []
+        if features:
+            center = features[0].get("center") or []
+            if len(center) == 2:
+                lng, lat = center
+                return float(lat), float(lng)
+        return None
+
+
+class NominatimGeocoder:
+    name = "nominatim"
+    local = False
+    enabled = True
+
+    def __init__(self) -> None:
+        # Nominatim usage policy: at most one request per second
+        self.limiter = RateLimiter(float(os.getenv("NOMINATIM_RATE_LIMIT", "1")))
+
+    def lookup(self, query: str, timeout: float) -> Optional[Coords]:
+        params = {
+            "q": query,
+            "format": "json",
+            "limit": 1,
+            "addressdetails": 0,
+            "countrycodes": "us",
+        }
+        nominatim_email = os.getenv("NOMINATIM_EMAIL")
+        if nominatim_email:
+            params["email"] = nominatim_email
+        req = urllib.request.Request(
+            os.getenv("NOMINATIM_URL", "https://nominatim.openstreetmap.org/search") + "?" + urllib.parse.urlencode(params),
+            headers={"User-Agent": "bizscribe-import/1.0"},
+        )
+        self.limiter.wait()
+        with urllib.request.urlopen(req, timeout=timeout) as resp:
             data = json.load(resp)
         if data:
-            lat = float(data[0].get("lat"))
-            lng = float(data[0].get("lon"))
-            return lat, lng
-    except Exception:
+            return float(data[0].get("lat")), float(data[0].get("lon"))
         return None
 
+
+_ZIP_COLUMNS = ("zip", "zipcode", "zip_code", "postcode", "postal_code", "zcta", "zcta5", "geoid")
+_LAT_COLUMNS = ("lat", "latitude", "intptlat")
+_LNG_COLUMNS = ("lng", "lon", "long", "longitude", "intptlong")
+# Last part of a query: "19107", "19107-1234" or "PA 19107".
+_QUERY_ZIP = re.compile(r"^(?:[a-z]{2}\s+)?(\d{5})(?:-?\d{4})?$", re.IGNORECASE)
+
+
+def compile_gazetteer(source: str, target: str) -> int:
+    """Write a ZIP-centroid table as a .npy of zip, lat and lng rows sorted by zip; returns the ZIP count.
+
+    ``source`` is delimited text with a header naming a ZIP, latitude and
+    longitude column (zip/lat/lng, or the Census ZCTA gazetteer's
+    GEOID/INTPTLAT/INTPTLONG). Bad rows are skipped; a repeated ZIP keeps its
+    first row.
+    """
+    with open(source, newline="", encoding="utf-8-sig") as f:
+        dialect = csv.Sniffer().sniff(f.readline(), delimiters=",\t|;")
+        f.seek(0)
+        reader = csv.reader(f, dialect)
+        header = [column.strip().lower() for column in next(reader, [])]
+
+        def position(names: Sequence[str]) -> int:
+            for name in names:
+                if name in header:
+                    return header.index(name)
+            raise ValueError(f"{source}: no column named any of {', '.join(names)}")
+
+        zip_at, lat_at, lng_at = position(_ZIP_COLUMNS), position(_LAT_COLUMNS), position(_LNG_COLUMNS)
+        rows = []
+        for row in reader:
+            try:
+                digits = row[zip_at].strip().split("-")[0]
+                rows.append((int(digits.zfill(5)[:5]), float(row[lat_at]), float(row[lng_at])))
+            except (IndexError, ValueError):
+                continue
+    # One float32 row per column, so each is a contiguous slice of the mapping
+    # (ZIP codes are exact in float32); np.unique sorts by zip.
+    table = np.array(rows, dtype="<f4").reshape(-1, 3).T
+    _, first = np.unique(table[0], return_index=True)
+    partial = target + ".tmp"
+    with open(partial, "wb") as out:
+        np.save(out, np.ascontiguousarray(table[:, first]))
+    os.replace(partial, target)
+    return len(first)
+
+
+class ZipGazetteer:
+    """Offline provider: the centroid of the query's ZIP code from a memory-mapped sorted table.
+
+    A text source is compiled to ``<source>.npy`` on first use (again when the
+    source is newer) and that file is mapped read-only, so the table costs 12
+    bytes per ZIP of page cache shared by every process and a lookup is one
+    binary search. Queries without a trailing ZIP, or with one not in the
+    table, get None.
+    """
+
+    name = "gazetteer"
+    local = True
+
+    def __init__(self, path: str) -> None:
+        self.path = path
+        self._lock = threading.Lock()
+        self._zips: Optional[np.ndarray] = None
+        self._lats: Optional[np.ndarray] = None
+        self._lngs: Optional[np.ndarray] = None
+        self._failed = False
+
+    @property
+    def enabled(self) -> bool:
+        return not self._failed
+
+    def _compiled_path(self) -> str:
+        if self.path.endswith(".npy"):
+            return self.path
+        target = self.path + ".npy"
+        if not os.path.exists(target) or os.path.getmtime(target) < os.path.getmtime(self.path):
+            count = compile_gazetteer(self.path, target)
+            logger.info("Compiled gazetteer %s (%d ZIP codes) to %s", self.path, count, target)
+        return target
+
+    def _load(self) -> Optional[np.ndarray]:
+        with self._lock:
+            if self._zips is None and not self._failed:
+                try:
+                    table = np.load(self._compiled_path(), mmap_mode="r")
+                    if table.ndim != 2 or table.shape[0] != 3:
+                        raise ValueError(f"expected 3 rows, got shape {table.shape}")
+                    # Plain ndarray views of the mapping: no copy, without np.memmap's per-call overhead.
+                    self._zips, self._lats, self._lngs = np.asarray(table)
+                except (OSError, ValueError, csv.Error) as exc:
+                    logger.error("Gazetteer %s unavailable (%s); geocoding without it", self.path, exc)
+                    self._failed = True
+            return self._zips
+
+    def centroid(self, zip_code: int) -> Optional[Coords]:
+        zips = self._zips if self._zips is not None else self._load()
+        if zips is None:
+            return None
+        # A key of the table's dtype; a Python int would promote (and copy) the whole table per call.
+        i = int(zips.searchsorted(zips.dtype.type(zip_code)))
+        if i == len(zips) or zips[i] != zip_code:
+            return None
+        return ZipCentroid((round(float(self._lats[i]), 6), round(float(self._lngs[i]), 6)))
+
+    def lookup(self, query: str, timeout: float) -> Optional[Coords]:
+        found = _QUERY_ZIP.match(query.rsplit(",", 1)[-1].strip())
+        return self.centroid(int(found.group(1))) if found else None
+
+
+def _providers() -> list:
+    network = [MapboxGeocoder(), NominatimGeocoder()]
+    if not GEOCODE_GAZETTEER:
+        return network
+    gazetteer = ZipGazetteer(GEOCODE_GAZETTEER)
+    if GEOCODE_GAZETTEER_ORDER == "only":
+        return [gazetteer]
+    if GEOCODE_GAZETTEER_ORDER == "first":
+        return [gazetteer, *network]
+    return [*network, gazetteer]
+
+
+PROVIDERS = _providers()
+
+_ABSENT = object()  # no fresh cache entry; distinct from a cached miss (None)
+CachedResult = Union[Optional[Coords], object]
+
+
+class GeocodeCache:
+    """geocode_cache table with an LRU of recent entries in front."""
+
+    def __init__(
+        self,
+        bind: Engine,
+        *,
+        max_entries: int = GEOCODE_CACHE_SIZE,
+        ttl: float = GEOCODE_CACHE_TTL,
+        miss_ttl: float = GEOCODE_MISS_TTL,
+        enabled: bool = True,
+    ):
+        self.bind = bind
+        self.max_entries = max_entries
+        self.ttl = ttl
+        self.miss_ttl = miss_ttl
+        self.enabled = enabled
+        self._lock = threading.Lock()
+        # (key, provider) -> (coords or None, fetched_at)
+        self._entries: "OrderedDict[Tuple[str, str], Tuple[Optional[Coords], datetime]]" = OrderedDict()
+
+    def _fresh(self, coords: Optional[Coords], fetched_at: datetime) -> bool:
+        ttl = self.ttl if coords else self.miss_ttl
+        return datetime.utcnow() - fetched_at < timedelta(seconds=ttl)
+
+    def _remember(self, key: str, provider: str, coords: Optional[Coords], fetched_at: datetime) -> None:
+        with self._lock:
+            self._entries[(key, provider)] = (coords, fetched_at)
+            self._entries.move_to_end((key, provider))
+            while len(self._entries) > self.max_entries:
+                self._entries.popitem(last=False)
+
+    def _recall(self, key: str, provider: str) -> CachedResult:
+        with self._lock:
+            hit = self._entries.get((key, provider))
+            if hit is None:
+                return _ABSENT
+            if not self._fresh(*hit):
+                del self._entries[(key, provider)]
+                return _ABSENT
+            self._entries.move_to_end((key, provider))
+            return hit[0]
+
+    def _read(self, keys: Sequence[str]) -> None:
+        table = models.GeocodeCacheEntry.__table__
+        try:
+            with self.bind.connect() as conn:
+                for start in range(0, len(keys), 500):
+                    rows = conn.execute(
+                        select(table.c.query, table.c.provider, table.c.lat, table.c.lng, table.c.miss, table.c.fetched_at)
+                        .where(table.c.query.in_(keys[start:start + 500]))
+                    )
+                    for key, provider, lat, lng, miss, fetched_at in rows:
+                        coords = None if miss or lat is None or lng is None else (lat, lng)
+                        if self._fresh(coords, fetched_at):
+                            self._remember(key, provider, coords, fetched_at)
+        except SQLAlchemyError as exc:
+            logger.warning("geocode cache read failed (%s); geocoding uncached", exc)
+
+    def load(self, keys: Iterable[str]) -> None:
+        """Pull table entries for ``keys`` not already in the LRU, in one statement per 500."""
+        if not self.enabled:
+            return
+        with self._lock:
+            known = {key for key, _ in self._entries}
+        missing = [key for key in dict.fromkeys(keys) if key not in known]
+        if missing:
+            self._read(missing)
+
+    def get(self, key: str, provider: str, *, read_through: bool = True) -> CachedResult:
+        """Cached coords, None for a cached miss, or _ABSENT.
+
+        ``read_through=False`` consults only the LRU (after load() has filled it).
+        """
+        if not self.enabled:
+            return _ABSENT
+        found = self._recall(key, provider)
+        if found is _ABSENT and read_through:
+            self._read([key])
+            found = self._recall(key, provider)
+        return found
+
+    def put(self, key: str, provider: str, coords: Optional[Coords]) -> None:
+        if not self.enabled:
+            return
+        now = datetime.utcnow()
+        self._remember(key, provider, coords, now)
+        table = models.GeocodeCacheEntry.__table__
+        values = {
+            "lat": coords[0] if coords else None,
+            "lng": coords[1] if coords else None,
+            "miss": coords is None,
+            "fetched_at": now,
+        }
+        match = (table.c.query == key) & (table.c.provider == provider)
+        try:
+            with self.bind.begin() as conn:
+                if conn.execute(update(table).where(match).values(**values)).rowcount == 0:
+                    conn.execute(table.insert().values(query=key, provider=provider, **values))
+        except IntegrityError:
+            pass  # another thread stored the same answer first
+        except SQLAlchemyError as exc:
+            logger.warning("geocode cache write failed (%s)", exc)
+
+    def clear(self) -> None:
+        """Forget the in-process layer (the table is left alone)."""
+        with self._lock:
+            self._entries.clear()
+
+
+geocode_cache = GeocodeCache(
+    engine,
+    enabled=os.getenv("GEOCODE_CACHE", "1").lower() not in {"0", "false", "no", "off"},
+)
+
+
+class GeocodeStats:
+    """Per-caller counters: addresses geocoded and how many needed no network call."""
+
+    __slots__ = ("lookups", "cache_hits")
+
+    def __init__(self) -> None:
+        self.lookups = 0
+        self.cache_hits = 0
+
+    @property
+    def hit_ratio(self) -> Optional[float]:
+        return self.cache_hits / self.lookups if self.lookups else None
+
+
+_pool_lock = threading.Lock()
+_pool: Optional[ThreadPoolExecutor] = None
+
+
+def _from_cache(key: str) -> CachedResult:
+    """The answer if loaded entries (or local providers) settle it for every enabled provider in turn, else _ABSENT."""
+    for provider in PROVIDERS:
+        if not provider.enabled:
+            continue
+        if provider.local:
+            cached = provider.lookup(key, 0.0)
+        else:
+            cached = geocode_cache.get(key, provider.name, read_through=False)
+            if cached is _ABSENT:
+                return _ABSENT
+        if cached:
+            return cached
     return None
+
+
+def _geocode_query(query: str, timeout: float) -> Tuple[Optional[Coords], bool]:
+    """Coords (or None) and whether any provider was actually called."""
+    key = cache_key(query)
+    called = False
+    for provider in PROVIDERS:
+        if not provider.enabled:
+            continue
+        if provider.local:
+            coords = provider.lookup(query, timeout)  # no network call, nothing to cache
+        else:
+            coords = geocode_cache.get(key, provider.name)
+        if coords is _ABSENT:
+            called = True
+            try:
+                coords = provider.lookup(query, timeout)
+            except Exception:
+                continue  # transient; try the next provider, cache nothing
+            geocode_cache.put(key, provider.name, coords)
+        if coords:
+            return coords, called
+    return None, called
+
+
+def geocode_address(
+    address1: str | None,
+    city: str | None,
+    state: str | None,
+    zip_code: str | None,
+    *,
+    timeout_seconds: float = GEOCODE_TIMEOUT,
+) -> Optional[Coords]:
+    query = _build_query(address1, city, state, zip_code)
+    if not query:
+        return None
+    return _geocode_query(query, timeout_seconds)[0]
+
+
+def _executor() -> ThreadPoolExecutor:
+    global _pool
+    with _pool_lock:
+        if _pool is None:
+            _pool = ThreadPoolExecutor(max_workers=GEOCODE_WORKERS, thread_name_prefix="geocode")
+        return _pool
+
+
+def iter_geocode(
+    addresses: Sequence[Address],
+    *,
+    timeout_seconds: float = GEOCODE_TIMEOUT,
+    stats: Optional[GeocodeStats] = None,
+) -> Iterator[Optional[Coords]]:
+    """Geocode concurrently, yielding results in input order as they become available.
+
+    Cached answers are read up front; the rest share one bounded pool
+    (GEOCODE_WORKERS threads) and the per-provider rate limits. Closing the
+    iterator early cancels lookups not yet started. ``stats`` counts every
+    non-empty address, and as a cache hit when it cost no network call
+    (repeats within the batch included).
+    """
+    queries = [_build_query(*address) for address in addresses]
+    keys = [cache_key(q) for q in queries]
+    unique = {key: query for key, query in zip(keys, queries) if key}
+    geocode_cache.load(unique)
+    cached: Dict[str, CachedResult] = {key: _from_cache(key) for key in unique}
+    futures = {
+        key: _executor().submit(_geocode_query, query, timeout_seconds)
+        for key, query in unique.items()
+        if cached[key] is _ABSENT
+    }
+    called = set()
+    try:
+        for key in keys:
+            if not key:
+                yield None
+                continue
+            if key in futures:
+                coords, network = futures[key].result()
+                if network and key not in called:
+                    called.add(key)
+                    network_call = True
+                else:
+                    network_call = False
+            else:
+                coords, network_call = cached[key], False
+            if stats is not None:
+                stats.lookups += 1
+                stats.cache_hits += 0 if network_call else 1
+            yield coords
+    finally:
+        for future in futures.values():
+            future.cancel()
+
+
+def geocode_many(
+    addresses: Sequence[Address],
+    *,
+    timeout_seconds: float = GEOCODE_TIMEOUT,
+    stats: Optional[GeocodeStats] = None,
+) -> List[Optional[Coords]]:
+    """Geocode a batch concurrently; results line up with ``addresses``."""
+    return list(iter_geocode(addresses, timeout_seconds=timeout_seconds, stats=stats))
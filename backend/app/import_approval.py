@@ -0,0 +1,181 @@
+# backend/app/import_approval.py
+# Bulk approval of import items into businesses.
+#
+# Items are approved a chunk at a time: a multi-row INSERT ... RETURNING
+# creates the chunk's businesses (unsorted on SQLite, see
+# _insert_businesses), one executemany UPDATE points the items at them, and the
+# chunk is committed with a catalog version bump before the next one is read,
+# so locks on businesses are only ever held for one chunk. Item statuses are
+# the progress record: a run that dies part-way leaves its committed chunks
+# APPROVED and the rest untouched, and running the approval again finishes it.
+
+import os
+from datetime import datetime
+from typing import Iterator, List, Optional, Sequence, Tuple
+
+from sqlalchemy import bindparam, insert, select, update
+from sqlalchemy.engine import Row
+from sqlalchemy.orm import Session
+
+from . import models
+from .catalog import bump_catalog_version
+from .import_counts import record_transitions
+from .spatial_index import IndexedBusiness, business_index
+
+APPROVE_CHUNK_SIZE = int(os.getenv("APPROVE_CHUNK_SIZE", "1000"))
+
+_FINAL_STATUSES = (
+    models.ImportItemStatus.APPROVED.value,
+    models.ImportItemStatus.REJECTED.value,
+    models.ImportItemStatus.MERGED.value,
+)
+
+_item = models.ImportItem
+# Named after the business columns they are copied to, so a row maps straight onto an INSERT.
+_BUSINESS_COLUMNS = ("name", "description", "phone_number", "location", "lat", "lng", "address1", "city", "state", "zip")
+_ITEM_COLUMNS = (
+    _item.id.label("item_id"),
+    _item.duplicate_of_business_id.label("duplicate_of"),
+    _item.status,
+    *(getattr(_item, column) for column in _BUSINESS_COLUMNS),
+)
+
+_items = models.ImportItem.__table__
+_link_statement = (
+    update(_items)
+    .where(_items.c.id == bindparam("item_id"))
+    .values(
+        status=models.ImportItemStatus.APPROVED.value,
+        approved_business_id=bindparam("business_id"),
+        error_message=None,
+    )
+)
+
+
+def _chunks(
+    db: Session,
+    batch_id: int,
+    item_ids: Optional[Sequence[int]],
+    chunk_size: int,
+) -> Iterator[List[Row]]:
+    """Approvable items in id order: every READY one, or the listed ones not yet final."""
+    if item_ids is None:
+        last_id = 0
+        while True:
+            rows = db.execute(
+                select(*_ITEM_COLUMNS)
+                .where(
+                    _item.batch_id == batch_id,
+                    _item.status == models.ImportItemStatus.READY.value,
+                    _item.id > last_id,
+                )
+                .order_by(_item.id)
+                .limit(chunk_size)
+            ).all()
+            if not rows:
+                return
+            last_id = rows[-1].item_id
+            yield rows
+    else:
+        ids = sorted(set(item_ids))
+        for start in range(0, len(ids), chunk_size):
+            rows = db.execute(
+                select(*_ITEM_COLUMNS)
+                .where(
+                    _item.batch_id == batch_id,
+                    _item.id.in_(ids[start:start + chunk_size]),
+                    _item.status.not_in(_FINAL_STATUSES),
+                )
+                .order_by(_item.id)
+            ).all()
+            if rows:
+                yield rows
+
+
+def _insert_businesses(db: Session, values: List[dict]) -> List[int]:
+    """Insert businesses; returns their ids in ``values`` order."""
+    biz = models.Business.__table__
+    if db.get_bind().dialect.name != "sqlite":
+        return list(db.scalars(insert(biz).returning(biz.c.id, sort_by_parameter_order=True), values))
+    # SQLite gives RETURNING rows in no set order, so the sorted form above would
+    # degrade to one INSERT per row. Unsorted, it stays a few multi-row INSERTs
+    # whose RETURNING holds exactly our rows, whatever other writers do; each
+    # row gets rowid max(rowid) + 1 in VALUES order, so ascending ids line up
+    # with ``values``.
+    ids = sorted(db.scalars(insert(biz).returning(biz.c.id), values))
+    if len(ids) != len(values):
+        raise RuntimeError(f"Bulk approval inserted {len(ids)} businesses for {len(values)} items")
+    return ids
+
+
+def _approve_chunk(db: Session, batch_id: int, rows: List[Row], reviewer_id: int) -> int:
+    missing_coords: List[int] = []
+    held: List[int] = []
+    approvable: List[Row] = []
+    changes: List[Tuple[str, str]] = []
+    for row in rows:
+        if row.lat is None or row.lng is None:
+            missing_coords.append(row.item_id)
+            changes.append((row.status, models.ImportItemStatus.NEEDS_FIX.value))
+        elif row.duplicate_of:
+            held.append(row.item_id)
+            changes.append((row.status, models.ImportItemStatus.DUPLICATE_PENDING.value))
+        else:
+            approvable.append(row)
+            changes.append((row.status, models.ImportItemStatus.APPROVED.value))
+    record_transitions(db, batch_id, changes)
+
+    if missing_coords:
+        db.execute(
+            update(_item)
+            .where(_item.id.in_(missing_coords))
+            .values(status=models.ImportItemStatus.NEEDS_FIX.value, error_message="Missing or invalid coordinates.")
+        )
+    if held:
+        db.execute(
+            update(_item).where(_item.id.in_(held)).values(status=models.ImportItemStatus.DUPLICATE_PENDING.value)
+        )
+
+    business_ids: List[int] = []
+    if approvable:
+        bump_catalog_version(db)
+        fixed = {
+            "hide_address": False,
+            "is_approved": True,
+            "approved_at": datetime.utcnow(),
+            "approved_by_id": reviewer_id,
+            "created_by_id": reviewer_id,
+        }
+        business_ids = _insert_businesses(db, [{**dict(zip(_BUSINESS_COLUMNS, row[-len(_BUSINESS_COLUMNS):])), **fixed} for row in approvable])
+        db.execute(
+            _link_statement,
+            [{"item_id": row.item_id, "business_id": business_id} for row, business_id in zip(approvable, business_ids)],
+        )
+    db.commit()
+
+    business_index.apply(
+        business_ids,
+        [IndexedBusiness(business_id, row.name, float(row.lat), float(row.lng)) for row, business_id in zip(approvable, business_ids)],
+    )
+    return len(business_ids)
+
+
+def approve_items(
+    db: Session,
+    batch_id: int,
+    reviewer_id: int,
+    *,
+    item_ids: Optional[Sequence[int]] = None,
+    chunk_size: int = APPROVE_CHUNK_SIZE,
+) -> int:
+    """Create approved businesses from a batch's items; returns how many were created.
+
+    With ``item_ids`` None every READY item is approved. Otherwise the listed
+    items are, except those already approved, rejected or merged; as in the
+    single-item flow, ones without coordinates go to NEEDS_FIX and ones with a
+    duplicate to DUPLICATE_PENDING instead. Commits once per chunk.
+    """
+    created = 0
+    for rows in _chunks(db, batch_id, item_ids, max(1, chunk_size)):
+        created += _approve_chunk(db, batch_id, rows, reviewer_id)
+    return created
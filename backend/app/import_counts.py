@@ -0,0 +1,83 @@
+# backend/app/import_counts.py
+# Per-status item counters on ImportBatch.
+#
+# Every path that creates import items or changes their status hands the
+# (old, new) status pairs to record_transitions() inside its own transaction.
+# The counters are moved with relative UPDATEs (count = count + n), so an
+# import job still writing rows and an admin approving earlier ones cannot
+# overwrite each other's changes. Batch summaries read the counters instead of
+# the items; reconcile_counts() recomputes them from import_items with one
+# GROUP BY, for repair.
+
+from collections import Counter
+from typing import Dict, Iterable, Optional, Sequence, Tuple
+
+from sqlalchemy import bindparam, func, select, update
+from sqlalchemy.orm import Session
+
+from . import models
+
+STATUS_COUNTERS = {
+    models.ImportItemStatus.READY.value: "ready_count",
+    models.ImportItemStatus.NEEDS_GEOCODE.value: "needs_geocode_count",
+    models.ImportItemStatus.NEEDS_FIX.value: "needs_fix_count",
+    models.ImportItemStatus.DUPLICATE_PENDING.value: "duplicate_pending_count",
+    models.ImportItemStatus.APPROVED.value: "approved_count",
+    models.ImportItemStatus.REJECTED.value: "rejected_count",
+    models.ImportItemStatus.MERGED.value: "merged_count",
+}
+
+_batches = models.ImportBatch.__table__
+_items = models.ImportItem.__table__
+
+
+def record_transitions(db: Session, batch_id: int, changes: Iterable[Tuple[Optional[str], str]]) -> None:
+    """Move a batch's counters by (old status, new status) pairs; old is None for a new item."""
+    deltas: Counter = Counter()
+    for old, new in changes:
+        if old == new:
+            continue
+        if old is not None:
+            deltas[old] -= 1
+        deltas[new] += 1
+    values = {STATUS_COUNTERS[status]: _batches.c[STATUS_COUNTERS[status]] + n for status, n in deltas.items() if n}
+    if values:
+        db.execute(update(_batches).where(_batches.c.id == batch_id).values(**values))
+
+
+def record_transition(db: Session, batch_id: int, old: Optional[str], new: str) -> None:
+    record_transitions(db, batch_id, [(old, new)])
+
+
+def status_counts(batch: models.ImportBatch) -> Dict[str, int]:
+    return {status: getattr(batch, column) or 0 for status, column in STATUS_COUNTERS.items()}
+
+
+def reconcile_counts(db: Session, batch_ids: Optional[Sequence[int]] = None) -> int:
+    """Reset counters from the items themselves (all batches by default); returns batches updated.
+
+    Leaves committing to the caller.
+    """
+    counted = select(_items.c.batch_id, _items.c.status, func.count()).group_by(_items.c.batch_id, _items.c.status)
+    ids = select(_batches.c.id)
+    if batch_ids is not None:
+        counted = counted.where(_items.c.batch_id.in_(batch_ids))
+        ids = ids.where(_batches.c.id.in_(batch_ids))
+
+    counts: Dict[int, Dict[str, int]] = {
+        batch_id: dict.fromkeys(STATUS_COUNTERS.values(), 0) for (batch_id,) in db.execute(ids)
+    }
+    for batch_id, status, n in db.execute(counted):
+        if batch_id in counts and status in STATUS_COUNTERS:
+            counts[batch_id][STATUS_COUNTERS[status]] = n
+    if counts:
+        db.execute(
+            update(_batches)
+            .where(_batches.c.id == bindparam("batch_id"))
+            .values({column: bindparam(f"new_{column}") for column in STATUS_COUNTERS.values()}),
+            [
+                {"batch_id": batch_id, **{f"new_{column}": n for column, n in values.items()}}
+                for batch_id, values in counts.items()
+            ],
+        )
+    return len(counts)
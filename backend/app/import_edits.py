@@ -0,0 +1,165 @@
+# backend/app/import_edits.py
+# Field edits to import items, one at a time or many in a single transaction.
+#
+# edit_items() reads the targeted items' columns a few hundred ids per query
+# (load_rows), applies every edit to those rows in memory, re-matches all
+# edited rows against the catalog with one match_duplicates() pass and
+# recomputes their statuses (resolve_rows), then writes them back with one
+# executemany UPDATE and moves the batch counters (save_rows) before
+# committing once. The number of statements depends on how many items are
+# edited only through the chunked reads, never one per item. The batch
+# re-geocode job (import_regeocode.py) writes its results the same way.
+
+from typing import Dict, List, NamedTuple, Optional, Sequence, Tuple
+
+from sqlalchemy import bindparam, select, update
+from sqlalchemy.orm import Session
+
+from . import models
+from .importer import build_location, compute_status, match_duplicates, safe_float
+from .import_counts import record_transitions
+
+_LOAD_CHUNK = 500
+
+_FINAL_STATUSES = {
+    models.ImportItemStatus.APPROVED.value,
+    models.ImportItemStatus.REJECTED.value,
+    models.ImportItemStatus.MERGED.value,
+}
+
+# ImportItemUpdate fields, followed by the columns derived from them.
+_EDITABLE = ("name", "description", "phone_number", "location", "lat", "lng", "address1", "city", "state", "zip")
+_RESOLVED = ("status", "error_message", "duplicate_of_business_id", "duplicate_confidence", "geocode_precision")
+
+_items = models.ImportItem.__table__
+_write_statement = (
+    update(_items)
+    .where(_items.c.id == bindparam("item_id"))
+    .values({column: bindparam(f"new_{column}") for column in _EDITABLE + _RESOLVED})
+)
+
+
+class EditResult(NamedTuple):
+    item_id: int
+    item: Optional[models.ImportItem]  # None when the edit was refused
+    error: Optional[str]
+
+
+def clean_fields(fields: Dict[str, object]) -> Dict[str, object]:
+    """ImportItemUpdate values as stored: coordinates parsed, strings stripped, blanks as None."""
+    cleaned = {}
+    for field, value in fields.items():
+        if field in {"lat", "lng"}:
+            value = safe_float(value)
+        elif isinstance(value, str):
+            value = value.strip() or None
+        cleaned[field] = value
+    return cleaned
+
+
+def _apply(row: dict, fields: Dict[str, object]) -> None:
+    row.update(fields)
+    if "lat" in fields or "lng" in fields:
+        row["geocode_precision"] = None  # entered by hand
+    if not row["location"]:
+        row["location"] = build_location(row["address1"], row["city"], row["state"], row["zip"])
+
+
+def load_rows(db: Session, batch_id: int, item_ids: Sequence[int]) -> Dict[int, dict]:
+    """Editable and resolved columns of a batch's items, keyed by id; ids outside the batch are left out."""
+    ids = sorted(set(item_ids))
+    rows: Dict[int, dict] = {}
+    for start in range(0, len(ids), _LOAD_CHUNK):
+        found = db.execute(
+            select(_items.c.id, *(_items.c[column] for column in _EDITABLE + _RESOLVED)).where(
+                _items.c.batch_id == batch_id,
+                _items.c.id.in_(ids[start:start + _LOAD_CHUNK]),
+            )
+        )
+        for row in found.mappings():
+            rows[row["id"]] = dict(row)
+    return rows
+
+
+def resolve_rows(db: Session, rows: Sequence[dict]) -> None:
+    """Set duplicate link, confidence, status and error message of item rows with one match_duplicates() pass."""
+    for row, match in zip(rows, match_duplicates(db, rows)):
+        row["duplicate_of_business_id"], row["duplicate_confidence"] = match or (None, None)
+        row["status"] = compute_status(
+            duplicate_of_business_id=row["duplicate_of_business_id"], lat=row["lat"], lng=row["lng"], error_message=None
+        )
+        if row["status"] != models.ImportItemStatus.NEEDS_FIX.value:
+            row["error_message"] = None
+
+
+def save_rows(db: Session, batch_id: int, rows: Sequence[dict], old_status: Dict[int, str]) -> None:
+    """Write rows from load_rows() back with one executemany UPDATE and move the batch counters.
+
+    ``old_status`` maps each row's id to its status when loaded. Leaves
+    committing to the caller.
+    """
+    if not rows:
+        return
+    db.execute(
+        _write_statement,
+        [{"item_id": row["id"], **{f"new_{c}": row[c] for c in _EDITABLE + _RESOLVED}} for row in rows],
+    )
+    record_transitions(db, batch_id, [(old_status[row["id"]], row["status"]) for row in rows])
+
+
+def apply_fields(item: models.ImportItem, fields: Dict[str, object]) -> None:
+    row = {column: getattr(item, column) for column in _EDITABLE + ("geocode_precision",)}
+    _apply(row, fields)
+    for column, value in row.items():
+        setattr(item, column, value)
+
+
+def rematch(db: Session, items: Sequence[models.ImportItem]) -> None:
+    """Re-run duplicate matching and status for ORM ``items``, as edit_items() does for its rows."""
+    rows = [{column: getattr(item, column) for column in _EDITABLE + _RESOLVED} for item in items]
+    resolve_rows(db, rows)
+    for item, row in zip(items, rows):
+        for column in _RESOLVED:
+            setattr(item, column, row[column])
+
+
+def edit_items(db: Session, batch_id: int, edits: Sequence[Tuple[int, Dict[str, object]]]) -> List[EditResult]:
+    """Apply (item id, ImportItemUpdate fields) edits to a batch's items and commit once.
+
+    Results come back in ``edits`` order. An edit is refused, leaving its item
+    untouched, when the item is not in the batch, is already approved,
+    rejected or merged, or would be left without a name. Several edits to the
+    same item are applied in order.
+    """
+    rows = load_rows(db, batch_id, [item_id for item_id, _ in edits])
+
+    old_status: Dict[int, str] = {}
+    results: List[Tuple[int, Optional[str]]] = []
+    for item_id, fields in edits:
+        row = rows.get(item_id)
+        fields = clean_fields(fields)
+        if row is None:
+            error = "Item not found"
+        elif row["status"] in _FINAL_STATUSES:
+            error = f"Item is already {row['status'].lower()}."
+        elif "name" in fields and not fields["name"]:
+            error = "Name is required."
+        else:
+            error = None
+            old_status.setdefault(item_id, row["status"])
+            _apply(row, fields)
+        results.append((item_id, error))
+
+    items: Dict[int, models.ImportItem] = {}
+    if old_status:
+        edited = [rows[item_id] for item_id in old_status]
+        resolve_rows(db, edited)
+        save_rows(db, batch_id, edited, old_status)
+        db.commit()
+        edited_ids = sorted(old_status)
+        for start in range(0, len(edited_ids), _LOAD_CHUNK):
+            for item in db.query(models.ImportItem).filter(
+                models.ImportItem.id.in_(edited_ids[start:start + _LOAD_CHUNK])
+            ):
+                items[item.id] = item
+    return [EditResult(item_id, items.get(item_id) if error is None else None, error) for item_id, error in results]
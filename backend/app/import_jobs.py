@@ -0,0 +1,232 @@
+# backend/app/import_jobs.py
+# Background runner for CSV import batches.
+#
+# POST /api/imports/batches stores the upload under IMPORT_UPLOAD_DIR, creates
+# the batch in PROCESSING and hands its id to a thread pool (IMPORT_WORKERS
+# threads, each with its own SessionLocal session) that runs the importer.
+# Progress lives in two places: the committed batch.processed_rows, advanced
+# once per chunk and used to resume, and a per-row counter kept here for the
+# progress endpoint. At startup every batch still in PROCESSING is re-queued;
+# like the spatial index this assumes a single API worker, since a second one
+# would resume the same batches. On shutdown running jobs stop at the next row
+# and roll back their open chunk, to be resumed on the next start.
+
+import logging
+import os
+import threading
+import time
+import uuid
+from concurrent.futures import ThreadPoolExecutor
+from datetime import datetime
+from typing import BinaryIO, Callable, Dict, Optional, Set, Tuple
+
+from sqlalchemy.orm import Session
+
+from . import models
+from .database import SessionLocal
+from .importer import CsvImportError, ingest_rows, open_csv
+
+logger = logging.getLogger(__name__)
+
+IMPORT_WORKERS = int(os.getenv("IMPORT_WORKERS", "2"))
+IMPORT_UPLOAD_DIR = os.getenv(
+    "IMPORT_UPLOAD_DIR",
+    os.path.join(os.path.dirname(os.path.dirname(os.path.abspath(__file__))), "uploads", "imports"),
+)
+
+_COPY_BLOCK = 1 << 20
+
+
+class JobStopped(Exception):
+    """Raised inside a job when the runner is shutting down."""
+
+
+class JobProgress:
+    """Live row counter for a running job; the rate covers this run only (not before a resume)."""
+
+    __slots__ = ("batch_id", "processed_rows", "_start_rows", "_started")
+
+    def __init__(self, batch_id: int, start_rows: int):
+        self.batch_id = batch_id
+        self.processed_rows = start_rows
+        self._start_rows = start_rows
+        self._started = time.monotonic()
+
+    @property
+    def rows_per_second(self) -> Optional[float]:
+        elapsed = time.monotonic() - self._started
+        done = self.processed_rows - self._start_rows
+        if done <= 0 or elapsed <= 0:
+            return None
+        return done / elapsed
+
+
+def store_upload(stream: BinaryIO) -> Tuple[str, int]:
+    """Copy an upload to IMPORT_UPLOAD_DIR; returns its path and line count (a row estimate)."""
+    os.makedirs(IMPORT_UPLOAD_DIR, exist_ok=True)
+    path = os.path.join(IMPORT_UPLOAD_DIR, f"{uuid.uuid4().hex}.csv")
+    lines = 0
+    with open(path, "wb") as out:
+        while True:
+            block = stream.read(_COPY_BLOCK)
+            if not block:
+                break
+            lines += block.count(b"\n")
+            out.write(block)
+    return path, lines
+
+
+def discard_upload(path: Optional[str]) -> None:
+    if path:
+        try:
+            os.remove(path)
+        except FileNotFoundError:
+            pass
+
+
+class ImportJobRunner:
+    """Thread pool running one import job per batch id."""
+
+    def __init__(self, workers: int = IMPORT_WORKERS, session_factory: Callable[[], Session] = SessionLocal):
+        self.workers = max(1, workers)
+        self._session_factory = session_factory
+        self._lock = threading.Lock()
+        self._executor: Optional[ThreadPoolExecutor] = None
+        self._queued: Set[int] = set()
+        self._running: Dict[int, JobProgress] = {}
+        self._stopping = threading.Event()
+
+    def submit(self, batch_id: int) -> None:
+        """Queue a PROCESSING batch; a batch already queued or running is left alone."""
+        with self._lock:
+            if batch_id in self._queued or self._stopping.is_set():
+                return
+            if self._executor is None:
+                self._executor = ThreadPoolExecutor(max_workers=self.workers, thread_name_prefix="import-job")
+            self._queued.add(batch_id)
+            self._executor.submit(self._run, batch_id)
+
+    def resume_pending(self) -> int:
+        """Re-queue every batch left in PROCESSING (by a restart); returns how many."""
+        self._stopping.clear()
+        with self._session_factory() as db:
+            ids = [
+                batch_id
+                for (batch_id,) in db.query(models.ImportBatch.id)
+                .filter(models.ImportBatch.status == models.ImportBatchStatus.PROCESSING.value)
+                .order_by(models.ImportBatch.id.asc())
+            ]
+        for batch_id in ids:
+            self.submit(batch_id)
+        if ids:
+            logger.info("Resuming %d import batch(es): %s", len(ids), ids)
+        return len(ids)
+
+    def progress(self, batch_id: int) -> Optional[JobProgress]:
+        """Live counter of a running job, None when it is queued or not in this process."""
+        return self._running.get(batch_id)
+
+    def shutdown(self, wait: bool = True) -> None:
+        """Stop running jobs at their next row; unfinished batches stay PROCESSING."""
+        self._stopping.set()
+        with self._lock:
+            executor, self._executor = self._executor, None
+        if executor is not None:
+            executor.shutdown(wait=wait, cancel_futures=True)
+
+    def _run(self, batch_id: int) -> None:
+        try:
+            with self._session_factory() as db:
+                self._run_job(db, batch_id)
+        except Exception:
+            logger.exception("Import job for batch %s crashed", batch_id)
+        finally:
+            with self._lock:
+                self._queued.discard(batch_id)
+                self._running.pop(batch_id, None)
+
+    def _run_job(self, db: Session, batch_id: int) -> None:
+        batch = db.get(models.ImportBatch, batch_id)
+        if batch is None or batch.status != models.ImportBatchStatus.PROCESSING.value:
+            return
+        if batch.started_at is None:
+            batch.started_at = datetime.utcnow()
+            db.commit()
+
+        job = JobProgress(batch_id, batch.processed_rows or 0)
+
+        def on_row(processed: int) -> None:
+            if self._stopping.is_set():
+                raise JobStopped()
+            job.processed_rows = processed
+
+        self._running[batch_id] = job
+        try:
+            with open(batch.upload_path or "", "rb") as upload:
+                ingest_rows(db, batch, open_csv(upload), progress=on_row)
+        except JobStopped:
+            db.rollback()
+            logger.info("Import batch %s interrupted at row %s; it resumes on restart", batch_id, batch.processed_rows)
+            return
+        except FileNotFoundError:
+            db.rollback()
+            self._finish(db, batch, models.ImportBatchStatus.FAILED, "Uploaded file is no longer available.")
+        except CsvImportError as exc:
+            db.rollback()
+            self._finish(db, batch, models.ImportBatchStatus.FAILED, str(exc))
+        except Exception:
+            logger.exception("Import batch %s failed", batch_id)
+            db.rollback()
+            self._finish(db, batch, models.ImportBatchStatus.FAILED, "Import failed unexpectedly.")
+        else:
+            self._finish(db, batch, models.ImportBatchStatus.COMPLETE, None)
+
+    @staticmethod
+    def _finish(
+        db: Session,
+        batch: models.ImportBatch,
+        status: models.ImportBatchStatus,
+        error_message: Optional[str],
+    ) -> None:
+        discard_upload(batch.upload_path)
+        batch.status = status.value
+        batch.error_message = error_message
+        batch.upload_path = None
+        batch.finished_at = datetime.utcnow()
+        db.commit()
+
+
+def progress_report(batch: models.ImportBatch, runner: "ImportJobRunner") -> dict:
+    """Fields of schemas.ImportBatchProgress for a batch, live while its job runs here."""
+    processed = batch.processed_rows or 0
+    rate = None
+    eta = None
+    job = runner.progress(batch.id)
+    if batch.status == models.ImportBatchStatus.PROCESSING.value:
+        if job is not None:
+            processed = max(processed, job.processed_rows)
+            rate = job.rows_per_second
+        if rate and batch.expected_rows is not None:
+            eta = max(batch.expected_rows - processed, 0) / rate
+    else:
+        if batch.started_at and batch.finished_at:
+            elapsed = (batch.finished_at - batch.started_at).total_seconds()
+            rate = processed / elapsed if elapsed > 0 else None
+        eta = 0.0
+    return {
+        "batch_id": batch.id,
+        "status": batch.status,
+        "processed_rows": processed,
+        "expected_rows": batch.expected_rows,
+        "total_rows": batch.total_rows,
+        "rows_per_second": rate,
+        "eta_seconds": eta,
+        "geocode_lookups": batch.geocode_lookups or 0,
+        "geocode_hit_ratio": batch.geocode_cache_hits / batch.geocode_lookups if batch.geocode_lookups else None,
+        "error_message": batch.error_message,
+        "started_at": batch.started_at,
+        "finished_at": batch.finished_at,
+    }
+
+
+import_runner = ImportJobRunner()
@@ -0,0 +1,250 @@
+# backend/app/import_regeocode.py
+# Background re-geocoding of every unresolved item in an import batch.
+#
+# POST /batches/{id}/regeocode starts a job for the batch's NEEDS_GEOCODE and
+# NEEDS_FIX items. The job groups them by address, so items sharing one are
+# looked up once, and hands the distinct addresses to geocode.iter_geocode
+# REGEOCODE_CHUNK_SIZE at a time, which runs them concurrently under the
+# provider rate limits and answers repeats from the geocode cache. Chunking
+# keeps a big batch from queueing all of its lookups ahead of running
+# imports in the shared geocode pool. Each chunk is written back through
+# import_edits: coordinates first, then one match_duplicates() pass and one
+# executemany UPDATE, committed with the batch counters. A job that stops
+# part-way keeps its committed chunks; starting it again picks up the items
+# still unresolved.
+# Progress lives in memory for GET /batches/{id}/regeocode and, like import
+# jobs, assumes a single API worker.
+
+import logging
+import os
+import threading
+import time
+from concurrent.futures import ThreadPoolExecutor
+from datetime import datetime
+from typing import Callable, Dict, List, Optional, Sequence, Tuple
+
+from sqlalchemy import select, update
+from sqlalchemy.orm import Session
+
+from . import models
+from .database import SessionLocal
+from .geocode import Address, Coords, GeocodeStats, coords_precision, iter_geocode
+from .import_edits import load_rows, resolve_rows, save_rows
+from .import_jobs import IMPORT_WORKERS, JobStopped
+
+logger = logging.getLogger(__name__)
+
+REGEOCODE_CHUNK_SIZE = int(os.getenv("REGEOCODE_CHUNK_SIZE", "200"))  # distinct addresses per commit
+
+UNRESOLVED_STATUSES = (
+    models.ImportItemStatus.NEEDS_GEOCODE.value,
+    models.ImportItemStatus.NEEDS_FIX.value,
+)
+
+_items = models.ImportItem.__table__
+_batches = models.ImportBatch.__table__
+
+
+class RegeocodeProgress:
+    """Live state of one batch's re-geocode job."""
+
+    __slots__ = (
+        "batch_id", "status", "items", "addresses", "addresses_done", "located", "failed",
+        "stats", "error_message", "started_at", "finished_at", "_started",
+    )
+
+    def __init__(self, batch_id: int):
+        self.batch_id = batch_id
+        self.status = "RUNNING"  # then COMPLETE, FAILED or STOPPED
+        self.items = 0  # unresolved items found when the job started
+        self.addresses = 0  # ... and their distinct addresses
+        self.addresses_done = 0
+        self.located = 0  # items given coordinates
+        self.failed = 0  # items the geocoder could not place
+        self.stats = GeocodeStats()
+        self.error_message: Optional[str] = None
+        self.started_at = datetime.utcnow()
+        self.finished_at: Optional[datetime] = None
+        self._started = time.monotonic()
+
+    @property
+    def addresses_per_second(self) -> Optional[float]:
+        elapsed = time.monotonic() - self._started
+        if not self.addresses_done or elapsed <= 0:
+            return None
+        return self.addresses_done / elapsed
+
+    def report(self) -> dict:
+        """Fields of schemas.ImportRegeocodeProgress."""
+        rate = self.addresses_per_second
+        eta = None
+        if self.status == "RUNNING" and rate:
+            eta = max(self.addresses - self.addresses_done, 0) / rate
+        return {
+            "batch_id": self.batch_id,
+            "status": self.status,
+            "items": self.items,
+            "addresses": self.addresses,
+            "addresses_done": self.addresses_done,
+            "located": self.located,
+            "failed": self.failed,
+            "addresses_per_second": rate,
+            "eta_seconds": eta,
+            "geocode_lookups": self.stats.lookups,
+            "geocode_hit_ratio": self.stats.hit_ratio,
+            "error_message": self.error_message,
+            "started_at": self.started_at,
+            "finished_at": self.finished_at,
+        }
+
+
+def unresolved_addresses(db: Session, batch_id: int) -> Dict[Address, List[int]]:
+    """Ids of the batch's NEEDS_GEOCODE and NEEDS_FIX items, grouped by address, in id order."""
+    found = db.execute(
+        select(_items.c.id, _items.c.address1, _items.c.city, _items.c.state, _items.c.zip)
+        .where(_items.c.batch_id == batch_id, _items.c.status.in_(UNRESOLVED_STATUSES))
+        .order_by(_items.c.id)
+    )
+    groups: Dict[Address, List[int]] = {}
+    for item_id, *address in found:
+        groups.setdefault(tuple(address), []).append(item_id)
+    return groups
+
+
+def _write_chunk(
+    db: Session,
+    batch_id: int,
+    results: Sequence[Tuple[List[int], Optional[Coords]]],
+    job: RegeocodeProgress,
+) -> None:
+    rows = load_rows(db, batch_id, [item_id for item_ids, _ in results for item_id in item_ids])
+    old_status: Dict[int, str] = {}
+    located: List[dict] = []
+    for item_ids, coords in results:
+        for item_id in item_ids:
+            row = rows.get(item_id)
+            if row is None or row["status"] not in UNRESOLVED_STATUSES:
+                continue  # edited, approved or rejected since the job started
+            old_status[item_id] = row["status"]
+            if coords:
+                row["lat"], row["lng"] = coords
+                row["geocode_precision"] = coords_precision(coords)
+                row["error_message"] = None
+                located.append(row)
+            else:
+                row["status"] = models.ImportItemStatus.NEEDS_FIX.value
+                row["error_message"] = "Geocoding failed."
+    resolve_rows(db, located)
+    save_rows(db, batch_id, [rows[item_id] for item_id in old_status], old_status)
+    job.located += len(located)
+    job.failed += len(old_status) - len(located)
+
+
+def regeocode_batch(
+    db: Session,
+    batch_id: int,
+    *,
+    chunk_size: int = REGEOCODE_CHUNK_SIZE,
+    job: Optional[RegeocodeProgress] = None,
+    on_address: Optional[Callable[[], None]] = None,
+) -> RegeocodeProgress:
+    """Geocode a batch's unresolved items again and store coordinates and statuses; commits per chunk.
+
+    Located items are matched against the catalog again and get a new status
+    as in the importer; items still without an answer stay NEEDS_FIX with
+    "Geocoding failed.". ``on_address`` is called as each distinct address is
+    answered and may raise to stop the job; the open chunk is then the
+    caller's to roll back. The batch's geocode counters are moved with each
+    chunk.
+    """
+    job = job or RegeocodeProgress(batch_id)
+    groups = unresolved_addresses(db, batch_id)
+    addresses = list(groups)
+    job.items = sum(len(item_ids) for item_ids in groups.values())
+    job.addresses = len(addresses)
+
+    chunk_size = max(1, chunk_size)
+    for start in range(0, len(addresses), chunk_size):
+        chunk = addresses[start:start + chunk_size]
+        lookups, hits = job.stats.lookups, job.stats.cache_hits
+        answered = []
+        results = iter_geocode(chunk, stats=job.stats)
+        try:
+            for address, coords in zip(chunk, results):
+                answered.append((groups[address], coords))
+                if on_address is not None:
+                    on_address()
+        finally:
+            results.close()
+        _write_chunk(db, batch_id, answered, job)
+        db.execute(
+            update(_batches)
+            .where(_batches.c.id == batch_id)
+            .values(
+                geocode_lookups=_batches.c.geocode_lookups + (job.stats.lookups - lookups),
+                geocode_cache_hits=_batches.c.geocode_cache_hits + (job.stats.cache_hits - hits),
+            )
+        )
+        db.commit()
+        job.addresses_done += len(answered)
+    return job
+
+
+class RegeocodeRunner:
+    """Thread pool running at most one re-geocode job per batch id."""
+
+    def __init__(self, workers: int = IMPORT_WORKERS, session_factory: Callable[[], Session] = SessionLocal):
+        self.workers = max(1, workers)
+        self._session_factory = session_factory
+        self._lock = threading.Lock()
+        self._executor: Optional[ThreadPoolExecutor] = None
+        self._jobs: Dict[int, RegeocodeProgress] = {}
+        self._stopping = threading.Event()
+
+    def start(self, batch_id: int) -> RegeocodeProgress:
+        """Start a job for the batch; one already running is returned instead of starting another."""
+        with self._lock:
+            job = self._jobs.get(batch_id)
+            if job is not None and job.status == "RUNNING":
+                return job
+            self._stopping.clear()
+            if self._executor is None:
+                self._executor = ThreadPoolExecutor(max_workers=self.workers, thread_name_prefix="regeocode-job")
+            job = self._jobs[batch_id] = RegeocodeProgress(batch_id)
+            self._executor.submit(self._run, job)
+            return job
+
+    def progress(self, batch_id: int) -> Optional[RegeocodeProgress]:
+        """The batch's running or most recent job in this process, if any."""
+        return self._jobs.get(batch_id)
+
+    def shutdown(self, wait: bool = True) -> None:
+        """Stop running jobs at their next address; their committed chunks are kept."""
+        self._stopping.set()
+        with self._lock:
+            executor, self._executor = self._executor, None
+        if executor is not None:
+            executor.shutdown(wait=wait, cancel_futures=True)
+
+    def _run(self, job: RegeocodeProgress) -> None:
+        def on_address() -> None:
+            if self._stopping.is_set():
+                raise JobStopped()
+
+        with self._session_factory() as db:
+            try:
+                regeocode_batch(db, job.batch_id, job=job, on_address=on_address)
+            except JobStopped:
+                db.rollback()
+                job.status = "STOPPED"
+            except Exception:
+                logger.exception("Re-geocode job for batch %s failed", job.batch_id)
+                db.rollback()
+                job.status = "FAILED"
+                job.error_message = "Re-geocoding failed unexpectedly."
+            else:
+                job.status = "COMPLETE"
+            job.finished_at = datetime.utcnow()
+
+
+regeocode_runner = RegeocodeRunner()
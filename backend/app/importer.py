@@ -0,0 +1,379 @@
+# backend/app/importer.py
+# CSV import pipeline run by the batch import jobs (see import_jobs.py).
+#
+# The stored upload is decoded incrementally (encoding picked from its BOM),
+# parsed row by row and written with executemany INSERTs in fixed-size chunks,
+# so memory stays flat whatever the file size. Each chunk is committed with the
+# batch's row counter, which is what lets a job resume after a restart. Repeats
+# inside a batch are found per chunk through the (batch_id, dedupe_key) index
+# on rows already written instead of a key set that grows with the file.
+# Matches against existing businesses are exact first (match_existing), then
+# fuzzy for the rest (dedupe.py) once the chunk has been geocoded.
+
+import codecs
+import csv
+import io
+import itertools
+import os
+import string
+from typing import BinaryIO, Callable, Dict, Iterator, List, Optional, Sequence
+
+from sqlalchemy import func, insert, select
+from sqlalchemy.orm import Session
+
+from . import models
+from .dedupe import DuplicateMatch, load_index, row_profile
+from .geocode import GeocodeStats, coords_precision, iter_geocode
+from .import_counts import record_transitions
+
+REQUIRED_COLUMNS = [
+    "name",
+    "description",
+    "phone_number",
+    "location",
+    "lat",
+    "lng",
+    "address1",
+    "city",
+    "state",
+    "zip",
+]
+
+IMPORT_CHUNK_SIZE = int(os.getenv("IMPORT_CHUNK_SIZE", "500"))
+
+# Longest BOM first: UTF-8's is three bytes, UTF-16's two.
+_BOMS = [
+    (codecs.BOM_UTF8, "utf-8-sig"),
+    (codecs.BOM_UTF16_LE, "utf-16"),
+    (codecs.BOM_UTF16_BE, "utf-16"),
+]
+
+
+class CsvImportError(ValueError):
+    """An upload that cannot be imported (bad header or text encoding)."""
+
+
+def safe_float(value: Optional[str]) -> Optional[float]:
+    if value is None:
+        return None
+    text = str(value).strip()
+    if not text:
+        return None
+    try:
+        return float(text)
+    except ValueError:
+        return None
+
+
+def normalize_text(value: Optional[str]) -> Optional[str]:
+    if value is None:
+        return None
+    text = str(value).strip()
+    return text or None
+
+
+def build_location(address1: Optional[str], city: Optional[str], state: Optional[str], zip_code: Optional[str]) -> str:
+    parts = [address1, city, state, zip_code]
+    return ", ".join([p for p in parts if p])
+
+
+def dedupe_key(
+    name: str,
+    address1: Optional[str],
+    city: Optional[str],
+    state: Optional[str],
+    zip_code: Optional[str],
+) -> str:
+    """Case-insensitive identity of an import row within its batch."""
+    return "|".join([name.lower(), (address1 or "").lower(), (city or "").lower(), (state or "").lower(), (zip_code or "").lower()])
+
+
+_MATCH_FIELDS = ("address1", "city", "state", "zip")
+
+
+def _lower(value: Optional[str]) -> Optional[str]:
+    return value.lower() if value else None
+
+
+# SQLite's lower() folds ASCII letters only ('CAFÉ' -> 'cafÉ'), so names sent to
+# ``lower(name) IN (...)`` there must be folded the same way or they miss.
+_ASCII_LOWER = str.maketrans(string.ascii_uppercase, string.ascii_lowercase)
+
+
+def _sql_lower(db: Session) -> Callable[[str], str]:
+    """Python equivalent of the database's lower() for business names."""
+    if db.get_bind().dialect.name == "sqlite":
+        return lambda name: name.translate(_ASCII_LOWER)
+    return str.lower
+
+
+def match_existing(db: Session, rows: Sequence[Dict[str, Optional[str]]]) -> List[Optional[int]]:
+    """Id of the existing business each row duplicates, or None, in row order.
+
+    A row duplicates a business with the same name, ignoring case as the
+    database's lower() does, whose address1, city, state and zip also match
+    wherever the row has a value (the lowest id wins). Candidates come from
+    one ``lower(name) IN (...)`` query per 500 names, served by the
+    ix_businesses_name_lower functional index; the other fields are compared
+    in memory.
+    """
+    fold = _sql_lower(db)
+    names = list({fold(row["name"]) for row in rows if row.get("name")})
+    candidates: Dict[str, List[tuple]] = {}
+    biz = models.Business
+    for start in range(0, len(names), 500):
+        found = db.execute(
+            select(biz.id, biz.name, biz.address1, biz.city, biz.state, biz.zip)
+            .where(func.lower(biz.name).in_(names[start:start + 500]))
+            .order_by(biz.id)
+        )
+        for biz_id, name, address1, city, state, zip_code in found:
+            fields = (_lower(address1), _lower(city), _lower(state), _lower(zip_code))
+            candidates.setdefault(fold(name), []).append((biz_id, fields))
+
+    matches: List[Optional[int]] = []
+    for row in rows:
+        wanted = [_lower(row.get(field)) for field in _MATCH_FIELDS]
+        match = None
+        for biz_id, fields in candidates.get(fold(row.get("name") or ""), ()):
+            if all(w is None or w == f for w, f in zip(wanted, fields)):
+                match = biz_id
+                break
+        matches.append(match)
+    return matches
+
+
+def match_duplicates(db: Session, rows: Sequence[dict]) -> List[Optional[DuplicateMatch]]:
+    """Likely duplicate business of each row, with its confidence, in row order.
+
+    Exact matches (match_existing) have confidence 1; the remaining rows are
+    scored against nearby businesses by dedupe.DuplicateIndex. Rows carry
+    ImportItem column names, lat and lng included.
+    """
+    matches: List[Optional[DuplicateMatch]] = [
+        DuplicateMatch(business_id, 1.0) if business_id is not None else None
+        for business_id in match_existing(db, rows)
+    ]
+    unmatched = [i for i, match in enumerate(matches) if match is None]
+    if unmatched:
+        profiles = [row_profile(rows[i]) for i in unmatched]
+        index = load_index(db, profiles)
+        for i, row in zip(unmatched, profiles):
+            matches[i] = index.best_match(row)
+    return matches
+
+
+def find_duplicate_business(
+    db: Session,
+    *,
+    name: str,
+    address1: Optional[str],
+    city: Optional[str],
+    state: Optional[str],
+    zip_code: Optional[str],
+    lat: Optional[float],
+    lng: Optional[float],
+) -> Optional[DuplicateMatch]:
+    """match_duplicates() for a single item."""
+    row = {"name": name, "address1": address1, "city": city, "state": state, "zip": zip_code, "lat": lat, "lng": lng}
+    return match_duplicates(db, [row])[0]
+
+
+def compute_status(
+    *,
+    duplicate_of_business_id: Optional[int],
+    lat: Optional[float],
+    lng: Optional[float],
+    error_message: Optional[str],
+) -> str:
+    if duplicate_of_business_id is not None:
+        return models.ImportItemStatus.DUPLICATE_PENDING.value
+    if lat is None or lng is None:
+        return models.ImportItemStatus.NEEDS_FIX.value if error_message else models.ImportItemStatus.NEEDS_GEOCODE.value
+    return models.ImportItemStatus.READY.value
+
+
+def detect_encoding(stream: BinaryIO) -> str:
+    """Text encoding from the byte-order mark, UTF-8 without one. Leaves the stream at 0."""
+    head = stream.read(4)
+    stream.seek(0)
+    for bom, encoding in _BOMS:
+        if head.startswith(bom):
+            return encoding
+    return "utf-8"
+
+
+def open_csv(stream: BinaryIO) -> csv.DictReader:
+    """A row reader decoding ``stream`` lazily; the header is read and checked up front."""
+    text = io.TextIOWrapper(stream, encoding=detect_encoding(stream), newline="")
+    reader = csv.DictReader(text)
+    try:
+        fieldnames = reader.fieldnames
+    except UnicodeDecodeError:
+        raise CsvImportError("File is not valid UTF-8 or UTF-16 text.")
+    columns = [c.strip() for c in fieldnames or []]
+    missing = [c for c in REQUIRED_COLUMNS if c not in columns]
+    if missing:
+        raise CsvImportError(f"Missing required columns: {', '.join(missing)}")
+    reader.fieldnames = columns
+    return reader
+
+
+def _rows(reader: csv.DictReader) -> Iterator[Dict[str, Optional[str]]]:
+    try:
+        yield from reader
+    except UnicodeDecodeError:
+        raise CsvImportError(f"File is not valid text near line {reader.line_num + 1}.")
+    except csv.Error as exc:
+        raise CsvImportError(f"Malformed CSV near line {reader.line_num}: {exc}")
+
+
+def _parse_row(row: Dict[str, Optional[str]]) -> Optional[dict]:
+    """Column values for one ImportItem (before matching and geocoding), or None to skip."""
+    name = normalize_text(row.get("name"))
+    if not name:
+        return None
+
+    description = normalize_text(row.get("description"))
+    phone_number = normalize_text(row.get("phone_number"))
+    address1 = normalize_text(row.get("address1"))
+    city = normalize_text(row.get("city"))
+    state = normalize_text(row.get("state"))
+    zip_code = normalize_text(row.get("zip"))
+
+    location = normalize_text(row.get("location"))
+    if not location:
+        location = build_location(address1, city, state, zip_code)
+
+    return {
+        "status": None,
+        "error_message": None,
+        "name": name,
+        "description": description,
+        "phone_number": phone_number,
+        "location": location,
+        "lat": safe_float(row.get("lat")),
+        "lng": safe_float(row.get("lng")),
+        "address1": address1,
+        "city": city,
+        "state": state,
+        "zip": zip_code,
+        "geocode_precision": None,
+        "duplicate_of_business_id": None,
+        "duplicate_confidence": None,
+        "dedupe_key": dedupe_key(name, address1, city, state, zip_code),
+    }
+
+
+def _resolve_chunk(
+    db: Session,
+    chunk: List[dict],
+    positions: List[int],
+    progress: Optional[Callable[[int], None]],
+    stats: GeocodeStats,
+) -> None:
+    """Geocode rows missing coordinates, match the chunk against existing businesses, and set statuses.
+
+    Geocoding runs concurrently; ``progress`` is called with each row's CSV
+    position as the row is geocoded, in order.
+    """
+    missing = [v for v in chunk if v["lat"] is None or v["lng"] is None]
+    results = iter_geocode([(v["address1"], v["city"], v["state"], v["zip"]) for v in missing], stats=stats)
+    try:
+        for values, position in zip(chunk, positions):
+            if values["lat"] is None or values["lng"] is None:
+                coords = next(results)
+                if coords:
+                    values["lat"], values["lng"] = coords
+                    values["geocode_precision"] = coords_precision(coords)
+                else:
+                    values["error_message"] = "Missing or invalid coordinates."
+            if progress is not None:
+                progress(position)
+    finally:
+        results.close()
+
+    for values, match in zip(chunk, match_duplicates(db, chunk)):
+        if match is not None:
+            values["duplicate_of_business_id"], values["duplicate_confidence"] = match
+        values["status"] = compute_status(
+            duplicate_of_business_id=values["duplicate_of_business_id"],
+            lat=values["lat"],
+            lng=values["lng"],
+            error_message=values["error_message"],
+        )
+
+
+def _write_chunk(db: Session, batch_id: int, chunk: List[dict]) -> None:
+    """Mark repeats of rows already in the batch (or earlier in the chunk), then insert the chunk."""
+    keys = {values["dedupe_key"] for values in chunk}
+    seen = {
+        key
+        for (key,) in db.query(models.ImportItem.dedupe_key).filter(
+            models.ImportItem.batch_id == batch_id,
+            models.ImportItem.dedupe_key.in_(keys),
+        )
+    }
+    for values in chunk:
+        values["batch_id"] = batch_id
+        if values["dedupe_key"] in seen:
+            values["error_message"] = "Duplicate in batch."
+            values["status"] = models.ImportItemStatus.DUPLICATE_PENDING.value
+        else:
+            seen.add(values["dedupe_key"])
+    db.execute(insert(models.ImportItem), chunk)
+
+
+def ingest_rows(
+    db: Session,
+    batch: models.ImportBatch,
+    reader: csv.DictReader,
+    *,
+    chunk_size: int = IMPORT_CHUNK_SIZE,
+    progress: Optional[Callable[[int], None]] = None,
+) -> int:
+    """Stream ``reader`` into ``batch`` as ImportItems; returns the batch's item count.
+
+    Each chunk is committed together with ``batch.processed_rows`` (CSV rows
+    consumed, skipped ones included), and rows up to that count are skipped on
+    entry, so an interrupted import picks up where its last commit left off.
+    Rows missing coordinates are geocoded a chunk at a time through
+    geocode.iter_geocode. ``progress`` is called with the running row count as
+    rows are finished and may raise to stop the import; the uncommitted chunk is
+    then the caller's to roll back. Raises CsvImportError if the file turns out to be undecodable or
+    malformed part-way through.
+    """
+    rows = _rows(reader)
+    consumed = batch.processed_rows or 0
+    for _ in itertools.islice(rows, consumed):
+        pass
+
+    chunk: List[dict] = []
+    positions: List[int] = []  # CSV row count at each chunk entry, for progress
+
+    def commit_chunk() -> None:
+        stats = GeocodeStats()
+        if chunk:
+            _resolve_chunk(db, chunk, positions, progress, stats)
+            _write_chunk(db, batch.id, chunk)
+            record_transitions(db, batch.id, [(None, values["status"]) for values in chunk])
+        if progress is not None:
+            progress(consumed)
+        batch.geocode_lookups = (batch.geocode_lookups or 0) + stats.lookups
+        batch.geocode_cache_hits = (batch.geocode_cache_hits or 0) + stats.cache_hits
+        batch.total_rows = (batch.total_rows or 0) + len(chunk)
+        batch.processed_rows = consumed
+        db.commit()
+        chunk.clear()
+        positions.clear()
+
+    for row in rows:
+        consumed += 1
+        values = _parse_row(row)
+        if values is not None:
+            chunk.append(values)
+            positions.append(consumed)
+        if len(chunk) >= chunk_size:
+            commit_chunk()
+    commit_chunk()
+    return batch.total_rows
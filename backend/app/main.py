@@ -1,9 +1,15 @@
 # backend/app/main.py
 
 import os
+from contextlib import asynccontextmanager
 from fastapi import FastAPI
 from fastapi.middleware.cors import CORSMiddleware
 from .database import engine, Base
+from .catalog import ensure_catalog_state
+from .geo_backend import geo_backend
+from .import_jobs import import_runner
+from .import_regeocode import regeocode_runner
+from .text_search import text_search
 
 # Ensure models are imported before create_all
 from . import models                 # SmallBusiness
@@ -18,8 +24,20 @@ from .routers.auth import router as auth_router
 
 # Create tables (idempotent)
 Base.metadata.create_all(bind=engine)
+geo_backend.install(engine)  # spatial index/extension for this dialect (idempotent)
+ensure_catalog_state(engine)  # version row behind business ETags
+text_search.install(engine)  # FTS5 table / tsvector column for business search (idempotent)
 
-app = FastAPI(title="Bizcribe Backend")
+
+@asynccontextmanager
+async def lifespan(app: FastAPI):
+    import_runner.resume_pending()  # batches left PROCESSING by a restart
+    yield
+    import_runner.shutdown()  # running imports stop at the next row and resume next start
+    regeocode_runner.shutdown()  # re-geocode jobs keep their committed chunks; rerun to finish
+
+
+app = FastAPI(title="Bizcribe Backend", lifespan=lifespan)
 
 # CORS for Vite / production frontend
 default_origins = [
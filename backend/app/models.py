@@ -1,7 +1,7 @@
 # backend/app/models.py
 from datetime import datetime
 from enum import Enum
-from sqlalchemy import Column, Integer, String, Float, ForeignKey, Boolean, DateTime, JSON
+from sqlalchemy import Column, Integer, String, Float, ForeignKey, Boolean, DateTime, JSON, Index, func
 from sqlalchemy.orm import relationship
 from .database import Base
 
@@ -30,6 +30,40 @@ class Business(Base):
     approved_by = relationship("User", back_populates="businesses_approved", foreign_keys=[approved_by_id])
     memberships = relationship("BusinessMembership", back_populates="business", cascade="all,delete-orphan")
 
+    __table_args__ = (
+        # Radius/bbox searches prefilter on a lat/lng rectangle
+        Index("ix_businesses_lat_lng", "lat", "lng"),
+    )
+
+
+# Import duplicate matching looks businesses up by case-insensitive name
+Index("ix_businesses_name_lower", func.lower(Business.name))
+
+
+class CatalogState(Base):
+    """Single-row counter bumped by every change to approved businesses (ETags)."""
+    __tablename__ = "catalog_state"
+
+    id = Column(Integer, primary_key=True)
+    version = Column(Integer, default=0, nullable=False)
+
+
+class GeocodeCacheEntry(Base):
+    """One provider's answer for a normalized address query; lat/lng are NULL for a miss."""
+    __tablename__ = "geocode_cache"
+
+    id = Column(Integer, primary_key=True)
+    query = Column(String, nullable=False)
+    provider = Column(String, nullable=False)
+    lat = Column(Float, nullable=True)
+    lng = Column(Float, nullable=True)
+    miss = Column(Boolean, default=False, nullable=False)
+    fetched_at = Column(DateTime, default=datetime.utcnow, nullable=False)
+
+    __table_args__ = (
+        Index("ux_geocode_cache_query_provider", "query", "provider", unique=True),
+    )
+
 
 class BusinessSubmission(Base):
     __tablename__ = "business_submissions"
@@ -94,6 +128,17 @@ class ImportItemStatus(str, Enum):
     MERGED = "MERGED"
 
 
+class ImportBatchStatus(str, Enum):
+    PROCESSING = "PROCESSING"
+    COMPLETE = "COMPLETE"
+    FAILED = "FAILED"
+
+
+class GeocodePrecision(str, Enum):
+    ADDRESS = "ADDRESS"  # placed at the street address by an online geocoder
+    ZIP = "ZIP"  # ZIP code centroid from the offline gazetteer; approximate
+
+
 class ImportBatch(Base):
     __tablename__ = "import_batches"
 
@@ -104,6 +149,26 @@ class ImportBatch(Base):
     source_url = Column(String, nullable=True)
     total_rows = Column(Integer, default=0, nullable=False)
 
+    # Background import job (see import_jobs.py)
+    status = Column(String, default=ImportBatchStatus.COMPLETE.value, nullable=False, index=True)
+    processed_rows = Column(Integer, default=0, nullable=False)  # CSV rows consumed, committed per chunk
+    expected_rows = Column(Integer, nullable=True)  # estimate from the upload's line count
+    error_message = Column(String, nullable=True)
+    upload_path = Column(String, nullable=True)
+    started_at = Column(DateTime, nullable=True)
+    finished_at = Column(DateTime, nullable=True)
+    geocode_lookups = Column(Integer, default=0, nullable=False)  # rows that needed coordinates
+    geocode_cache_hits = Column(Integer, default=0, nullable=False)  # ... answered without a network call
+
+    # Item counts per status, moved by every status change (see import_counts.py)
+    ready_count = Column(Integer, default=0, nullable=False)
+    needs_geocode_count = Column(Integer, default=0, nullable=False)
+    needs_fix_count = Column(Integer, default=0, nullable=False)
+    duplicate_pending_count = Column(Integer, default=0, nullable=False)
+    approved_count = Column(Integer, default=0, nullable=False)
+    rejected_count = Column(Integer, default=0, nullable=False)
+    merged_count = Column(Integer, default=0, nullable=False)
+
     created_by = relationship("User", foreign_keys=[created_by_id])
     items = relationship("ImportItem", back_populates="batch", cascade="all,delete-orphan")
 
@@ -126,10 +191,23 @@ class ImportItem(Base):
     city = Column(String, nullable=True)
     state = Column(String, nullable=True)
     zip = Column(String, nullable=True)
+    # GeocodePrecision of geocoded lat/lng; None when they came with the row or were entered by hand
+    geocode_precision = Column(String, nullable=True)
 
     duplicate_of_business_id = Column(Integer, ForeignKey("businesses.id"), nullable=True)
+    # 1.0 for an exact match, the fuzzy score (see dedupe.py) otherwise
+    duplicate_confidence = Column(Float, nullable=True)
     approved_business_id = Column(Integer, ForeignKey("businesses.id"), nullable=True)
+    # Lowercased name|address1|city|state|zip, for finding repeats within a batch
+    dedupe_key = Column(String, nullable=True)
 
     batch = relationship("ImportBatch", back_populates="items", foreign_keys=[batch_id])
     duplicate_of = relationship("Business", foreign_keys=[duplicate_of_business_id])
     approved_business = relationship("Business", foreign_keys=[approved_business_id])
+
+    __table_args__ = (
+        # In-batch duplicate lookups during streaming import
+        Index("ix_import_items_batch_dedupe", "batch_id", "dedupe_key"),
+        # Status-filtered, id-ordered pages of a batch (GET /batches/{id}/items)
+        Index("ix_import_items_batch_status_id", "batch_id", "status", "id"),
+    )
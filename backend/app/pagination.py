@@ -0,0 +1,37 @@
+# backend/app/pagination.py
+# Opaque keyset cursors shared by the paginated listing endpoints.
+#
+# A cursor is the sort key of the last row a client has seen, JSON-encoded
+# and base64url-wrapped so clients treat it as a token. The next page then
+# filters on "key > cursor" instead of OFFSET, which costs the same at any
+# depth and does not shift when rows are inserted ahead of the reader.
+
+import base64
+import json
+from datetime import datetime
+from typing import Any, Dict
+
+
+def encode_cursor(**key: Any) -> str:
+    """Encode a sort key (e.g. id=42, or d=1.5, id=42) as an opaque cursor."""
+    payload = {k: v.isoformat() if isinstance(v, datetime) else v for k, v in key.items()}
+    raw = json.dumps(payload, separators=(",", ":"), sort_keys=True).encode("utf-8")
+    return base64.urlsafe_b64encode(raw).decode("ascii").rstrip("=")
+
+
+def decode_cursor(cursor: str, *required: str) -> Dict[str, Any]:
+    """Decode a cursor produced by ``encode_cursor``; ValueError when malformed."""
+    try:
+        padded = cursor + "=" * (-len(cursor) % 4)
+        payload = json.loads(base64.urlsafe_b64decode(padded.encode("ascii")))
+    except ValueError as exc:  # bad base64, UTF-8 or JSON
+        raise ValueError("Malformed cursor") from exc
+    if not isinstance(payload, dict) or any(k not in payload for k in required):
+        raise ValueError("Cursor does not match this listing")
+    return payload
+
+
+def cursor_datetime(value: Any) -> datetime:
+    if not isinstance(value, str):
+        raise ValueError("Malformed cursor")
+    return datetime.fromisoformat(value)
@@ -0,0 +1,61 @@
+# backend/app/projections.py
+# Sparse fieldsets for the public business listing (?fields=).
+#
+# A projected listing selects only the requested columns with a Core select and
+# writes the row tuples straight to JSON, skipping ORM hydration, the identity
+# map and per-row Pydantic validation. "pin" is shorthand for the BusinessPin
+# shape the map needs: id, name, lat, lng.
+
+import json
+from datetime import datetime
+from typing import Any, Dict, List, Optional, Sequence
+
+from . import models, schemas
+
+# Every SmallBusiness field is a plain Business column, so any of them can be projected.
+BUSINESS_FIELDS: Dict[str, Any] = {name: getattr(models.Business, name) for name in schemas.SmallBusiness.model_fields}
+PIN_FIELDS: List[str] = list(schemas.BusinessPin.model_fields)
+
+
+def parse_fields(raw: str) -> List[str]:
+    """Requested field names in a stable order with ``id`` first; ValueError on unknown names."""
+    names: List[str] = []
+    for part in raw.split(","):
+        name = part.strip()
+        if not name:
+            continue
+        for field in PIN_FIELDS if name == "pin" else [name]:
+            if field not in BUSINESS_FIELDS:
+                raise ValueError(f"Unknown field '{field}'")
+            if field not in names:
+                names.append(field)
+    if "id" in names:
+        names.remove("id")
+    return ["id"] + names
+
+
+def columns_for(fields: Sequence[str]) -> List[Any]:
+    return [BUSINESS_FIELDS[name] for name in fields]
+
+
+def _json_default(value: Any) -> Any:
+    if isinstance(value, datetime):
+        return value.isoformat()
+    raise TypeError(f"Cannot serialize {type(value).__name__}")
+
+
+def render_rows(
+    fields: Sequence[str],
+    rows: Sequence[tuple],
+    *,
+    next_cursor: Optional[str] = None,
+    page: bool = False,
+) -> bytes:
+    """JSON body for projected rows: a list of objects, or a BusinessPage-shaped envelope.
+
+    Values past ``len(fields)`` (e.g. a trailing distance) are left out.
+    """
+    width = len(fields)
+    items = [dict(zip(fields, row[:width])) for row in rows]
+    payload: Any = {"items": items, "next_cursor": next_cursor} if page else items
+    return json.dumps(payload, separators=(",", ":"), default=_json_default).encode("utf-8")
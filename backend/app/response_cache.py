@@ -0,0 +1,315 @@
+# backend/app/response_cache.py
+# Read-through cache of serialized JSON bodies for the public business reads.
+#
+# Keys are built from the parsed (normalized) query parameters, values are the
+# response bytes exactly as sent. Each cached body remembers its scope: the
+# business it describes (detail) or the filter, sort range and member ids of a
+# listing page. On a catalog change only the entries whose scope the business
+# falls into, before or after the change, are dropped.
+#
+# Storage is pluggable. The default is an in-process LRU with a TTL. Setting
+# RESPONSE_CACHE_URL=redis://... shares bodies between workers. A shared store
+# cannot see another process's scopes, so its keys also carry the catalog
+# version (see catalog.py): any write anywhere moves every worker to fresh keys,
+# and the old ones age out by TTL. Like the spatial index, the in-process default
+# assumes a single API worker. RESPONSE_CACHE=0 turns the cache off.
+
+import os
+import threading
+import time
+from collections import OrderedDict
+from typing import Dict, FrozenSet, Iterable, List, Optional, Protocol, Tuple, Union
+
+from .geo import BBox, bbox_contains, haversine_km
+from .spatial_index import IndexedBusiness, business_index
+
+RESPONSE_CACHE_SIZE = int(os.getenv("RESPONSE_CACHE_SIZE", "1024"))
+RESPONSE_CACHE_TTL = float(os.getenv("RESPONSE_CACHE_TTL", "300"))  # seconds
+
+
+class CacheBackend(Protocol):
+    """Byte store behind ResponseCache; anything with these methods can stand in."""
+
+    shared: bool  # True when other processes read and write the same entries
+
+    def get(self, key: str) -> Optional[bytes]: ...
+
+    def set(self, key: str, value: bytes, ttl: float) -> None: ...
+
+    def delete(self, keys: Iterable[str]) -> None: ...
+
+    def clear(self) -> None: ...
+
+
+class MemoryBackend:
+    """In-process LRU with per-entry expiry."""
+
+    shared = False
+
+    def __init__(self, max_entries: int = RESPONSE_CACHE_SIZE):
+        self.max_entries = max_entries
+        self._lock = threading.Lock()
+        self._entries: "OrderedDict[str, Tuple[float, bytes]]" = OrderedDict()
+
+    def get(self, key: str) -> Optional[bytes]:
+        with self._lock:
+            hit = self._entries.get(key)
+            if hit is None:
+                return None
+            expires_at, value = hit
+            if expires_at <= time.monotonic():
+                del self._entries[key]
+                return None
+            self._entries.move_to_end(key)
+            return value
+
+    def set(self, key: str, value: bytes, ttl: float) -> None:
+        with self._lock:
+            self._entries[key] = (time.monotonic() + ttl, value)
+            self._entries.move_to_end(key)
+            while len(self._entries) > self.max_entries:
+                self._entries.popitem(last=False)
+
+    def delete(self, keys: Iterable[str]) -> None:
+        with self._lock:
+            for key in keys:
+                self._entries.pop(key, None)
+
+    def clear(self) -> None:
+        with self._lock:
+            self._entries.clear()
+
+    def __len__(self) -> int:
+        return len(self._entries)
+
+
+class RedisBackend:
+    """Shared store on Redis (needs the optional ``redis`` package).
+
+    ``client`` replaces the connection built from ``url``: anything with
+    redis.Redis's get, set(px=), delete and scan_iter, such as the in-memory
+    stand-in in tests/test_response_cache.py.
+    """
+
+    shared = True
+    PREFIX = "bizcribe:resp:"
+
+    def __init__(self, url: Optional[str] = None, *, client: Optional[object] = None):
+        if client is None:
+            try:
+                import redis
+            except ImportError as exc:
+                raise RuntimeError("RESPONSE_CACHE_URL needs the 'redis' package (pip install redis).") from exc
+            client = redis.Redis.from_url(url)
+        self._client = client
+
+    def get(self, key: str) -> Optional[bytes]:
+        return self._client.get(self.PREFIX + key)
+
+    def set(self, key: str, value: bytes, ttl: float) -> None:
+        self._client.set(self.PREFIX + key, value, px=max(1, int(ttl * 1000)))
+
+    def delete(self, keys: Iterable[str]) -> None:
+        names = [self.PREFIX + key for key in keys]
+        if names:
+            self._client.delete(*names)
+
+    def clear(self) -> None:
+        names = list(self._client.scan_iter(match=self.PREFIX + "*"))
+        if names:
+            self._client.delete(*names)
+
+
+class DetailScope:
+    """A single-business body: stale only when that business changes."""
+
+    __slots__ = ("business_id",)
+
+    def __init__(self, business_id: int):
+        self.business_id = business_id
+
+    def affected_by(self, business_id: int, entry: Optional[IndexedBusiness]) -> bool:
+        return business_id == self.business_id
+
+
+class ListingScope:
+    """What a cached listing page depends on.
+
+    A change to business X makes the page stale when X is on it, or when X now
+    matches the page's filter and sorts inside the page's key range: after the
+    cursor (``after``) and before the last row (``last``, None when the page was
+    not full). Offset pages also depend on every earlier row, so any change drops
+    them. Sort keys are (id,) for plain/bbox listings and (distance_km, id) for
+    radius searches.
+    """
+
+    __slots__ = ("bbox", "near", "offset", "member_ids", "after", "last")
+
+    def __init__(
+        self,
+        *,
+        bbox: Optional[BBox],
+        near: Optional[Tuple[float, float, float]],  # lat, lng, radius_km
+        offset: bool,
+        member_ids: FrozenSet[int],
+        after: Optional[tuple],
+        last: Optional[tuple],
+    ):
+        self.bbox = bbox
+        self.near = near
+        self.offset = offset
+        self.member_ids = member_ids
+        self.after = after
+        self.last = last
+
+    def _sort_key(self, business_id: int, entry: Optional[IndexedBusiness]) -> Optional[tuple]:
+        """X's sort key if it would be listed by this page's filter, else None."""
+        if self.bbox is None and self.near is None:
+            # Plain listings include approved businesses without coordinates, which
+            # have no index entry, so only the id can be trusted here.
+            return (business_id,)
+        if entry is None:
+            return None
+        if self.bbox is not None and not bbox_contains(self.bbox, entry.lat, entry.lng):
+            return None
+        if self.near is None:
+            return (business_id,)
+        lat, lng, radius_km = self.near
+        d = haversine_km(lat, lng, entry.lat, entry.lng)
+        return (d, business_id) if d <= radius_km else None
+
+    def affected_by(self, business_id: int, entry: Optional[IndexedBusiness]) -> bool:
+        if self.offset or business_id in self.member_ids:
+            return True
+        key = self._sort_key(business_id, entry)
+        if key is None:
+            return False
+        if self.after is not None and key <= self.after:
+            return False
+        return self.last is None or key < self.last
+
+
+Scope = Union[DetailScope, ListingScope]
+
+
+class ResponseCache:
+    """Read-through cache of response bodies with scope-based invalidation."""
+
+    def __init__(self, backend: CacheBackend, *, ttl: float = RESPONSE_CACHE_TTL, enabled: bool = True):
+        self.backend = backend
+        self.ttl = ttl
+        self.enabled = enabled
+        self._lock = threading.Lock()
+        # key -> scope for entries this process stored; bounded like the default backend.
+        self._scopes: "OrderedDict[str, Scope]" = OrderedDict()
+        self.max_scopes = RESPONSE_CACHE_SIZE
+        self.hits = 0
+        self.misses = 0
+        self.invalidations = 0
+        # Bumped by every invalidation; a body rendered across one is not stored.
+        self.generation = 0
+
+    def key(self, name: str, params: Dict[str, object], catalog_version: Optional[int] = None) -> str:
+        """Stable key from parsed parameters; shared backends namespace it by catalog version."""
+        parts = "&".join(f"{k}={_normalize(v)}" for k, v in sorted(params.items()) if v is not None)
+        key = f"{name}?{parts}"
+        if self.backend.shared:
+            key = f"v{catalog_version}:{key}"
+        return key
+
+    def get(self, key: str) -> Optional[bytes]:
+        if not self.enabled:
+            return None
+        body = self.backend.get(key)
+        with self._lock:
+            if body is None:
+                self.misses += 1
+            else:
+                self.hits += 1
+        return body
+
+    def put(self, key: str, body: bytes, scope: Scope, generation: int) -> None:
+        if not self.enabled:
+            return
+        with self._lock:
+            if generation != self.generation:
+                return
+            self._scopes[key] = scope
+            self._scopes.move_to_end(key)
+            while len(self._scopes) > self.max_scopes:
+                # A body whose scope is forgotten could never be invalidated.
+                evicted, _ = self._scopes.popitem(last=False)
+                self.backend.delete([evicted])
+            # Stored under the lock so an invalidation cannot slip in between.
+            self.backend.set(key, body, self.ttl)
+
+    def invalidate(self, business_id: int, entry: Optional[IndexedBusiness]) -> None:
+        """Drop every body whose scope the changed business touches."""
+        with self._lock:
+            self.generation += 1
+            stale = [key for key, scope in self._scopes.items() if scope.affected_by(business_id, entry)]
+            for key in stale:
+                del self._scopes[key]
+            self.invalidations += len(stale)
+            self.backend.delete(stale)
+
+    def clear(self) -> None:
+        with self._lock:
+            self.generation += 1
+            self._scopes.clear()
+            self.backend.clear()
+
+    def stats(self) -> Dict[str, object]:
+        with self._lock:
+            lookups = self.hits + self.misses
+            return {
+                "enabled": self.enabled,
+                "backend": type(self.backend).__name__,
+                "entries": len(self._scopes),
+                "hits": self.hits,
+                "misses": self.misses,
+                "hit_ratio": self.hits / lookups if lookups else 0.0,
+                "invalidations": self.invalidations,
+            }
+
+
+def _normalize(value: object) -> str:
+    if isinstance(value, (list, tuple)):
+        return ",".join(_normalize(v) for v in value)
+    return str(value)
+
+
+def listing_scope(
+    *,
+    bbox: Optional[BBox],
+    near: Optional[Tuple[float, float, float]],
+    skip: int,
+    after: Optional[tuple],
+    keys: List[tuple],
+    full: bool,
+) -> ListingScope:
+    """Scope for a listing page given the sort keys of the rows it returned.
+
+    ``full`` means rows past the last one exist (or the page is capped at its limit),
+    so later rows cannot move into it.
+    """
+    return ListingScope(
+        bbox=bbox,
+        near=near,
+        offset=skip > 0,
+        member_ids=frozenset(k[-1] for k in keys),
+        after=after,
+        last=keys[-1] if keys and full else None,
+    )
+
+
+def _backend_from_env() -> CacheBackend:
+    url = os.getenv("RESPONSE_CACHE_URL")
+    return RedisBackend(url) if url else MemoryBackend()
+
+
+response_cache = ResponseCache(
+    _backend_from_env(),
+    enabled=os.getenv("RESPONSE_CACHE", "1").lower() not in {"0", "false", "no", "off"},
+)
+business_index.add_listener(response_cache.invalidate)
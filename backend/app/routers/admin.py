@@ -1,13 +1,15 @@
 # backend/app/routers/admin.py
 from typing import Optional
 
-from fastapi import APIRouter, Depends, Query
+from fastapi import APIRouter, Depends, HTTPException, Query
 from sqlalchemy.orm import Session
 
 from ..auth import require_role
 from ..crud_user import search_pure_consumers
 from ..database import get_db
 from ..models_user import User, UserRole
+from ..pagination import cursor_datetime, decode_cursor, encode_cursor
+from ..response_cache import response_cache
 from ..schemas_auth import AdminUserListResponse
 
 router = APIRouter(prefix="/api/admin", tags=["admin"])
@@ -18,8 +20,27 @@ def search_customers(
     query: Optional[str] = None,
     skip: int = Query(0, ge=0),
     limit: int = Query(20, ge=1, le=100),
+    cursor: Optional[str] = None,
     db: Session = Depends(get_db),
     _: User = Depends(require_role(UserRole.ADMIN)),
 ):
-    items, total = search_pure_consumers(db, query=query, skip=skip, limit=limit)
-    return AdminUserListResponse(items=items, total=total, skip=skip, limit=limit)
+    after = None
+    if cursor:
+        try:
+            key = decode_cursor(cursor, "created_at", "id")
+            after = (cursor_datetime(key["created_at"]), int(key["id"]))
+        except (TypeError, ValueError):
+            raise HTTPException(status_code=400, detail="Invalid cursor.")
+
+    items, total = search_pure_consumers(db, query=query, skip=skip, limit=limit + 1, after=after)
+    next_cursor = None
+    if len(items) > limit:
+        items = items[:limit]
+        next_cursor = encode_cursor(created_at=items[-1].created_at, id=items[-1].id)
+    return AdminUserListResponse(items=items, total=total, skip=skip, limit=limit, next_cursor=next_cursor)
+
+
+@router.get("/cache/stats")
+def response_cache_stats(_: User = Depends(require_role(UserRole.ADMIN))):
+    """Hit/miss/invalidation counters of the public business response cache."""
+    return response_cache.stats()
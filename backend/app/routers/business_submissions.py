@@ -6,6 +6,7 @@ from .. import crud, schemas
 from ..auth import get_current_user, require_role
 from ..database import get_db
 from ..models_user import User, UserRole
+from ..pagination import cursor_datetime, decode_cursor, encode_cursor
 
 router = APIRouter(
     prefix="/api/businesses/submissions",
@@ -80,18 +81,32 @@ def search_submissions(
     owner_id: Optional[int] = None,
     skip: int = 0,
     limit: int = 50,
+    cursor: Optional[str] = None,
     _: User = Depends(require_role(UserRole.ADMIN)),
     db: Session = Depends(get_db),
 ):
+    after = None
+    if cursor:
+        try:
+            key = decode_cursor(cursor, "created_at", "id")
+            after = (cursor_datetime(key["created_at"]), int(key["id"]))
+        except (TypeError, ValueError):
+            raise HTTPException(status_code=400, detail="Invalid cursor.")
+
     items, total = crud.search_submissions(
         db,
         status=status,
         query=query,
         owner_id=owner_id,
         skip=skip,
-        limit=limit,
+        limit=limit + 1,
+        after=after,
     )
-    return schemas.SubmissionPage(items=items, total=total)
+    next_cursor = None
+    if len(items) > limit:
+        items = items[:limit]
+        next_cursor = encode_cursor(created_at=items[-1].created_at, id=items[-1].id)
+    return schemas.SubmissionPage(items=items, total=total, next_cursor=next_cursor)
 
 
 @router.get("/{submission_id}", response_model=schemas.BusinessSubmissionDetail)
@@ -1,58 +1,234 @@
-from typing import List, Optional, Tuple
-from fastapi import APIRouter, Depends, HTTPException, status
+from typing import List, Optional, Tuple, Union
+from fastapi import APIRouter, Depends, HTTPException, Path, Query, Request, Response, status
+from pydantic import TypeAdapter
 from sqlalchemy.orm import Session
 
 from .. import crud, schemas
 from ..auth import get_current_user, require_role
+from ..catalog import catalog_etag, catalog_version, etag_headers, not_modified
+from ..clustering import MAX_CLUSTER_ZOOM, cluster_cache
 from ..database import get_db
 from ..models_user import User, UserRole
+from ..pagination import decode_cursor, encode_cursor
+from ..projections import columns_for, parse_fields, render_rows
+from ..response_cache import DetailScope, ListingScope, listing_scope, response_cache
+from ..spatial_index import business_index
+from ..suggest import MAX_SUGGESTIONS, suggest_index
+from ..tiles import MAX_TILE_ZOOM, TILE_MAX_AGE, render_tile
 
 router = APIRouter(
     prefix="/api/businesses",
     tags=["businesses"],
 )
 
+_business_list = TypeAdapter(List[schemas.SmallBusiness])
 
-@router.get("/", response_model=List[schemas.SmallBusiness])
+
+def _parse_bbox(bbox: str) -> Tuple[float, float, float, float]:
+    try:
+        parts = [float(x.strip()) for x in bbox.split(",")]
+        if len(parts) != 4:
+            raise ValueError
+        return parts[0], parts[1], parts[2], parts[3]
+    except Exception:
+        raise HTTPException(status_code=400, detail="Invalid bbox format. Use 'west,south,east,north'.")
+
+
+def _parse_near(near: str) -> Tuple[float, float]:
+    try:
+        n = [float(x.strip()) for x in near.split(",")]
+        if len(n) != 2:
+            raise ValueError
+        return n[0], n[1]
+    except Exception:
+        raise HTTPException(status_code=400, detail="Invalid near format. Use 'lat,lng'.")
+
+
+@router.get(
+    "/",
+    response_model=Union[List[schemas.SmallBusiness], schemas.BusinessPage, List[schemas.BusinessPin]],
+)
 def read_businesses(
-    skip: int = 0,
-    limit: int = 100,
+    skip: int = Query(0, ge=0),
+    limit: int = Query(100, ge=1, le=500),
     bbox: Optional[str] = None,  # "west,south,east,north"
     near: Optional[str] = None,  # "lat,lng"
     radius_km: Optional[float] = None,
+    cursor: Optional[str] = None,
+    fields: Optional[str] = None,  # "id,name,lat,lng" or "pin"
+    *,
+    request: Request,
     db: Session = Depends(get_db),
 ):
     """Public listing of approved businesses with optional spatial filters.
 
     - bbox: filter by viewport rectangle (comma-separated: west,south,east,north)
     - near + radius_km: filter by distance and sort nearest-first
+    - cursor: keyset pagination. Pass an empty cursor for the first page; the response
+      becomes a BusinessPage whose next_cursor fetches the following one. Without a
+      cursor the plain list (skip/limit) is returned as before.
+    - fields: sparse fieldset (comma-separated SmallBusiness fields, or "pin" for the
+      BusinessPin shape). Only those columns are selected and serialized; id is always included.
+
+    Responses carry a weak ETag tied to the catalog version; a matching If-None-Match
+    gets 304 before any business row is read. Bodies are served from the response
+    cache, which drops only the pages a catalog change can affect.
     """
+    etag = catalog_etag(db, request)
+    cached = not_modified(request, etag)
+    if cached is not None:
+        return cached
 
     parsed_bbox: Optional[Tuple[float, float, float, float]] = None
     if bbox:
-        try:
-            parts = [float(x.strip()) for x in bbox.split(",")]
-            if len(parts) != 4:
-                raise ValueError
-            parsed_bbox = (parts[0], parts[1], parts[2], parts[3])
-        except Exception:
-            raise HTTPException(status_code=400, detail="Invalid bbox format. Use 'west,south,east,north'.")
+        parsed_bbox = _parse_bbox(bbox)
 
     near_lat = near_lng = None
     if near:
+        near_lat, near_lng = _parse_near(near)
+
+    proximity = near_lat is not None and radius_km is not None
+    after_id = after_distance = None
+    if cursor:
+        try:
+            key = decode_cursor(cursor, "d", "id") if proximity else decode_cursor(cursor, "id")
+            after_id = int(key["id"])
+            after_distance = float(key["d"]) if proximity else None
+        except (TypeError, ValueError):
+            raise HTTPException(status_code=400, detail="Invalid cursor.")
+
+    field_names: Optional[List[str]] = None
+    if fields is not None:
         try:
-            n = [float(x.strip()) for x in near.split(",")]
-            if len(n) != 2:
-                raise ValueError
-            near_lat, near_lng = n[0], n[1]
-        except Exception:
-            raise HTTPException(status_code=400, detail="Invalid near format. Use 'lat,lng'.")
-
-    return crud.search_businesses(
+            field_names = parse_fields(fields)
+        except ValueError as exc:
+            raise HTTPException(status_code=400, detail=str(exc))
+
+    params = {
+        "skip": skip,
+        "limit": limit,
+        "bbox": parsed_bbox,
+        "near": (near_lat, near_lng, radius_km) if proximity else None,
+        "page": cursor is not None,
+        "after": (after_distance, after_id) if proximity else after_id,
+        "fields": field_names,
+    }
+    key = response_cache.key("list", params, _shared_cache_version(db))
+    body = response_cache.get(key)
+    if body is None:
+        generation = response_cache.generation
+        body, scope = _render_listing(
+            db,
+            skip=skip,
+            limit=limit,
+            bbox=parsed_bbox,
+            near=(near_lat, near_lng, radius_km) if proximity else None,
+            paged=cursor is not None,
+            after_id=after_id,
+            after_distance=after_distance,
+            field_names=field_names,
+        )
+        response_cache.put(key, body, scope, generation)
+    return Response(content=body, media_type="application/json", headers=etag_headers(etag))
+
+
+def _shared_cache_version(db: Session) -> Optional[int]:
+    """Catalog version for namespacing keys in a shared response cache backend."""
+    return catalog_version(db) if response_cache.backend.shared else None
+
+
+def _render_listing(
+    db: Session,
+    *,
+    skip: int,
+    limit: int,
+    bbox: Optional[Tuple[float, float, float, float]],
+    near: Optional[Tuple[float, float, float]],
+    paged: bool,
+    after_id: Optional[int],
+    after_distance: Optional[float],
+    field_names: Optional[List[str]],
+) -> Tuple[bytes, ListingScope]:
+    """Serialized listing body plus the scope the response cache invalidates it by."""
+    near_lat, near_lng, radius_km = near if near is not None else (None, None, None)
+    search = dict(
+        skip=skip,
+        limit=limit + 1 if paged else limit,
+        approved_only=True,
+        bbox=bbox,
+        near_lat=near_lat,
+        near_lng=near_lng,
+        radius_km=radius_km,
+        after_id=after_id,
+        after_distance=after_distance,
+    )
+    if field_names is not None:
+        rows = crud.search_business_rows(db, columns_for(field_names), **search)
+        # id first; radius searches append the distance
+        keys = [(row[-1], row[0]) if near is not None else (row[0],) for row in rows]
+    else:
+        rows = crud.search_businesses(db, **search)
+        keys = [(b.distance_km, b.id) if near is not None else (b.id,) for b in rows]
+
+    more = paged and len(rows) > limit
+    rows, keys = rows[:limit], keys[:limit]
+    next_cursor = None
+    if more:
+        last = keys[-1]
+        next_cursor = encode_cursor(d=last[0], id=last[1]) if near is not None else encode_cursor(id=last[0])
+
+    if field_names is not None:
+        body = render_rows(field_names, rows, next_cursor=next_cursor, page=paged)
+    elif paged:
+        body = schemas.BusinessPage(items=rows, next_cursor=next_cursor).model_dump_json().encode("utf-8")
+    else:
+        body = _business_list.dump_json(_business_list.validate_python(rows, from_attributes=True))
+
+    after = None
+    if after_id is not None:
+        after = (after_distance, after_id) if near is not None else (after_id,)
+    scope = listing_scope(
+        bbox=bbox,
+        near=near,
+        skip=skip,
+        after=after,
+        keys=keys,
+        full=more if paged else len(rows) >= limit,
+    )
+    return body, scope
+
+
+@router.get("/search", response_model=List[schemas.BusinessSearchHit])
+def search_businesses(
+    q: str = Query(..., min_length=1, max_length=200),
+    skip: int = Query(0, ge=0),
+    limit: int = Query(20, ge=1, le=100),
+    bbox: Optional[str] = None,  # "west,south,east,north"
+    near: Optional[str] = None,  # "lat,lng"
+    radius_km: Optional[float] = Query(None, gt=0),
+    *,
+    request: Request,
+    response: Response,
+    db: Session = Depends(get_db),
+):
+    """Ranked keyword search over name, description, city and address.
+
+    Words are stemmed and all must match; "quoted text" is matched as a phrase.
+    Combine with bbox and/or near + radius_km to search a map area ("tacos near me").
+    """
+    etag = catalog_etag(db, request)
+    cached = not_modified(request, etag)
+    if cached is not None:
+        return cached
+    response.headers.update(etag_headers(etag))
+
+    parsed_bbox = _parse_bbox(bbox) if bbox else None
+    near_lat, near_lng = _parse_near(near) if near else (None, None)
+    return crud.search_businesses_text(
         db,
+        q,
         skip=skip,
         limit=limit,
-        approved_only=True,
         bbox=parsed_bbox,
         near_lat=near_lat,
         near_lng=near_lng,
@@ -60,6 +236,91 @@ def read_businesses(
     )
 
 
+@router.get("/suggest", response_model=List[schemas.BusinessSuggestion])
+def suggest_businesses(
+    prefix: str = Query(..., min_length=1, max_length=100),
+    limit: int = Query(8, ge=1, le=MAX_SUGGESTIONS),
+    near: Optional[str] = None,  # "lat,lng"
+    db: Session = Depends(get_db),
+):
+    """Typeahead: businesses with a name word starting with ``prefix``.
+
+    Answered from memory (no query after the first load); most popular first, or
+    nearest first when ``near`` is given.
+    """
+    near_lat, near_lng = _parse_near(near) if near else (None, None)
+    suggest_index.ensure_loaded(db)
+    if near and business_index.enabled:
+        business_index.ensure_loaded(db)
+    return [s._asdict() for s in suggest_index.suggest(prefix, limit, lat=near_lat, lng=near_lng)]
+
+
+@router.get("/clusters", response_model=schemas.BusinessClusters)
+def read_business_clusters(
+    bbox: str,
+    zoom: int = Query(..., ge=0, le=MAX_CLUSTER_ZOOM),
+    *,
+    request: Request,
+    response: Response,
+    db: Session = Depends(get_db),
+):
+    """Marker clusters for a viewport: count, centroid and one sample id per grid cell.
+
+    Grids are cached per zoom level and rebuilt after the catalog changes.
+    """
+    etag = catalog_etag(db, request)
+    cached = not_modified(request, etag)
+    if cached is not None:
+        return cached
+    response.headers.update(etag_headers(etag))
+    clusters = cluster_cache.clusters(db, _parse_bbox(bbox), zoom)
+    return schemas.BusinessClusters(zoom=zoom, clusters=[c._asdict() for c in clusters])
+
+
+@router.get("/nearest", response_model=List[schemas.NearbyBusiness])
+def read_nearest_businesses(
+    lat: float = Query(..., ge=-90, le=90),
+    lng: float = Query(..., ge=-180, le=180),
+    k: int = Query(20, ge=1, le=200),
+    *,
+    request: Request,
+    response: Response,
+    db: Session = Depends(get_db),
+):
+    """The k closest approved businesses to a point, nearest first, with distance in km."""
+    etag = catalog_etag(db, request)
+    cached = not_modified(request, etag)
+    if cached is not None:
+        return cached
+    response.headers.update(etag_headers(etag))
+    return crud.nearest_businesses(db, lat=lat, lng=lng, k=k)
+
+
+@router.get("/tiles/{z}/{x}/{y}")
+def read_business_tile(
+    x: int,
+    y: int,
+    z: int = Path(..., ge=0, le=MAX_TILE_ZOOM),
+    *,
+    request: Request,
+    db: Session = Depends(get_db),
+):
+    """Map pin tile: compact JSON with [id, lat, lng, name] rows for one slippy-map tile."""
+    n = 1 << z
+    if not (0 <= x < n and 0 <= y < n):
+        raise HTTPException(status_code=404, detail="Tile out of range")
+    cache_control = f"public, max-age={TILE_MAX_AGE}"
+    etag = catalog_etag(db, request)
+    cached = not_modified(request, etag, cache_control)
+    if cached is not None:
+        return cached
+    return Response(
+        content=render_tile(db, z, x, y),
+        media_type="application/json",
+        headers=etag_headers(etag, cache_control),
+    )
+
+
 @router.get("/pending", response_model=List[schemas.SmallBusiness])
 def read_pending_businesses(
     _: User = Depends(require_role(UserRole.ADMIN)),
@@ -79,12 +340,22 @@ def read_my_businesses(
 
 
 @router.get("/{business_id}", response_model=schemas.SmallBusiness)
-def read_business(business_id: int, db: Session = Depends(get_db)):
-    """Public detail for a single approved business."""
-    biz = crud.get_business(db, business_id)
-    if not biz or not biz.is_approved:
-        raise HTTPException(status_code=404, detail="Business not found")
-    return biz
+def read_business(business_id: int, request: Request, db: Session = Depends(get_db)):
+    """Public detail for a single approved business (ETag/If-None-Match and cached like the listing)."""
+    etag = catalog_etag(db, request)
+    cached = not_modified(request, etag)
+    if cached is not None:
+        return cached
+    key = response_cache.key("detail", {"id": business_id}, _shared_cache_version(db))
+    body = response_cache.get(key)
+    if body is None:
+        generation = response_cache.generation
+        biz = crud.get_business(db, business_id)
+        if not biz or not biz.is_approved:
+            raise HTTPException(status_code=404, detail="Business not found")
+        body = schemas.SmallBusiness.model_validate(biz).model_dump_json().encode("utf-8")
+        response_cache.put(key, body, DetailScope(business_id), generation)
+    return Response(content=body, media_type="application/json", headers=etag_headers(etag))
 
 
 @router.post(
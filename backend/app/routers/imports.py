@@ -1,93 +1,29 @@
-import csv
-import io
-from datetime import datetime
-from typing import Dict, List, Optional
+from typing import Iterator, List, Optional
 
-from fastapi import APIRouter, Depends, File, HTTPException, UploadFile, status
+from fastapi import APIRouter, Depends, File, HTTPException, Query, UploadFile, status
+from fastapi.responses import StreamingResponse
+from sqlalchemy import or_
 from sqlalchemy.orm import Session
 
 from .. import models, schemas
 from ..auth import require_role
-from ..database import get_db
-from ..geocode import geocode_address
+from ..catalog import bump_catalog_version
+from ..database import SessionLocal, get_db
+from ..geocode import coords_precision, geocode_many
+from ..import_approval import approve_items
+from ..import_counts import reconcile_counts, record_transition, record_transitions, status_counts
+from ..import_edits import apply_fields, clean_fields, edit_items, rematch
+from ..import_jobs import discard_upload, import_runner, progress_report, store_upload
+from ..import_regeocode import regeocode_runner
+from ..importer import CsvImportError, open_csv
 from ..models_user import User, UserRole
+from ..pagination import decode_cursor, encode_cursor
+from ..spatial_index import business_index
 
 router = APIRouter(prefix="/api/imports", tags=["imports"])
 
-REQUIRED_COLUMNS = [
-    "name",
-    "description",
-    "phone_number",
-    "location",
-    "lat",
-    "lng",
-    "address1",
-    "city",
-    "state",
-    "zip",
-]
-
-
-def _safe_float(value: Optional[str]) -> Optional[float]:
-    if value is None:
-        return None
-    text = str(value).strip()
-    if not text:
-        return None
-    try:
-        return float(text)
-    except ValueError:
-        return None
-
-
-def _normalize_text(value: Optional[str]) -> Optional[str]:
-    if value is None:
-        return None
-    text = str(value).strip()
-    return text or None
-
-
-def _build_location(address1: Optional[str], city: Optional[str], state: Optional[str], zip_code: Optional[str]) -> str:
-    parts = [address1, city, state, zip_code]
-    return ", ".join([p for p in parts if p])
-
-
-def _duplicate_business(
-    db: Session,
-    *,
-    name: str,
-    address1: Optional[str],
-    city: Optional[str],
-    state: Optional[str],
-    zip_code: Optional[str],
-) -> Optional[models.Business]:
-    query = db.query(models.Business).filter(models.Business.name.ilike(name))
-    if address1:
-        query = query.filter(models.Business.address1.ilike(address1))
-    if city:
-        query = query.filter(models.Business.city.ilike(city))
-    if state:
-        query = query.filter(models.Business.state.ilike(state))
-    if zip_code:
-        query = query.filter(models.Business.zip.ilike(zip_code))
-    return query.first()
-
-
-def _compute_status(
-    *,
-    duplicate_of: Optional[models.Business],
-    lat: Optional[float],
-    lng: Optional[float],
-    error_message: Optional[str],
-) -> str:
-    if duplicate_of is not None:
-        return models.ImportItemStatus.DUPLICATE_PENDING.value
-    if lat is None or lng is None:
-        return models.ImportItemStatus.NEEDS_FIX.value if error_message else models.ImportItemStatus.NEEDS_GEOCODE.value
-    return models.ImportItemStatus.READY.value
-
-
-@router.post("/batches", response_model=schemas.ImportBatchSummary, status_code=status.HTTP_201_CREATED)
+
+@router.post("/batches", response_model=schemas.ImportBatchSummary, status_code=status.HTTP_202_ACCEPTED)
 def create_import_batch(
     file: UploadFile = File(...),
     _: User = Depends(require_role(UserRole.ADMIN)),
@@ -96,113 +32,46 @@ def create_import_batch(
     if not file.filename.lower().endswith(".csv"):
         raise HTTPException(status_code=400, detail="CSV files only.")
 
-    raw = file.file.read()
+    # The upload is kept on disk for the job (and for a resume after a restart);
+    # only the header is checked here so bad files still fail fast.
+    upload_path, lines = store_upload(file.file)
     try:
-        text = raw.decode("utf-8")
-    except UnicodeDecodeError:
-        text = raw.decode("utf-8-sig")
-
-    reader = csv.DictReader(io.StringIO(text))
-    columns = [c.strip() for c in reader.fieldnames or []]
-    missing = [c for c in REQUIRED_COLUMNS if c not in columns]
-    if missing:
-        raise HTTPException(status_code=400, detail=f"Missing required columns: {', '.join(missing)}")
+        with open(upload_path, "rb") as stored:
+            open_csv(stored)
+    except CsvImportError as exc:
+        discard_upload(upload_path)
+        raise HTTPException(status_code=400, detail=str(exc))
 
     batch = models.ImportBatch(
         created_by_id=_.id,
         total_rows=0,
+        source_name=file.filename,
+        status=models.ImportBatchStatus.PROCESSING.value,
+        expected_rows=max(lines - 1, 0),
+        upload_path=upload_path,
     )
     db.add(batch)
-    db.flush()
-
-    seen_keys: Dict[str, int] = {}
-    items: List[models.ImportItem] = []
-
-    for row in reader:
-        name = _normalize_text(row.get("name"))
-        if not name:
-            continue
-
-        description = _normalize_text(row.get("description"))
-        phone_number = _normalize_text(row.get("phone_number"))
-        address1 = _normalize_text(row.get("address1"))
-        city = _normalize_text(row.get("city"))
-        state = _normalize_text(row.get("state"))
-        zip_code = _normalize_text(row.get("zip"))
-
-        location = _normalize_text(row.get("location"))
-        if not location:
-            location = _build_location(address1, city, state, zip_code)
-
-        lat = _safe_float(row.get("lat"))
-        lng = _safe_float(row.get("lng"))
-
-        duplicate_of = _duplicate_business(
-            db,
-            name=name,
-            address1=address1,
-            city=city,
-            state=state,
-            zip_code=zip_code,
-        )
-
-        error_message = None
-        if lat is None or lng is None:
-            geocoded = geocode_address(address1, city, state, zip_code)
-            if geocoded:
-                lat, lng = geocoded
-            else:
-                error_message = "Missing or invalid coordinates."
-
-        key = "|".join([name.lower(), (address1 or "").lower(), (city or "").lower(), (state or "").lower(), (zip_code or "").lower()])
-        if key in seen_keys:
-            error_message = "Duplicate in batch."
-            duplicate_of = duplicate_of or None
-            status_value = models.ImportItemStatus.DUPLICATE_PENDING.value
-        else:
-            seen_keys[key] = 1
-            status_value = _compute_status(duplicate_of=duplicate_of, lat=lat, lng=lng, error_message=error_message)
-
-        item = models.ImportItem(
-            batch_id=batch.id,
-            status=status_value,
-            error_message=error_message,
-            name=name,
-            description=description,
-            phone_number=phone_number,
-            location=location,
-            lat=lat,
-            lng=lng,
-            address1=address1,
-            city=city,
-            state=state,
-            zip=zip_code,
-            duplicate_of_business_id=duplicate_of.id if duplicate_of else None,
-        )
-        items.append(item)
-
-    batch.total_rows = len(items)
-    db.add_all(items)
     db.commit()
     db.refresh(batch)
+    import_runner.submit(batch.id)
 
-    return _batch_summary(db, batch)
+    return _batch_summary(batch)
 
 
-def _batch_summary(db: Session, batch: models.ImportBatch) -> schemas.ImportBatchSummary:
-    items = db.query(models.ImportItem).filter(models.ImportItem.batch_id == batch.id).all()
-    counts = {
-        models.ImportItemStatus.READY.value: 0,
-        models.ImportItemStatus.NEEDS_GEOCODE.value: 0,
-        models.ImportItemStatus.NEEDS_FIX.value: 0,
-        models.ImportItemStatus.DUPLICATE_PENDING.value: 0,
-        models.ImportItemStatus.APPROVED.value: 0,
-        models.ImportItemStatus.REJECTED.value: 0,
-        models.ImportItemStatus.MERGED.value: 0,
-    }
-    for item in items:
-        counts[item.status] = counts.get(item.status, 0) + 1
+@router.get("/batches/{batch_id}/progress", response_model=schemas.ImportBatchProgress)
+def get_batch_progress(
+    batch_id: int,
+    _: User = Depends(require_role(UserRole.ADMIN)),
+    db: Session = Depends(get_db),
+):
+    batch = db.query(models.ImportBatch).filter(models.ImportBatch.id == batch_id).first()
+    if not batch:
+        raise HTTPException(status_code=404, detail="Batch not found")
+    return schemas.ImportBatchProgress(**progress_report(batch, import_runner))
 
+
+def _batch_summary(batch: models.ImportBatch) -> schemas.ImportBatchSummary:
+    counts = status_counts(batch)
     return schemas.ImportBatchSummary(
         batch=batch,
         ready=counts[models.ImportItemStatus.READY.value],
@@ -221,7 +90,123 @@ def list_batches(
     db: Session = Depends(get_db),
 ):
     batches = db.query(models.ImportBatch).order_by(models.ImportBatch.created_at.desc()).all()
-    return [_batch_summary(db, batch) for batch in batches]
+    return [_batch_summary(batch) for batch in batches]
+
+
+@router.post("/batches/recount", response_model=List[schemas.ImportBatchSummary])
+def recount_batches(
+    _: User = Depends(require_role(UserRole.ADMIN)),
+    db: Session = Depends(get_db),
+):
+    """Rebuild every batch's status counters from its items (repair)."""
+    reconcile_counts(db)
+    db.commit()
+    batches = db.query(models.ImportBatch).order_by(models.ImportBatch.created_at.desc()).all()
+    return [_batch_summary(batch) for batch in batches]
+
+
+_ITEM_STATUSES = {status.value for status in models.ImportItemStatus}
+_PRECISIONS = {precision.value for precision in models.GeocodePrecision}
+_STREAM_BATCH = 1000
+
+
+def _filtered_items(
+    db: Session, batch_id: int, item_status: Optional[str], q: Optional[str], precision: Optional[str] = None
+):
+    query = db.query(models.ImportItem).filter(models.ImportItem.batch_id == batch_id)
+    if item_status:
+        if item_status not in _ITEM_STATUSES:
+            raise HTTPException(status_code=400, detail="Unknown item status.")
+        query = query.filter(models.ImportItem.status == item_status)
+    if precision:
+        if precision not in _PRECISIONS:
+            raise HTTPException(status_code=400, detail="Unknown geocode precision.")
+        query = query.filter(models.ImportItem.geocode_precision == precision)
+    if q:
+        like = f"%{q}%"
+        query = query.filter(or_(models.ImportItem.name.ilike(like), models.ImportItem.city.ilike(like)))
+    return query
+
+
+@router.get("/batches/{batch_id}/items", response_model=schemas.ImportItemPage)
+def list_batch_items(
+    batch_id: int,
+    item_status: Optional[str] = Query(None, alias="status"),
+    q: Optional[str] = Query(None, max_length=200),
+    precision: Optional[str] = None,
+    limit: int = Query(100, ge=1, le=500),
+    cursor: Optional[str] = None,
+    _: User = Depends(require_role(UserRole.ADMIN)),
+    db: Session = Depends(get_db),
+):
+    """One page of a batch's items in id order.
+
+    - status: only items in this status
+    - q: case-insensitive substring of the name or city
+    - precision: only items geocoded to this GeocodePrecision (ZIP for approximate ones)
+    - cursor: next_cursor of the previous page
+
+    Pages are read through the (batch_id, status, id) index. ``total`` comes
+    from the batch's status counters unless q or precision is given, when it
+    is counted.
+    """
+    batch = db.query(models.ImportBatch).filter(models.ImportBatch.id == batch_id).first()
+    if not batch:
+        raise HTTPException(status_code=404, detail="Batch not found")
+    after_id = None
+    if cursor:
+        try:
+            after_id = int(decode_cursor(cursor, "id")["id"])
+        except (TypeError, ValueError):
+            raise HTTPException(status_code=400, detail="Invalid cursor.")
+
+    query = _filtered_items(db, batch_id, item_status, q, precision)
+    if q or precision:
+        total = query.count()
+    else:
+        counts = status_counts(batch)
+        total = counts[item_status] if item_status else sum(counts.values())
+    if after_id is not None:
+        query = query.filter(models.ImportItem.id > after_id)
+    items = query.order_by(models.ImportItem.id.asc()).limit(limit + 1).all()
+    next_cursor = None
+    if len(items) > limit:
+        items = items[:limit]
+        next_cursor = encode_cursor(id=items[-1].id)
+    return schemas.ImportItemPage(items=items, total=total, next_cursor=next_cursor)
+
+
+@router.get("/batches/{batch_id}/items.ndjson")
+def stream_batch_items(
+    batch_id: int,
+    item_status: Optional[str] = Query(None, alias="status"),
+    q: Optional[str] = Query(None, max_length=200),
+    precision: Optional[str] = None,
+    _: User = Depends(require_role(UserRole.ADMIN)),
+    db: Session = Depends(get_db),
+):
+    """Every matching item as newline-delimited JSON (one schemas.ImportItem per line), in id order."""
+    if not db.query(models.ImportBatch.id).filter(models.ImportBatch.id == batch_id).first():
+        raise HTTPException(status_code=404, detail="Batch not found")
+    if item_status and item_status not in _ITEM_STATUSES:
+        raise HTTPException(status_code=400, detail="Unknown item status.")
+    if precision and precision not in _PRECISIONS:
+        raise HTTPException(status_code=400, detail="Unknown geocode precision.")
+
+    def lines() -> Iterator[str]:
+        # Own session: the request's is closed before the body is streamed.
+        with SessionLocal() as stream_db:
+            query = _filtered_items(stream_db, batch_id, item_status, q, precision).order_by(models.ImportItem.id.asc())
+            buffered = []
+            for item in query.yield_per(_STREAM_BATCH):
+                buffered.append(schemas.ImportItem.model_validate(item).model_dump_json())
+                if len(buffered) >= _STREAM_BATCH:
+                    yield "\n".join(buffered) + "\n"
+                    buffered.clear()
+            if buffered:
+                yield "\n".join(buffered) + "\n"
+
+    return StreamingResponse(lines(), media_type="application/x-ndjson")
 
 
 @router.get("/batches/{batch_id}", response_model=schemas.ImportBatchDetail)
@@ -230,6 +215,7 @@ def get_batch(
     _: User = Depends(require_role(UserRole.ADMIN)),
     db: Session = Depends(get_db),
 ):
+    """A batch with all of its items; large batches should use /items or /items.ndjson."""
     batch = db.query(models.ImportBatch).filter(models.ImportBatch.id == batch_id).first()
     if not batch:
         raise HTTPException(status_code=404, detail="Batch not found")
@@ -246,35 +232,37 @@ def get_batch(
         source_name=batch.source_name,
         source_url=batch.source_url,
         total_rows=batch.total_rows,
+        status=batch.status,
+        processed_rows=batch.processed_rows,
+        expected_rows=batch.expected_rows,
+        error_message=batch.error_message,
+        started_at=batch.started_at,
+        finished_at=batch.finished_at,
+        geocode_lookups=batch.geocode_lookups,
+        geocode_cache_hits=batch.geocode_cache_hits,
         items=items,
     )
 
 
-def _create_business_from_item(
-    db: Session,
-    item: models.ImportItem,
-    reviewer: User,
-) -> models.Business:
-    business = models.Business(
-        name=item.name,
-        description=item.description,
-        phone_number=item.phone_number,
-        location=item.location,
-        lat=item.lat,
-        lng=item.lng,
-        hide_address=False,
-        address1=item.address1,
-        city=item.city,
-        state=item.state,
-        zip=item.zip,
-        is_approved=True,
-        approved_at=datetime.utcnow(),
-        approved_by_id=reviewer.id,
-        created_by_id=reviewer.id,
+@router.patch("/batches/{batch_id}/items", response_model=List[schemas.ImportItemEditResult])
+def update_batch_items(
+    batch_id: int,
+    payload: List[schemas.ImportItemBulkUpdate],
+    _: User = Depends(require_role(UserRole.ADMIN)),
+    db: Session = Depends(get_db),
+):
+    """Edit many items of a batch in one transaction; results are in request order.
+
+    Each entry is an ImportItemUpdate plus the item id, with only the fields
+    it sets changed. Edits that cannot be applied are reported in their
+    result and do not stop the others.
+    """
+    if not db.query(models.ImportBatch.id).filter(models.ImportBatch.id == batch_id).first():
+        raise HTTPException(status_code=404, detail="Batch not found")
+    results = edit_items(
+        db, batch_id, [(edit.id, edit.model_dump(exclude_unset=True, exclude={"id"})) for edit in payload]
     )
-    db.add(business)
-    db.flush()
-    return business
+    return [schemas.ImportItemEditResult(id=r.item_id, item=r.item, error=r.error) for r in results]
 
 
 @router.post("/batches/{batch_id}/approve_all", response_model=schemas.ImportBatchSummary)
@@ -287,22 +275,8 @@ def approve_all_ready(
     if not batch:
         raise HTTPException(status_code=404, detail="Batch not found")
 
-    items = (
-        db.query(models.ImportItem)
-        .filter(
-            models.ImportItem.batch_id == batch_id,
-            models.ImportItem.status == models.ImportItemStatus.READY.value,
-        )
-        .all()
-    )
-    for item in items:
-        business = _create_business_from_item(db, item, reviewer)
-        item.status = models.ImportItemStatus.APPROVED.value
-        item.approved_business_id = business.id
-        item.error_message = None
-    db.commit()
-
-    return _batch_summary(db, batch)
+    approve_items(db, batch_id, reviewer.id)
+    return _batch_summary(batch)
 
 
 @router.post("/batches/{batch_id}/approve", response_model=schemas.ImportBatchSummary)
@@ -316,34 +290,9 @@ def approve_selected(
     if not batch:
         raise HTTPException(status_code=404, detail="Batch not found")
 
-    if not payload.item_ids:
-        return _batch_summary(db, batch)
-
-    items = (
-        db.query(models.ImportItem)
-        .filter(models.ImportItem.batch_id == batch_id, models.ImportItem.id.in_(payload.item_ids))
-        .all()
-    )
-    for item in items:
-        if item.status in {
-            models.ImportItemStatus.APPROVED.value,
-            models.ImportItemStatus.REJECTED.value,
-            models.ImportItemStatus.MERGED.value,
-        }:
-            continue
-        if item.lat is None or item.lng is None:
-            item.status = models.ImportItemStatus.NEEDS_FIX.value
-            item.error_message = "Missing or invalid coordinates."
-            continue
-        if item.duplicate_of_business_id:
-            item.status = models.ImportItemStatus.DUPLICATE_PENDING.value
-            continue
-        business = _create_business_from_item(db, item, reviewer)
-        item.status = models.ImportItemStatus.APPROVED.value
-        item.approved_business_id = business.id
-        item.error_message = None
-    db.commit()
-    return _batch_summary(db, batch)
+    if payload.item_ids:
+        approve_items(db, batch_id, reviewer.id, item_ids=payload.item_ids)
+    return _batch_summary(batch)
 
 
 @router.post("/batches/{batch_id}/reject", response_model=schemas.ImportBatchSummary)
@@ -358,24 +307,61 @@ def reject_selected(
         raise HTTPException(status_code=404, detail="Batch not found")
 
     if not payload.item_ids:
-        return _batch_summary(db, batch)
+        return _batch_summary(batch)
 
     items = (
         db.query(models.ImportItem)
         .filter(models.ImportItem.batch_id == batch_id, models.ImportItem.id.in_(payload.item_ids))
         .all()
     )
+    changes = []
     for item in items:
         if item.status in {
             models.ImportItemStatus.APPROVED.value,
             models.ImportItemStatus.MERGED.value,
         }:
             continue
+        changes.append((item.status, models.ImportItemStatus.REJECTED.value))
         item.status = models.ImportItemStatus.REJECTED.value
         item.error_message = None
+    record_transitions(db, batch_id, changes)
 
     db.commit()
-    return _batch_summary(db, batch)
+    return _batch_summary(batch)
+
+
+@router.post(
+    "/batches/{batch_id}/regeocode",
+    response_model=schemas.ImportRegeocodeProgress,
+    status_code=status.HTTP_202_ACCEPTED,
+)
+def regeocode_batch_items(
+    batch_id: int,
+    _: User = Depends(require_role(UserRole.ADMIN)),
+    db: Session = Depends(get_db),
+):
+    """Start geocoding every NEEDS_GEOCODE and NEEDS_FIX item of the batch again in the background.
+
+    Poll GET /batches/{id}/regeocode for progress. While a job runs for the
+    batch, starting another returns the running one.
+    """
+    batch = db.query(models.ImportBatch).filter(models.ImportBatch.id == batch_id).first()
+    if not batch:
+        raise HTTPException(status_code=404, detail="Batch not found")
+    if batch.status == models.ImportBatchStatus.PROCESSING.value:
+        raise HTTPException(status_code=409, detail="Batch is still importing.")
+    return schemas.ImportRegeocodeProgress(**regeocode_runner.start(batch_id).report())
+
+
+@router.get("/batches/{batch_id}/regeocode", response_model=schemas.ImportRegeocodeProgress)
+def get_regeocode_progress(
+    batch_id: int,
+    _: User = Depends(require_role(UserRole.ADMIN)),
+):
+    job = regeocode_runner.progress(batch_id)
+    if job is None:
+        raise HTTPException(status_code=404, detail="No re-geocode job for this batch.")
+    return schemas.ImportRegeocodeProgress(**job.report())
 
 
 @router.post("/items/{item_id}/regeocode", response_model=schemas.ImportItem)
@@ -388,23 +374,17 @@ def regeocode_item(
     if not item:
         raise HTTPException(status_code=404, detail="Item not found")
 
-    coords = geocode_address(item.address1, item.city, item.state, item.zip)
+    old_status = item.status
+    (coords,) = geocode_many([(item.address1, item.city, item.state, item.zip)])
     if coords:
         item.lat, item.lng = coords
-        dup = _duplicate_business(
-            db,
-            name=item.name,
-            address1=item.address1,
-            city=item.city,
-            state=item.state,
-            zip_code=item.zip,
-        )
-        item.duplicate_of_business_id = dup.id if dup else None
-        item.status = _compute_status(duplicate_of=dup, lat=item.lat, lng=item.lng, error_message=None)
+        item.geocode_precision = coords_precision(coords)
         item.error_message = None
+        rematch(db, [item])
     else:
         item.status = models.ImportItemStatus.NEEDS_FIX.value
         item.error_message = "Geocoding failed."
+    record_transition(db, item.batch_id, old_status, item.status)
 
     db.commit()
     db.refresh(item)
@@ -422,27 +402,10 @@ def update_item(
     if not item:
         raise HTTPException(status_code=404, detail="Item not found")
 
-    for field, value in payload.model_dump(exclude_unset=True).items():
-        if field in {"lat", "lng"}:
-            value = _safe_float(value)
-        elif isinstance(value, str):
-            value = value.strip() or None
-        setattr(item, field, value)
-
-    if not item.location:
-        item.location = _build_location(item.address1, item.city, item.state, item.zip)
-
-    dup = _duplicate_business(
-        db,
-        name=item.name,
-        address1=item.address1,
-        city=item.city,
-        state=item.state,
-        zip_code=item.zip,
-    )
-    item.duplicate_of_business_id = dup.id if dup else None
-    item.status = _compute_status(duplicate_of=dup, lat=item.lat, lng=item.lng, error_message=None)
-    item.error_message = None if item.status != models.ImportItemStatus.NEEDS_FIX.value else item.error_message
+    old_status = item.status
+    apply_fields(item, clean_fields(payload.model_dump(exclude_unset=True)))
+    rematch(db, [item])
+    record_transition(db, item.batch_id, old_status, item.status)
 
     db.commit()
     db.refresh(item)
@@ -458,6 +421,7 @@ def reject_item(
     item = db.query(models.ImportItem).filter(models.ImportItem.id == item_id).first()
     if not item:
         raise HTTPException(status_code=404, detail="Item not found")
+    record_transition(db, item.batch_id, item.status, models.ImportItemStatus.REJECTED.value)
     item.status = models.ImportItemStatus.REJECTED.value
     db.commit()
     db.refresh(item)
@@ -492,11 +456,15 @@ def merge_item(
         target.lat = item.lat if target.lat is None else target.lat
         target.lng = item.lng if target.lng is None else target.lng
 
+    record_transition(db, item.batch_id, item.status, models.ImportItemStatus.MERGED.value)
     item.status = models.ImportItemStatus.MERGED.value
     item.approved_business_id = target.id
     item.duplicate_of_business_id = target.id
     item.error_message = None
 
+    if target.is_approved:
+        bump_catalog_version(db)
     db.commit()
     db.refresh(item)
+    business_index.sync(target)
     return item
@@ -39,6 +39,49 @@ class SmallBusiness(SmallBusinessBase):
         from_attributes = True  # Pydantic v2
 
 
+class NearbyBusiness(SmallBusiness):
+    distance_km: float
+
+
+class BusinessSearchHit(SmallBusiness):
+    score: float  # relevance; higher is better, only comparable within one response
+    distance_km: float | None = None
+
+
+class BusinessPin(BaseModel):
+    """Map-marker projection of a business (?fields=pin)."""
+    id: int
+    name: str
+    lat: float | None = None
+    lng: float | None = None
+
+
+class BusinessSuggestion(BaseModel):
+    id: int
+    name: str
+    lat: float
+    lng: float
+    distance_km: float | None = None
+
+
+class BusinessPage(BaseModel):
+    """Cursor-paginated business listing; pass next_cursor back as ?cursor=."""
+    items: List[SmallBusiness]
+    next_cursor: str | None = None
+
+
+class BusinessCluster(BaseModel):
+    lat: float
+    lng: float
+    count: int
+    sample_id: int
+
+
+class BusinessClusters(BaseModel):
+    zoom: int
+    clusters: List[BusinessCluster]
+
+
 class BusinessSubmission(SmallBusinessBase):
     id: int
     owner_id: int
@@ -70,6 +113,7 @@ class BusinessSubmissionDetail(BusinessSubmission):
 class SubmissionPage(BaseModel):
     items: List[BusinessSubmission]
     total: int
+    next_cursor: str | None = None
 
 
 class SubmissionRejectRequest(BaseModel):
@@ -108,7 +152,9 @@ class ImportItem(BaseModel):
     city: str | None = None
     state: str | None = None
     zip: str | None = None
+    geocode_precision: str | None = None  # ADDRESS or ZIP (approximate); None if not geocoded
     duplicate_of_business_id: int | None = None
+    duplicate_confidence: float | None = None
     approved_business_id: int | None = None
 
     class Config:
@@ -122,6 +168,14 @@ class ImportBatch(BaseModel):
     source_name: str | None = None
     source_url: str | None = None
     total_rows: int
+    status: str = "COMPLETE"
+    processed_rows: int = 0
+    expected_rows: int | None = None
+    error_message: str | None = None
+    started_at: datetime | None = None
+    finished_at: datetime | None = None
+    geocode_lookups: int = 0
+    geocode_cache_hits: int = 0
 
     class Config:
         from_attributes = True
@@ -131,6 +185,13 @@ class ImportBatchDetail(ImportBatch):
     items: List[ImportItem]
 
 
+class ImportItemPage(BaseModel):
+    """Keyset-paginated batch items; pass next_cursor back as ?cursor=."""
+    items: List[ImportItem]
+    total: int
+    next_cursor: str | None = None
+
+
 class ImportBatchSummary(BaseModel):
     batch: ImportBatch
     ready: int
@@ -142,6 +203,38 @@ class ImportBatchSummary(BaseModel):
     merged: int
 
 
+class ImportBatchProgress(BaseModel):
+    batch_id: int
+    status: str
+    processed_rows: int
+    expected_rows: int | None = None
+    total_rows: int  # items written so far
+    rows_per_second: float | None = None
+    eta_seconds: float | None = None
+    geocode_lookups: int = 0
+    geocode_hit_ratio: float | None = None  # share of geocoded rows served without a network call
+    error_message: str | None = None
+    started_at: datetime | None = None
+    finished_at: datetime | None = None
+
+
+class ImportRegeocodeProgress(BaseModel):
+    batch_id: int
+    status: str  # RUNNING, COMPLETE, FAILED or STOPPED
+    items: int  # unresolved items when the job started
+    addresses: int  # ... and their distinct addresses
+    addresses_done: int
+    located: int
+    failed: int
+    addresses_per_second: float | None = None
+    eta_seconds: float | None = None
+    geocode_lookups: int = 0
+    geocode_hit_ratio: float | None = None
+    error_message: str | None = None
+    started_at: datetime | None = None
+    finished_at: datetime | None = None
+
+
 class ImportApproveRequest(BaseModel):
     item_ids: List[int]
 
@@ -159,5 +252,16 @@ class ImportItemUpdate(BaseModel):
     zip: str | None = None
 
 
+class ImportItemBulkUpdate(ImportItemUpdate):
+    id: int
+
+
+class ImportItemEditResult(BaseModel):
+    """Outcome of one edit in PATCH /batches/{id}/items: the updated item, or why it was refused."""
+    id: int
+    item: ImportItem | None = None
+    error: str | None = None
+
+
 class ImportItemMergeRequest(BaseModel):
     target_business_id: int
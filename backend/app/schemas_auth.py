@@ -57,3 +57,4 @@ class AdminUserListResponse(BaseModel):
     total: int
     skip: int
     limit: int
+    next_cursor: Optional[str] = None
@@ -0,0 +1,322 @@
+# backend/app/spatial_index.py
+# In-process spatial index over approved business coordinates.
+#
+# A bucketed region quadtree: each leaf holds up to NODE_CAPACITY points and
+# splits into four quadrants when it overflows, so bbox and radius lookups
+# descend O(log n) levels and only touch the leaves that overlap the query.
+# The catalog write paths (crud + import approvals) keep it in sync one
+# business at a time; it is never rebuilt after the first load.
+#
+# The index lives in a single process. Deployments running several API
+# workers should disable it (SPATIAL_INDEX=0) unless each worker is fine
+# with seeing other workers' writes only after a restart.
+
+import heapq
+import itertools
+import math
+import os
+import threading
+from typing import Callable, Dict, Iterable, List, NamedTuple, Optional, Tuple
+
+from sqlalchemy.orm import Session
+
+from . import models
+from .distance import rank_by_distance
+from .geo import EARTH_RADIUS_KM, BBox, bbox_contains, haversine_km, radius_bbox
+
+NODE_CAPACITY = 32
+MAX_DEPTH = 20
+
+
+class IndexedBusiness(NamedTuple):
+    id: int
+    name: str
+    lat: float
+    lng: float
+
+
+# Called with (business_id, new entry or None) after every catalog change.
+ChangeListener = Callable[[int, Optional[IndexedBusiness]], None]
+
+
+def index_entry(business: models.Business) -> Optional[IndexedBusiness]:
+    """Index entry for a business, or None when it should not be on the map."""
+    if not business.is_approved or business.lat is None or business.lng is None:
+        return None
+    return IndexedBusiness(business.id, business.name, float(business.lat), float(business.lng))
+
+
+def _lng_gap(a: float, b: float) -> float:
+    d = abs(a - b) % 360.0
+    return min(d, 360.0 - d)
+
+
+class _Node:
+    __slots__ = ("west", "south", "east", "north", "depth", "entries", "children")
+
+    def __init__(self, west: float, south: float, east: float, north: float, depth: int):
+        self.west = west
+        self.south = south
+        self.east = east
+        self.north = north
+        self.depth = depth
+        self.entries: Dict[int, IndexedBusiness] = {}
+        self.children: Optional[List["_Node"]] = None
+
+    def _child_for(self, lat: float, lng: float) -> "_Node":
+        mid_lng = (self.west + self.east) / 2
+        mid_lat = (self.south + self.north) / 2
+        return self.children[(2 if lat >= mid_lat else 0) + (1 if lng >= mid_lng else 0)]
+
+    def _split(self) -> None:
+        mid_lng = (self.west + self.east) / 2
+        mid_lat = (self.south + self.north) / 2
+        d = self.depth + 1
+        self.children = [
+            _Node(self.west, self.south, mid_lng, mid_lat, d),
+            _Node(mid_lng, self.south, self.east, mid_lat, d),
+            _Node(self.west, mid_lat, mid_lng, self.north, d),
+            _Node(mid_lng, mid_lat, self.east, self.north, d),
+        ]
+        entries, self.entries = self.entries, {}
+        for entry in entries.values():
+            self._child_for(entry.lat, entry.lng).insert(entry)
+
+    def insert(self, entry: IndexedBusiness) -> None:
+        node = self
+        while node.children is not None:
+            node = node._child_for(entry.lat, entry.lng)
+        node.entries[entry.id] = entry
+        if len(node.entries) > NODE_CAPACITY and node.depth < MAX_DEPTH:
+            node._split()
+
+    def remove(self, entry: IndexedBusiness) -> None:
+        path = [self]
+        while path[-1].children is not None:
+            path.append(path[-1]._child_for(entry.lat, entry.lng))
+        path[-1].entries.pop(entry.id, None)
+        # Collapse quadrants that have drained back under capacity.
+        for node in reversed(path[:-1]):
+            if any(child.children is not None for child in node.children):
+                break
+            if sum(len(child.entries) for child in node.children) > NODE_CAPACITY:
+                break
+            for child in node.children:
+                node.entries.update(child.entries)
+            node.children = None
+
+    def intersects(self, west: float, south: float, east: float, north: float) -> bool:
+        return not (self.east < west or self.west > east or self.north < south or self.south > north)
+
+    def within(self, west: float, south: float, east: float, north: float) -> bool:
+        return west <= self.west and self.east <= east and south <= self.south and self.north <= north
+
+    def min_distance_km(self, lat: float, lng: float) -> float:
+        """Lower bound on the distance from a point to anything inside this node.
+
+        Takes the larger of the meridian-arc gap in latitude and the distance to the
+        great circle of the nearest edge meridian (valid for nodes <= 180 degrees wide).
+        """
+        dlat = self.south - lat if lat < self.south else lat - self.north if lat > self.north else 0.0
+        bound = EARTH_RADIUS_KM * math.radians(dlat)
+        if self.west <= lng <= self.east or self.east - self.west > 180.0:
+            return bound
+        gap = min(_lng_gap(lng, self.west), _lng_gap(lng, self.east))
+        across = math.cos(math.radians(lat)) * math.sin(math.radians(gap))
+        return max(bound, EARTH_RADIUS_KM * math.asin(min(1.0, abs(across))))
+
+    def iter_entries(self) -> Iterable[IndexedBusiness]:
+        stack = [self]
+        while stack:
+            node = stack.pop()
+            if node.children is None:
+                yield from node.entries.values()
+            else:
+                stack.extend(node.children)
+
+
+class SpatialIndex:
+    """Thread-safe point index keyed by business id."""
+
+    def __init__(self, *, enabled: bool = True):
+        self.enabled = enabled
+        self._lock = threading.RLock()
+        self._root = _Node(-180.0, -90.0, 180.0, 90.0, 0)
+        self._entries: Dict[int, IndexedBusiness] = {}
+        self._loaded = False
+        # Bumped on every change so derived caches know when to drop their state.
+        self.version = 0
+        self._listeners: List[ChangeListener] = []
+        self._sync_listeners: List[Callable[[], None]] = []
+
+    @property
+    def loaded(self) -> bool:
+        return self._loaded
+
+    def __len__(self) -> int:
+        return len(self._entries)
+
+    def ensure_loaded(self, db: Session) -> None:
+        """Populate the index from the database on first use."""
+        if self._loaded:
+            return
+        with self._lock:
+            if self._loaded:
+                return
+            rows = (
+                db.query(models.Business.id, models.Business.name, models.Business.lat, models.Business.lng)
+                .filter(
+                    models.Business.is_approved.is_(True),
+                    models.Business.lat.isnot(None),
+                    models.Business.lng.isnot(None),
+                )
+                .all()
+            )
+            for biz_id, name, lat, lng in rows:
+                self._insert(IndexedBusiness(biz_id, name, float(lat), float(lng)))
+            self._loaded = True
+            self.version += 1
+
+    def _insert(self, entry: IndexedBusiness) -> None:
+        current = self._entries.get(entry.id)
+        if current is not None:
+            self._root.remove(current)
+        self._entries[entry.id] = entry
+        self._root.insert(entry)
+
+    def add_listener(self, listener: ChangeListener) -> None:
+        """Subscribe a derived cache to catalog changes.
+
+        Listeners fire even while the index itself is disabled or not loaded yet.
+        """
+        self._listeners.append(listener)
+
+    def add_sync_listener(self, listener: Callable[[], None]) -> None:
+        """Called, on the writer's thread, once an upsert/discard/sync/apply has
+        reached every change listener."""
+        self._sync_listeners.append(listener)
+
+    def _notify(self, business_id: int, entry: Optional[IndexedBusiness]) -> None:
+        for listener in self._listeners:
+            listener(business_id, entry)
+
+    def _synced(self) -> None:
+        for listener in self._sync_listeners:
+            listener()
+
+    def _upsert(self, entry: IndexedBusiness) -> None:
+        # Before the first load there is nothing to update; the load reads it from the database.
+        if self._loaded:
+            with self._lock:
+                self._insert(entry)
+                self.version += 1
+        self._notify(entry.id, entry)
+
+    def _discard(self, business_id: int) -> None:
+        if self._loaded:
+            with self._lock:
+                current = self._entries.pop(business_id, None)
+                if current is not None:
+                    self._root.remove(current)
+                    self.version += 1
+        self._notify(business_id, None)
+
+    def upsert(self, entry: IndexedBusiness) -> None:
+        self.apply([entry.id], [entry])
+
+    def discard(self, business_id: int) -> None:
+        self.apply([business_id], [None])
+
+    def sync(self, business: models.Business) -> None:
+        """Add, move or drop a business based on its approval state and coordinates."""
+        self.apply([business.id], [index_entry(business)])
+
+    def apply(self, business_ids: List[int], entries: List[Optional[IndexedBusiness]]) -> None:
+        """Bulk form of ``sync`` for entries captured before a commit expired the ORM rows."""
+        try:
+            for business_id, entry in zip(business_ids, entries):
+                if entry is None:
+                    self._discard(business_id)
+                else:
+                    self._upsert(entry)
+        finally:
+            self._synced()
+
+    def get(self, business_id: int) -> Optional[IndexedBusiness]:
+        return self._entries.get(business_id)
+
+    def nearest(self, lat: float, lng: float, k: int) -> List[Tuple[float, int]]:
+        """The k nearest (distance_km, id) pairs, found best-first with no radius.
+
+        Nodes and points share one priority queue keyed by (lower-bound) distance,
+        so the search stops as soon as k points have been popped: every unexplored
+        node is already at least that far away. Ties break by id.
+        """
+        found: List[Tuple[float, int]] = []
+        if k <= 0:
+            return found
+        tiebreak = itertools.count()
+        with self._lock:
+            # (distance, 0=node/1=point, tiebreak, payload): nodes expand before equal-distance points.
+            heap = [(0.0, 0, next(tiebreak), self._root)]
+            while heap and len(found) < k:
+                dist, kind, key, payload = heapq.heappop(heap)
+                if kind == 1:
+                    found.append((dist, key))
+                elif payload.children is None:
+                    for e in payload.entries.values():
+                        heapq.heappush(heap, (haversine_km(lat, lng, e.lat, e.lng), 1, e.id, e))
+                else:
+                    for child in payload.children:
+                        if child.children is None and not child.entries:
+                            continue
+                        heapq.heappush(heap, (child.min_distance_km(lat, lng), 0, next(tiebreak), child))
+        return found
+
+    def snapshot(self) -> Tuple[int, List[IndexedBusiness]]:
+        """Current version and every entry, read consistently."""
+        with self._lock:
+            return self.version, list(self._entries.values())
+
+    def query_bbox(self, bbox: BBox) -> List[IndexedBusiness]:
+        """Entries inside the rectangle, ordered by id."""
+        west, south, east, north = bbox
+        found: List[IndexedBusiness] = []
+        with self._lock:
+            stack = [self._root]
+            while stack:
+                node = stack.pop()
+                if not node.intersects(west, south, east, north):
+                    continue
+                if node.within(west, south, east, north):
+                    found.extend(node.iter_entries())
+                elif node.children is None:
+                    found.extend(e for e in node.entries.values() if bbox_contains(bbox, e.lat, e.lng))
+                else:
+                    stack.extend(node.children)
+        found.sort(key=lambda e: e.id)
+        return found
+
+    def query_radius(
+        self,
+        lat: float,
+        lng: float,
+        radius_km: float,
+        *,
+        k: Optional[int] = None,
+        bbox: Optional[BBox] = None,
+        after: Optional[Tuple[float, int]] = None,
+    ) -> List[Tuple[float, int]]:
+        """(distance_km, id) pairs within the radius, nearest first (ties by id).
+
+        ``k`` keeps only the k nearest, ``bbox`` additionally clips to a viewport and
+        ``after`` resumes past a (distance, id) keyset cursor.
+        """
+        entries = self.query_bbox(radius_bbox(lat, lng, radius_km))
+        if bbox is not None:
+            entries = [e for e in entries if bbox_contains(bbox, e.lat, e.lng)]
+        rows = [(e.id, e.lat, e.lng) for e in entries]
+        return rank_by_distance(lat, lng, rows, radius_km=radius_km, k=k, after=after)
+
+
+business_index = SpatialIndex(enabled=os.getenv("SPATIAL_INDEX", "1").lower() not in {"0", "false", "no", "off"})
@@ -0,0 +1,184 @@
+# backend/app/suggest.py
+# In-memory typeahead over approved business names.
+#
+# Every word position of a normalized name ("tacos el rey" -> "tacos el rey",
+# "el rey", "rey") is a key in one sorted list, so a prefix lookup is two
+# bisects and a contiguous slice. Ranking is by popularity (favorites,
+# check-ins and reviews, read once at load) or, given a location, by distance.
+# Prefixes matching more than SCAN_LIMIT keys are answered without walking
+# them all: popularity results are memoized per prefix until the next change,
+# and proximity results walk outwards from the point through the spatial index
+# when the matches are dense enough for that to stop early.
+#
+# Updated incrementally from the catalog change feed, like the other map caches.
+# Only businesses with coordinates are suggested, since picking one pans the map.
+
+import heapq
+import threading
+from bisect import bisect_left, insort
+from collections import Counter
+from typing import Dict, List, NamedTuple, Optional, Tuple
+
+from sqlalchemy import func
+from sqlalchemy.orm import Session
+
+from . import models
+from .distance import rank_by_distance
+from .models_user import CheckIn, Favorite, Review
+from .spatial_index import IndexedBusiness, SpatialIndex, business_index
+from .text_normalize import normalize
+
+SCAN_LIMIT = 500
+MAX_SUGGESTIONS = 20
+
+
+class Suggestion(NamedTuple):
+    id: int
+    name: str
+    lat: float
+    lng: float
+    popularity: int
+    distance_km: Optional[float] = None
+
+
+def _word_keys(name: str) -> List[str]:
+    words = normalize(name).split(" ")
+    return [" ".join(words[i:]) for i in range(len(words)) if words[i]]
+
+
+class SuggestIndex:
+    """Sorted (key, id) list with prefix search and per-id bookkeeping for updates."""
+
+    def __init__(self, spatial: SpatialIndex):
+        self._spatial = spatial
+        self._lock = threading.RLock()
+        self._keys: List[Tuple[str, int]] = []
+        self._entries: Dict[int, Suggestion] = {}
+        self._names: Dict[int, str] = {}  # id -> normalized name
+        self._popularity: Counter = Counter()
+        self._memo: Dict[Tuple[str, int], List[Suggestion]] = {}
+        self._loaded = False
+
+    def __len__(self) -> int:
+        return len(self._entries)
+
+    def ensure_loaded(self, db: Session) -> None:
+        """Build the key list from the database on first use."""
+        if self._loaded:
+            return
+        with self._lock:
+            if self._loaded:
+                return
+            popularity: Counter = Counter()
+            for model in (Favorite, CheckIn, Review):
+                for biz_id, n in db.query(model.business_id, func.count()).group_by(model.business_id):
+                    popularity[biz_id] += n
+            rows = (
+                db.query(models.Business.id, models.Business.name, models.Business.lat, models.Business.lng)
+                .filter(
+                    models.Business.is_approved.is_(True),
+                    models.Business.lat.isnot(None),
+                    models.Business.lng.isnot(None),
+                )
+                .all()
+            )
+            keys = []
+            for biz_id, name, lat, lng in rows:
+                self._entries[biz_id] = Suggestion(biz_id, name, float(lat), float(lng), popularity[biz_id])
+                self._names[biz_id] = normalize(name)
+                keys.extend((key, biz_id) for key in _word_keys(name))
+            keys.sort()
+            self._keys = keys
+            self._popularity = popularity
+            self._memo.clear()
+            self._loaded = True
+
+    def on_change(self, business_id: int, entry: Optional[IndexedBusiness]) -> None:
+        """Catalog change listener: re-key one business (or drop it)."""
+        if not self._loaded:
+            return
+        with self._lock:
+            self._remove(business_id)
+            if entry is not None:
+                suggestion = Suggestion(entry.id, entry.name, entry.lat, entry.lng, self._popularity[entry.id])
+                self._entries[entry.id] = suggestion
+                self._names[entry.id] = normalize(entry.name)
+                for key in _word_keys(entry.name):
+                    insort(self._keys, (key, entry.id))
+            self._memo.clear()
+
+    def _remove(self, business_id: int) -> None:
+        current = self._entries.pop(business_id, None)
+        if current is None:
+            return
+        del self._names[business_id]
+        for key in _word_keys(current.name):
+            pos = bisect_left(self._keys, (key, business_id))
+            if pos < len(self._keys) and self._keys[pos] == (key, business_id):
+                del self._keys[pos]
+
+    def _range(self, prefix: str) -> Tuple[int, int]:
+        lo = bisect_left(self._keys, (prefix,))
+        hi = bisect_left(self._keys, (prefix + "\U0010ffff",))
+        return lo, hi
+
+    def suggest(
+        self,
+        prefix: str,
+        limit: int = 8,
+        *,
+        lat: Optional[float] = None,
+        lng: Optional[float] = None,
+    ) -> List[Suggestion]:
+        """Up to ``limit`` businesses whose name has a word starting with ``prefix``.
+
+        Most popular first, or nearest first when a location is given.
+        """
+        prefix = normalize(prefix)
+        if not prefix or limit <= 0:
+            return []
+        near = lat is not None and lng is not None
+        with self._lock:
+            lo, hi = self._range(prefix)
+            matches = hi - lo
+            if matches > SCAN_LIMIT:
+                if near and self._spatial.enabled and self._spatial.loaded:
+                    # Neighbours to visit before ``limit`` matches turn up, with 2x slack.
+                    k = 2 * limit * len(self._entries) // matches + limit
+                    if k < matches // 4:
+                        return self._nearest_matching(prefix, limit, lat, lng, k)
+                elif not near:
+                    memo_key = (prefix, limit)
+                    found = self._memo.get(memo_key)
+                    if found is None:
+                        found = self._memo[memo_key] = self._rank(lo, hi, limit, None, None)
+                    return found
+            return self._rank(lo, hi, limit, lat, lng)
+
+    def _rank(self, lo: int, hi: int, limit: int, lat: Optional[float], lng: Optional[float]) -> List[Suggestion]:
+        entries = self._entries
+        matched = [entries[biz_id] for biz_id in {biz_id for _, biz_id in self._keys[lo:hi]}]
+        if lat is None or lng is None:
+            return heapq.nsmallest(limit, matched, key=lambda s: (-s.popularity, s.name, s.id))
+        ranked = rank_by_distance(lat, lng, [(s.id, s.lat, s.lng) for s in matched], k=limit)
+        return [entries[biz_id]._replace(distance_km=d) for d, biz_id in ranked]
+
+    def _nearest_matching(self, prefix: str, limit: int, lat: float, lng: float, k: int) -> List[Suggestion]:
+        """Walk outwards through the spatial index until ``limit`` matches are found."""
+        word_start = " " + prefix
+        while True:
+            hits = self._spatial.nearest(lat, lng, k)
+            found = []
+            for d, biz_id in hits:
+                name = self._names.get(biz_id)
+                if name is not None and (name.startswith(prefix) or word_start in name):
+                    found.append(self._entries[biz_id]._replace(distance_km=d))
+                    if len(found) >= limit:
+                        return found
+            if len(hits) < k:
+                return found
+            k *= 4
+
+
+suggest_index = SuggestIndex(business_index)
+business_index.add_listener(suggest_index.on_change)
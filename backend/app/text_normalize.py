@@ -0,0 +1,13 @@
+# backend/app/text_normalize.py
+# Text folding shared by name typeahead (suggest.py) and import duplicate
+# matching (dedupe.py). Both key on the same normalized words, so a change
+# here changes both; keep it independent of either one's ranking.
+
+import unicodedata
+
+
+def normalize(text: str) -> str:
+    """Casefolded, accent-free words separated by single spaces."""
+    decomposed = unicodedata.normalize("NFKD", text.casefold())
+    chars = [c if c.isalnum() else " " for c in decomposed if not unicodedata.combining(c)]
+    return " ".join("".join(chars).split())
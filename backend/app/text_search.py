@@ -0,0 +1,191 @@
+# backend/app/text_search.py
+# Dialect-aware full-text matching behind crud.search_businesses_text.
+#
+# - SQLite: an external-content FTS5 table (porter stemming) over name,
+#   description, city and address1, kept in sync by triggers on businesses and
+#   ranked with weighted bm25.
+# - PostgreSQL: a stored generated tsvector column (english config, weighted
+#   A/B/C) with a GIN index, queried through websearch_to_tsquery and ranked
+#   with ts_rank_cd.
+# - Anything else, or until install() has succeeded: ILIKE per term.
+#
+# User input is never passed to MATCH verbatim: words become quoted FTS5 strings
+# and "double-quoted text" stays a phrase, so queries cannot be malformed.
+
+import logging
+import re
+from typing import List, Optional, Tuple
+
+from sqlalchemy import and_, case, column, func, literal_column, or_, table, text
+from sqlalchemy.engine import Engine
+from sqlalchemy.exc import SQLAlchemyError
+from sqlalchemy.orm import Query
+
+from . import models
+from .database import engine
+
+logger = logging.getLogger(__name__)
+
+SEARCH_COLUMNS = ("name", "description", "city", "address1")
+_TERM = re.compile(r'"([^"]*)"|([^\s"]+)')
+_WORD = re.compile(r"\w")
+
+
+def parse_terms(text_query: str) -> List[str]:
+    """Words and "quoted phrases" from a search box, skipping pure punctuation."""
+    terms = []
+    for phrase, word in _TERM.findall(text_query):
+        term = (phrase or word).strip()
+        if _WORD.search(term):
+            terms.append(term)
+    return terms
+
+
+class LikeTextSearch:
+    """Portable fallback: every term must appear (case-insensitively) in some column."""
+
+    name = "like"
+
+    def install(self, bind: Engine) -> None:
+        """Nothing to create; ILIKE scans the table."""
+
+    def match(self, q: Query, text_query: str) -> Optional[Tuple[Query, object]]:
+        """Filter ``q`` to matching businesses and return it with a score expression (higher is better).
+
+        None when the query has no searchable terms.
+        """
+        terms = parse_terms(text_query)
+        if not terms:
+            return None
+        biz = models.Business
+        weights = ((biz.name, 4), (biz.city, 2), (biz.address1, 2), (biz.description, 1))
+        clauses = []
+        score = None
+        for term in terms:
+            like = f"%{term}%"
+            clauses.append(or_(*(col.ilike(like) for col, _ in weights)))
+            for col, weight in weights:
+                hit = case((col.ilike(like), weight), else_=0)
+                score = hit if score is None else score + hit
+        return q.filter(and_(*clauses)), score
+
+
+class SQLiteFTS5TextSearch(LikeTextSearch):
+    """FTS5 external-content index; bm25 weights favour name, then city/address, then description."""
+
+    name = "sqlite-fts5"
+    FTS = "businesses_fts"
+    BM25_WEIGHTS = (10.0, 1.0, 4.0, 3.0)  # same order as SEARCH_COLUMNS
+
+    _fts = table(FTS, column("rowid"))
+
+    def __init__(self) -> None:
+        self.fts5 = False
+
+    def install(self, bind: Engine) -> None:
+        try:
+            with bind.begin() as conn:
+                exists = conn.execute(
+                    text("SELECT 1 FROM sqlite_master WHERE type = 'table' AND name = :name"), {"name": self.FTS}
+                ).first()
+                for stmt in sqlite_fts5_ddl():
+                    conn.exec_driver_sql(stmt)
+                if not exists:
+                    conn.exec_driver_sql(SQLITE_FTS5_REBUILD)
+        except SQLAlchemyError as exc:
+            logger.warning("SQLite FTS5 unavailable (%s); business search falls back to ILIKE", exc)
+            return
+        self.fts5 = True
+
+    def match(self, q: Query, text_query: str) -> Optional[Tuple[Query, object]]:
+        if not self.fts5:
+            return super().match(q, text_query)
+        terms = parse_terms(text_query)
+        if not terms:
+            return None
+        # Quoted strings: words are stemmed by the tokenizer, multi-word strings are phrases.
+        fts_query = " ".join('"' + term.replace('"', '""') + '"' for term in terms)
+        fts = literal_column(self.FTS)
+        q = q.join(self._fts, self._fts.c.rowid == models.Business.id).filter(fts.op("MATCH")(fts_query))
+        return q, -func.bm25(fts, *self.BM25_WEIGHTS)
+
+
+class PostgresTextSearch(LikeTextSearch):
+    """Generated tsvector column with a GIN index."""
+
+    name = "postgres-tsvector"
+    CONFIG = "english"
+
+    def __init__(self) -> None:
+        self.tsvector = False
+
+    def install(self, bind: Engine) -> None:
+        try:
+            with bind.begin() as conn:
+                for stmt in POSTGRES_TSVECTOR_DDL:
+                    conn.exec_driver_sql(stmt)
+        except SQLAlchemyError as exc:
+            logger.warning("tsvector search unavailable (%s); business search falls back to ILIKE", exc)
+            return
+        self.tsvector = True
+
+    def match(self, q: Query, text_query: str) -> Optional[Tuple[Query, object]]:
+        if not self.tsvector:
+            return super().match(q, text_query)
+        if not parse_terms(text_query):
+            return None
+        # websearch_to_tsquery understands "phrases", OR and -exclusions and never raises on bad syntax.
+        tsquery = func.websearch_to_tsquery(self.CONFIG, text_query)
+        vector = literal_column("businesses.search_vector")
+        return q.filter(vector.op("@@")(tsquery)), func.ts_rank_cd(vector, tsquery)
+
+
+def sqlite_fts5_ddl() -> List[str]:
+    t = SQLiteFTS5TextSearch.FTS
+    cols = ", ".join(SEARCH_COLUMNS)
+    new = ", ".join(f"new.{c}" for c in SEARCH_COLUMNS)
+    old = ", ".join(f"old.{c}" for c in SEARCH_COLUMNS)
+    return [
+        f"""CREATE VIRTUAL TABLE IF NOT EXISTS {t} USING fts5(
+            {cols}, content='businesses', content_rowid='id', tokenize='porter unicode61'
+        )""",
+        f"""CREATE TRIGGER IF NOT EXISTS {t}_ai AFTER INSERT ON businesses
+            BEGIN
+                INSERT INTO {t}(rowid, {cols}) VALUES (new.id, {new});
+            END""",
+        f"""CREATE TRIGGER IF NOT EXISTS {t}_au AFTER UPDATE OF {cols} ON businesses
+            BEGIN
+                INSERT INTO {t}({t}, rowid, {cols}) VALUES ('delete', old.id, {old});
+                INSERT INTO {t}(rowid, {cols}) VALUES (new.id, {new});
+            END""",
+        f"""CREATE TRIGGER IF NOT EXISTS {t}_ad AFTER DELETE ON businesses
+            BEGIN
+                INSERT INTO {t}({t}, rowid, {cols}) VALUES ('delete', old.id, {old});
+            END""",
+    ]
+
+
+SQLITE_FTS5_REBUILD = f"INSERT INTO {SQLiteFTS5TextSearch.FTS}({SQLiteFTS5TextSearch.FTS}) VALUES ('rebuild')"
+
+POSTGRES_TSVECTOR_DDL = [
+    "ALTER TABLE businesses ADD COLUMN IF NOT EXISTS search_vector tsvector GENERATED ALWAYS AS ("
+    "setweight(to_tsvector('english', coalesce(name, '')), 'A') || "
+    "setweight(to_tsvector('english', coalesce(city, '')), 'B') || "
+    "setweight(to_tsvector('english', coalesce(address1, '')), 'B') || "
+    "setweight(to_tsvector('english', coalesce(description, '')), 'C')"
+    ") STORED",
+    "CREATE INDEX IF NOT EXISTS ix_businesses_search_vector ON businesses USING gin (search_vector)",
+]
+
+
+def text_search_for_engine(bind: Engine) -> LikeTextSearch:
+    """Pick the text search backend for an engine's dialect."""
+    dialect = bind.dialect.name
+    if dialect == "postgresql":
+        return PostgresTextSearch()
+    if dialect == "sqlite":
+        return SQLiteFTS5TextSearch()
+    return LikeTextSearch()
+
+
+text_search = text_search_for_engine(engine)
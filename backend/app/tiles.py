@@ -0,0 +1,130 @@
+# backend/app/tiles.py
+# Pre-rendered map pin tiles for /api/businesses/tiles/{z}/{x}/{y}.
+#
+# A tile is a compact JSON document holding only [id, lat, lng, name] rows for
+# the approved businesses inside a slippy-map tile. Rendered bodies are kept in
+# an LRU keyed by (z, x, y). On a catalog change only the tiles that held the
+# business (tracked per id) and the tiles under its new position are dropped,
+# so the rest of the map layer stays warm.
+
+import json
+import os
+import threading
+from collections import OrderedDict
+from typing import Dict, List, Optional, Set, Tuple
+
+from sqlalchemy.orm import Session
+
+from . import crud
+from .geo import tile_bbox, tile_for
+from .spatial_index import IndexedBusiness, business_index
+
+MAX_TILE_ZOOM = 22
+TILE_FEATURE_LIMIT = 5000
+TILE_CACHE_SIZE = int(os.getenv("TILE_CACHE_SIZE", "4096"))
+TILE_MAX_AGE = int(os.getenv("TILE_MAX_AGE", "60"))  # seconds browsers/CDN may reuse a tile
+
+TileKey = Tuple[int, int, int]
+
+
+class TileCache:
+    """LRU of rendered tile bodies with per-business invalidation."""
+
+    def __init__(self, max_tiles: int = TILE_CACHE_SIZE):
+        self.max_tiles = max_tiles
+        self._lock = threading.Lock()
+        self._tiles: "OrderedDict[TileKey, bytes]" = OrderedDict()
+        self._tile_members: Dict[TileKey, List[int]] = {}
+        self._business_tiles: Dict[int, Set[TileKey]] = {}
+        self._zooms: Dict[int, int] = {}  # zoom -> cached tile count
+        # Bumped by every invalidation; a tile rendered across one is not stored.
+        self.generation = 0
+
+    def get(self, key: TileKey) -> Optional[bytes]:
+        with self._lock:
+            body = self._tiles.get(key)
+            if body is not None:
+                self._tiles.move_to_end(key)
+            return body
+
+    def put(self, key: TileKey, body: bytes, member_ids: List[int], generation: int) -> None:
+        with self._lock:
+            if generation != self.generation:
+                return
+            self._drop(key)
+            self._tiles[key] = body
+            self._tile_members[key] = member_ids
+            self._zooms[key[0]] = self._zooms.get(key[0], 0) + 1
+            for biz_id in member_ids:
+                self._business_tiles.setdefault(biz_id, set()).add(key)
+            while len(self._tiles) > self.max_tiles:
+                self._drop(next(iter(self._tiles)))
+
+    def _drop(self, key: TileKey) -> None:
+        if self._tiles.pop(key, None) is None:
+            return
+        self._zooms[key[0]] -= 1
+        if not self._zooms[key[0]]:
+            del self._zooms[key[0]]
+        for biz_id in self._tile_members.pop(key, ()):
+            keys = self._business_tiles.get(biz_id)
+            if keys is not None:
+                keys.discard(key)
+                if not keys:
+                    del self._business_tiles[biz_id]
+
+    def invalidate(self, business_id: int, entry: Optional[IndexedBusiness]) -> None:
+        """Drop tiles that contained the business before and the ones it lands in now."""
+        with self._lock:
+            self.generation += 1
+            stale = set(self._business_tiles.get(business_id, ()))
+            if entry is not None:
+                for zoom in self._zooms:
+                    stale.add((zoom, *tile_for(entry.lat, entry.lng, zoom)))
+            for key in stale:
+                self._drop(key)
+
+    def clear(self) -> None:
+        with self._lock:
+            self.generation += 1
+            self._tiles.clear()
+            self._tile_members.clear()
+            self._business_tiles.clear()
+            self._zooms.clear()
+
+
+def _tile_rows(db: Session, zoom: int, x: int, y: int) -> List[Tuple[int, float, float, str]]:
+    bbox = tile_bbox(zoom, x, y)
+    if business_index.enabled:
+        business_index.ensure_loaded(db)
+        rows = [(e.id, e.lat, e.lng, e.name) for e in business_index.query_bbox(bbox)]
+    else:
+        rows = [
+            (b.id, float(b.lat), float(b.lng), b.name)
+            for b in crud.search_businesses(db, bbox=bbox, limit=TILE_FEATURE_LIMIT * 2)
+        ]
+    # Tile edges are shared; keep each point in exactly one tile.
+    return [r for r in rows if tile_for(r[1], r[2], zoom) == (x, y)]
+
+
+def render_tile(db: Session, zoom: int, x: int, y: int) -> bytes:
+    """Cached tile body: {"z","x","y","truncated","pins": [[id, lat, lng, name], ...]}"""
+    key = (zoom, x, y)
+    body = tile_cache.get(key)
+    if body is not None:
+        return body
+
+    generation = tile_cache.generation
+    rows = _tile_rows(db, zoom, x, y)
+    truncated = len(rows) > TILE_FEATURE_LIMIT
+    rows = rows[:TILE_FEATURE_LIMIT]
+    body = json.dumps(
+        {"z": zoom, "x": x, "y": y, "truncated": truncated, "pins": [list(r) for r in rows]},
+        separators=(",", ":"),
+    ).encode("utf-8")
+    tile_cache.put(key, body, [r[0] for r in rows], generation)
+    return body
+
+
+tile_cache = TileCache()
+business_index.add_listener(tile_cache.invalidate)
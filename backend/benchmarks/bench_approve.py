@@ -0,0 +1,169 @@
+"""
+Benchmark: per-item approval vs app.import_approval.approve_items().
+
+The per-item path is the original approve_all body: one Business added and
+flushed per READY item (an INSERT round trip each), items updated through the
+ORM, one commit at the end. The bulk path inserts each APPROVE_CHUNK_SIZE chunk
+with one INSERT ... RETURNING, back-fills the items with one executemany UPDATE
+and commits per chunk. Both run on the same freshly seeded batch of READY items
+and must produce the same businesses and item links. Reports wall time and
+the longest single transaction (how long businesses stays write-locked).
+
+Run from backend/ (uses a throwaway SQLite file):
+    python -m benchmarks.bench_approve
+"""
+
+import os
+import random
+import tempfile
+import time
+from datetime import datetime
+
+_DB_PATH = os.path.join(tempfile.mkdtemp(), "bench_approve.db")
+os.environ["DATABASE_URL_LOCAL"] = f"sqlite:///{_DB_PATH}"
+os.environ.setdefault("APP_ENV", "local")
+
+from sqlalchemy import event  # noqa: E402
+
+from app import models  # noqa: E402
+from app.catalog import bump_catalog_version  # noqa: E402
+from app.database import Base, SessionLocal, engine  # noqa: E402
+from app.import_approval import approve_items  # noqa: E402
+from app.models_user import User, UserRole  # noqa: E402
+
+SIZES = [10_000, 100_000]
+CENTER = (39.9526, -75.1652)
+
+
+def _seed(n: int) -> int:
+    Base.metadata.drop_all(bind=engine)
+    Base.metadata.create_all(bind=engine)
+    rng = random.Random(n)
+    with SessionLocal() as db:
+        db.add(User(id=1, email="bench@example.com", password_hash="x", role=UserRole.ADMIN))
+        batch = models.ImportBatch(created_by_id=1, total_rows=n)
+        db.add(batch)
+        db.commit()
+        batch_id = batch.id
+    items = [
+        {
+            "batch_id": batch_id,
+            "status": models.ImportItemStatus.READY.value,
+            "name": f"Business {i}",
+            "description": "Family-owned shop serving the neighbourhood since 1987.",
+            "phone_number": "215-555-0100",
+            "location": f"{i} Market St, Philadelphia, PA 19107",
+            "lat": CENTER[0] + rng.uniform(-0.5, 0.5),
+            "lng": CENTER[1] + rng.uniform(-0.5, 0.5),
+            "address1": f"{i} Market St",
+            "city": "Philadelphia",
+            "state": "PA",
+            "zip": "19107",
+        }
+        for i in range(n)
+    ]
+    with engine.begin() as conn:
+        conn.execute(models.ImportItem.__table__.insert(), items)
+    return batch_id
+
+
+def per_item_approve(batch_id: int) -> None:
+    with SessionLocal() as db:
+        items = (
+            db.query(models.ImportItem)
+            .filter(
+                models.ImportItem.batch_id == batch_id,
+                models.ImportItem.status == models.ImportItemStatus.READY.value,
+            )
+            .all()
+        )
+        for item in items:
+            business = models.Business(
+                name=item.name,
+                description=item.description,
+                phone_number=item.phone_number,
+                location=item.location,
+                lat=item.lat,
+                lng=item.lng,
+                hide_address=False,
+                address1=item.address1,
+                city=item.city,
+                state=item.state,
+                zip=item.zip,
+                is_approved=True,
+                approved_at=datetime.utcnow(),
+                approved_by_id=1,
+                created_by_id=1,
+            )
+            db.add(business)
+            db.flush()
+            item.status = models.ImportItemStatus.APPROVED.value
+            item.approved_business_id = business.id
+            item.error_message = None
+        if items:
+            bump_catalog_version(db)
+        db.commit()
+
+
+def bulk_approve(batch_id: int) -> None:
+    with SessionLocal() as db:
+        approve_items(db, batch_id, 1)
+
+
+class _TransactionClock:
+    """Longest time between BEGIN and COMMIT on the engine."""
+
+    def __init__(self):
+        self.longest = 0.0
+        self._began = None
+
+    def begin(self, conn):
+        self._began = time.perf_counter()
+
+    def commit(self, conn):
+        if self._began is not None:
+            self.longest = max(self.longest, time.perf_counter() - self._began)
+            self._began = None
+
+    def __enter__(self):
+        event.listen(engine, "begin", self.begin)
+        event.listen(engine, "commit", self.commit)
+        return self
+
+    def __exit__(self, *exc):
+        event.remove(engine, "begin", self.begin)
+        event.remove(engine, "commit", self.commit)
+
+
+def _outcome(batch_id: int) -> list:
+    with SessionLocal() as db:
+        return (
+            db.query(models.ImportItem.id, models.ImportItem.status, models.Business.name, models.Business.lat)
+            .join(models.Business, models.Business.id == models.ImportItem.approved_business_id)
+            .filter(models.ImportItem.batch_id == batch_id)
+            .order_by(models.ImportItem.id)
+            .all()
+        )
+
+
+def _run(fn, n: int):
+    batch_id = _seed(n)
+    with _TransactionClock() as clock:
+        start = time.perf_counter()
+        fn(batch_id)
+        elapsed = time.perf_counter() - start
+    return elapsed, clock.longest, _outcome(batch_id)
+
+
+def main() -> None:
+    print(f"{'items':>8} {'per-item s':>11} {'longest tx s':>13} {'bulk s':>8} {'longest tx s':>13} {'speedup':>8}")
+    for n in SIZES:
+        old_t, old_tx, old_outcome = _run(per_item_approve, n)
+        new_t, new_tx, new_outcome = _run(bulk_approve, n)
+        assert len(new_outcome) == n and new_outcome == old_outcome, "bulk approval linked items differently"
+        print(f"{n:>8} {old_t:>11.2f} {old_tx:>13.2f} {new_t:>8.2f} {new_tx:>13.3f} {old_t / new_t:>7.1f}x")
+    os.remove(_DB_PATH)
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,129 @@
+"""
+Benchmark: GET /api/imports/batches/{id} vs the paged and streamed item endpoints.
+
+The full path is get_batch, every item of the batch in one ImportBatchDetail
+body. The paged path fetches one /items page, unfiltered and filtered to a
+status deep in the batch (served from the (batch_id, status, id) index). Those
+requests go through the ASGI app in-process, so peak traced memory covers the
+server and the client together. The streamed path walks the /items.ndjson
+response body chunk by chunk, discarding each one; it is read straight off the
+StreamingResponse because TestClient buffers whole bodies, which would hide
+what the server holds. Reports wall time and peak traced memory.
+
+Run from backend/ (uses a throwaway SQLite file):
+    python -m benchmarks.bench_batch_items
+"""
+
+import asyncio
+import os
+import random
+import tempfile
+import time
+import tracemalloc
+from typing import Callable, Tuple
+
+_DB_PATH = os.path.join(tempfile.mkdtemp(), "bench_batch_items.db")
+os.environ["DATABASE_URL_LOCAL"] = f"sqlite:///{_DB_PATH}"
+os.environ.setdefault("APP_ENV", "local")
+
+from fastapi.testclient import TestClient  # noqa: E402
+
+from app import models  # noqa: E402
+from app.auth import get_current_user  # noqa: E402
+from app.database import Base, SessionLocal, engine  # noqa: E402
+from app.import_counts import reconcile_counts  # noqa: E402
+from app.main import app  # noqa: E402
+from app.models_user import User, UserRole  # noqa: E402
+from app.routers.imports import stream_batch_items  # noqa: E402
+
+SIZES = [10_000, 100_000]
+PAGE = 100
+# Rare enough that a scan in id order would have to read most of the batch to fill a page.
+RARE_STATUS = models.ImportItemStatus.NEEDS_FIX.value
+CENTER = (39.9526, -75.1652)
+
+
+def _seed(n: int) -> int:
+    Base.metadata.drop_all(bind=engine)
+    Base.metadata.create_all(bind=engine)
+    rng = random.Random(n)
+    with SessionLocal() as db:
+        db.add(User(id=1, email="bench@example.com", password_hash="x", role=UserRole.ADMIN))
+        batch = models.ImportBatch(created_by_id=1, total_rows=n)
+        db.add(batch)
+        db.commit()
+        batch_id = batch.id
+    items = [
+        {
+            "batch_id": batch_id,
+            "status": RARE_STATUS if rng.random() < 0.01 else models.ImportItemStatus.READY.value,
+            "name": f"Business {i}",
+            "description": "Family-owned shop serving the neighbourhood since 1987.",
+            "phone_number": "215-555-0100",
+            "location": f"{i} Market St, Philadelphia, PA 19107",
+            "lat": CENTER[0] + rng.uniform(-0.5, 0.5),
+            "lng": CENTER[1] + rng.uniform(-0.5, 0.5),
+            "address1": f"{i} Market St",
+            "city": "Philadelphia",
+            "state": "PA",
+            "zip": "19107",
+        }
+        for i in range(n)
+    ]
+    with engine.begin() as conn:
+        conn.execute(models.ImportItem.__table__.insert(), items)
+    with SessionLocal() as db:
+        reconcile_counts(db)
+        db.commit()
+    return batch_id
+
+
+def _measure(fn: Callable[[], int]) -> Tuple[float, float, int]:
+    tracemalloc.start()
+    start = time.perf_counter()
+    count = fn()
+    elapsed = time.perf_counter() - start
+    _, peak = tracemalloc.get_traced_memory()
+    tracemalloc.stop()
+    return elapsed, peak / 2**20, count
+
+
+def main() -> None:
+    app.dependency_overrides[get_current_user] = lambda: User(id=1, email="bench@example.com", role=UserRole.ADMIN)
+    client = TestClient(app)
+
+    def full(batch_id: int) -> int:
+        return len(client.get(f"/api/imports/batches/{batch_id}").json()["items"])
+
+    def page(batch_id: int, **params) -> int:
+        return len(client.get(f"/api/imports/batches/{batch_id}/items", params={"limit": PAGE, **params}).json()["items"])
+
+    def stream(batch_id: int) -> int:
+        async def walk() -> int:
+            with SessionLocal() as db:
+                response = stream_batch_items(batch_id, item_status=None, q=None, precision=None, _=None, db=db)
+            lines = 0
+            async for chunk in response.body_iterator:
+                lines += chunk.count("\n")
+            return lines
+
+        return asyncio.run(walk())
+
+    print(f"{'items':>8} {'path':<22} {'ms':>9} {'peak MiB':>9} {'items out':>10}")
+    for n in SIZES:
+        batch_id = _seed(n)
+        results = [
+            ("full detail", _measure(lambda: full(batch_id))),
+            ("one page", _measure(lambda: page(batch_id))),
+            (f"one page, {RARE_STATUS}", _measure(lambda: page(batch_id, status=RARE_STATUS))),
+            ("ndjson stream", _measure(lambda: stream(batch_id))),
+        ]
+        assert results[0][1][2] == results[3][1][2] == n, "stream and detail disagree on item count"
+        for label, (elapsed, peak, count) in results:
+            print(f"{n:>8} {label:<22} {elapsed * 1e3:>9.1f} {peak:>9.1f} {count:>10,}")
+    client.close()
+    os.remove(_DB_PATH)
+
+
+if __name__ == "__main__":
+    main()
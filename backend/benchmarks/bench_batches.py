@@ -0,0 +1,93 @@
+"""
+Benchmark: GET /api/imports/batches with item scans vs stored status counters.
+
+The scanning path is the original list_batches: for every batch, load all of
+its ImportItems through the ORM and count statuses in Python. The counter path
+is today's list_batches, one query over import_batches reading the per-status
+counters that import_counts.py keeps. Also times reconcile_counts(), the
+GROUP BY repair pass, over the same data. Both listings must agree.
+
+Run from backend/ (uses a throwaway SQLite file):
+    python -m benchmarks.bench_batches
+"""
+
+import os
+import random
+import tempfile
+import time
+from collections import Counter
+
+_DB_PATH = os.path.join(tempfile.mkdtemp(), "bench_batches.db")
+os.environ["DATABASE_URL_LOCAL"] = f"sqlite:///{_DB_PATH}"
+os.environ.setdefault("APP_ENV", "local")
+
+from app import models  # noqa: E402
+from app.database import Base, SessionLocal, engine  # noqa: E402
+from app.import_counts import reconcile_counts  # noqa: E402
+from app.models_user import User, UserRole  # noqa: E402
+from app.routers.imports import list_batches  # noqa: E402
+
+BATCHES = [50, 300]
+ITEMS_PER_BATCH = 1_000
+STATUSES = [status.value for status in models.ImportItemStatus]
+
+
+def _seed(batches: int) -> None:
+    Base.metadata.drop_all(bind=engine)
+    Base.metadata.create_all(bind=engine)
+    rng = random.Random(batches)
+    with SessionLocal() as db:
+        db.add(User(id=1, email="bench@example.com", password_hash="x", role=UserRole.ADMIN))
+        db.commit()
+    for _ in range(batches):
+        with engine.begin() as conn:
+            batch_id = conn.execute(
+                models.ImportBatch.__table__.insert().values(created_by_id=1, total_rows=ITEMS_PER_BATCH)
+            ).inserted_primary_key[0]
+            items = [
+                {"batch_id": batch_id, "status": rng.choice(STATUSES), "name": f"Business {i}", "city": "Philadelphia"}
+                for i in range(ITEMS_PER_BATCH)
+            ]
+            conn.execute(models.ImportItem.__table__.insert(), items)
+
+
+def scanning_list(db) -> list:
+    summaries = []
+    for batch in db.query(models.ImportBatch).order_by(models.ImportBatch.created_at.desc()).all():
+        items = db.query(models.ImportItem).filter(models.ImportItem.batch_id == batch.id).all()
+        counts = Counter(item.status for item in items)
+        summaries.append((batch.id, *(counts.get(status, 0) for status in STATUSES)))
+    return summaries
+
+
+def counter_list(db) -> list:
+    return [
+        (s.batch.id, s.ready, s.needs_geocode, s.needs_fix, s.duplicate_pending, s.approved, s.rejected, s.merged)
+        for s in list_batches(_=None, db=db)
+    ]
+
+
+def _timed(fn):
+    with SessionLocal() as db:
+        start = time.perf_counter()
+        result = fn(db)
+        return time.perf_counter() - start, result
+
+
+def main() -> None:
+    print(f"{'batches':>8} {'items':>9} {'scan s':>8} {'counters ms':>12} {'reconcile s':>12}")
+    for batches in BATCHES:
+        _seed(batches)
+        reconcile_t, _ = _timed(lambda db: (reconcile_counts(db), db.commit()))
+        scan_t, scanned = _timed(scanning_list)
+        counter_t, counted = _timed(counter_list)
+        assert scanned == counted, "stored counters disagree with the items"
+        print(
+            f"{batches:>8} {batches * ITEMS_PER_BATCH:>9,} {scan_t:>8.2f} {counter_t * 1e3:>12.1f}"
+            f" {reconcile_t:>12.2f}"
+        )
+    os.remove(_DB_PATH)
+
+
+if __name__ == "__main__":
+    main()
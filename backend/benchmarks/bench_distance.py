@@ -0,0 +1,71 @@
+"""
+Benchmark: scalar haversine loop vs the vectorized distance engine.
+
+Run from backend/:
+    python -m benchmarks.bench_distance
+"""
+
+import random
+import time
+from typing import Callable, List, Tuple
+
+import numpy as np
+
+from app.distance import CoordinateArrays, rank_arrays, rank_by_distance
+from app.geo import haversine_km
+
+SIZES = [1_000, 100_000, 1_000_000]
+CENTER = (39.9526, -75.1652)  # Philadelphia City Hall
+RADIUS_KM = 25.0
+TOP_K = 100
+
+
+def _points(n: int) -> List[Tuple[int, float, float]]:
+    rng = random.Random(n)
+    lat0, lng0 = CENTER
+    return [(i, lat0 + rng.uniform(-1, 1), lng0 + rng.uniform(-1, 1)) for i in range(n)]
+
+
+def scalar_loop(rows: List[Tuple[int, float, float]]) -> List[Tuple[float, int]]:
+    """What search_businesses did before: haversine per row, full sort, slice."""
+    lat0, lng0 = CENTER
+    enriched = []
+    for row_id, lat, lng in rows:
+        d = haversine_km(lat0, lng0, lat, lng)
+        if d <= RADIUS_KM:
+            enriched.append((d, row_id))
+    enriched.sort()
+    return enriched[:TOP_K]
+
+
+def _time(fn: Callable[[], object], repeat: int) -> float:
+    best = float("inf")
+    for _ in range(repeat):
+        start = time.perf_counter()
+        fn()
+        best = min(best, time.perf_counter() - start)
+    return best
+
+
+def main() -> None:
+    lat0, lng0 = CENTER
+    print(f"{'points':>10} {'scalar ms':>12} {'rows->numpy ms':>15} {'packed ms':>11} {'speedup':>8}")
+    for n in SIZES:
+        rows = _points(n)
+        coords = CoordinateArrays.from_rows(rows)
+        repeat = 5 if n <= 100_000 else 2
+
+        scalar = _time(lambda: scalar_loop(rows), repeat)
+        from_rows = _time(lambda: rank_by_distance(lat0, lng0, rows, radius_km=RADIUS_KM, k=TOP_K), repeat)
+        packed = _time(lambda: rank_arrays(lat0, lng0, coords, radius_km=RADIUS_KM, k=TOP_K), repeat)
+
+        expected = scalar_loop(rows)
+        got = rank_arrays(lat0, lng0, coords, radius_km=RADIUS_KM, k=TOP_K)
+        assert [i for _, i in got] == [i for _, i in expected]
+        assert np.allclose([d for d, _ in got], [d for d, _ in expected])
+
+        print(f"{n:>10} {scalar * 1e3:>12.2f} {from_rows * 1e3:>15.2f} {packed * 1e3:>11.2f} {scalar / packed:>7.1f}x")
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,118 @@
+"""
+Benchmark: the offline ZIP gazetteer vs online geocoding.
+
+Writes a synthetic national ZIP-centroid table in the Census ZCTA gazetteer
+layout (about as many ZIPs as the real file), then reports what
+ZipGazetteer costs: compiling it to the sorted .npy, the compiled size,
+mapping it, and one lookup. Then geocodes the same batch of addresses,
+every fifth at a street the online geocoder does not know, through
+geocode_many() with the providers arranged by GEOCODE_GAZETTEER_ORDER: online
+only, gazetteer last, first and only. The online providers are
+benchmarks/fake_geocoder.py at a fixed latency under their default rate
+limits. The geocode cache is emptied before each run. Reports wall time,
+geocoder requests and how many addresses were placed, exactly or at a ZIP
+centroid.
+
+Run from backend/ (uses throwaway files):
+    python -m benchmarks.bench_gazetteer
+"""
+
+import os
+import random
+import tempfile
+import time
+from collections import Counter
+
+_DIR = tempfile.mkdtemp()
+_DB_PATH = os.path.join(_DIR, "bench_gazetteer.db")
+os.environ["DATABASE_URL_LOCAL"] = f"sqlite:///{_DB_PATH}"
+os.environ.setdefault("APP_ENV", "local")
+os.environ["MAPBOX_TOKEN"] = "fake"
+
+from app import geocode, models  # noqa: E402
+from app.database import engine  # noqa: E402
+from app.geocode import ZipGazetteer, compile_gazetteer, coords_precision, geocode_cache, geocode_many  # noqa: E402
+from benchmarks.fake_geocoder import FakeGeocoder  # noqa: E402
+
+ZIPS = 33_000  # ZCTAs in the 2020 Census gazetteer
+ADDRESSES = 100
+LATENCY = 0.1  # seconds per online request
+LOOKUPS = 200_000
+
+
+def _write_source(path: str) -> list:
+    rng = random.Random(0)
+    zips = sorted(rng.sample(range(501, 99_951), ZIPS))
+    with open(path, "w") as f:
+        f.write("GEOID\tALAND\tAWATER\tALAND_SQMI\tAWATER_SQMI\tINTPTLAT\tINTPTLONG\n")
+        for zip_code in zips:
+            f.write(f"{zip_code:05d}\t1\t0\t1\t0\t{rng.uniform(25, 49):.6f}\t{rng.uniform(-124, -67):.6f}\n")
+    return zips
+
+
+def _addresses(zips: list) -> list:
+    rng = random.Random(1)
+    return [
+        (f"{i} {'Nowhere' if i % 5 == 4 else 'Market'} St", "Springfield", "PA", f"{rng.choice(zips):05d}")
+        for i in range(ADDRESSES)
+    ]
+
+
+def _geocode(fake: FakeGeocoder, providers: list, addresses: list) -> tuple:
+    geocode.PROVIDERS[:] = providers
+    geocode_cache.clear()
+    with engine.begin() as conn:
+        conn.execute(models.GeocodeCacheEntry.__table__.delete())
+    fake.requests.clear()
+    start = time.perf_counter()
+    results = geocode_many(addresses)
+    elapsed = time.perf_counter() - start
+    time.sleep(1.0)  # let the rate limiters' schedules drain between runs
+    return elapsed, sum(fake.requests.values()), Counter(coords_precision(c) for c in results)
+
+
+def main() -> None:
+    source = os.path.join(_DIR, "zcta.txt")
+    zips = _write_source(source)
+
+    start = time.perf_counter()
+    compile_gazetteer(source, source + ".npy")
+    compile_t = time.perf_counter() - start
+    gazetteer = ZipGazetteer(source + ".npy")
+    start = time.perf_counter()
+    gazetteer.centroid(zips[0])
+    open_t = time.perf_counter() - start
+    queries = [f"1 Market St, Springfield, PA, {zip_code:05d}" for zip_code in random.Random(2).choices(zips, k=1000)]
+    start = time.perf_counter()
+    for i in range(LOOKUPS):
+        gazetteer.lookup(queries[i % 1000], 0.0)
+    lookup_t = (time.perf_counter() - start) / LOOKUPS
+    print(
+        f"gazetteer: {ZIPS:,} ZIPs, compile {compile_t * 1e3:.0f} ms, {os.path.getsize(source + '.npy') / 1024:.0f} KiB,"
+        f" open {open_t * 1e3:.2f} ms, lookup {lookup_t * 1e6:.1f} us"
+    )
+
+    models.GeocodeCacheEntry.__table__.create(bind=engine)
+    network = [p for p in geocode.PROVIDERS if not p.local]
+    addresses = _addresses(zips)
+    with FakeGeocoder(latency=LATENCY) as fake:
+        os.environ["MAPBOX_GEOCODE_URL"] = fake.mapbox_url
+        os.environ["NOMINATIM_URL"] = fake.nominatim_url
+        print(f"{'providers':<16} {'addresses':>9} {'s':>7} {'requests':>9} {'exact':>6} {'zip':>5} {'none':>5}")
+        for label, providers in [
+            ("online only", network),
+            ("gazetteer last", [*network, gazetteer]),
+            ("gazetteer first", [gazetteer, *network]),
+            ("gazetteer only", [gazetteer]),
+        ]:
+            elapsed, requests, placed = _geocode(fake, providers, addresses)
+            print(
+                f"{label:<16} {len(addresses):>9} {elapsed:>7.2f} {requests:>9}"
+                f" {placed[models.GeocodePrecision.ADDRESS.value]:>6} {placed[models.GeocodePrecision.ZIP.value]:>5}"
+                f" {placed[None]:>5}"
+            )
+    os.remove(_DB_PATH)
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,102 @@
+"""
+Benchmark: serial geocode_address() calls vs geocode_many().
+
+Both run against benchmarks/fake_geocoder.py with a fixed per-request latency,
+so numbers show how much concurrency buys under each provider's rate limit:
+Mapbox (10 req/s by default) is latency-bound when called serially, Nominatim
+(1 req/s) is rate-bound either way. Also checks that results come back in input
+order, and reports the shortest gap the fake server saw between two requests
+to the provider (at least 1/limit, give or take network jitter). The geocode
+cache is emptied before each timed run; a last run with only the
+geocode_cache table warm must make no requests at all.
+
+Run from backend/ (uses a throwaway SQLite file for the cache table):
+    python -m benchmarks.bench_geocode
+"""
+
+import os
+import tempfile
+import time
+
+_DB_PATH = os.path.join(tempfile.mkdtemp(), "bench_geocode.db")
+os.environ["DATABASE_URL_LOCAL"] = f"sqlite:///{_DB_PATH}"
+os.environ.setdefault("APP_ENV", "local")
+
+from app import models, models_user  # noqa: E402,F401  (models_user registers User)
+from app.database import Base, engine  # noqa: E402
+from app.geocode import _build_query, geocode_address, geocode_cache, geocode_many  # noqa: E402
+from benchmarks.fake_geocoder import FakeGeocoder, fake_coords  # noqa: E402
+
+LATENCY = 0.3  # seconds, roughly a hosted geocoder's round trip
+MAPBOX_ROWS = 60
+NOMINATIM_ROWS = 8
+
+
+def _addresses(n: int):
+    # Every 10th address is unknown to the geocoder; every 15th repeats an earlier one.
+    rows = []
+    for i in range(n):
+        j = i - 1 if i % 15 == 14 else i
+        street = "1 Nowhere Rd" if j % 10 == 9 else f"{j} Market St"
+        rows.append((street, "Philadelphia", "PA", "19107"))
+    return rows
+
+
+def _forget() -> None:
+    geocode_cache.clear()
+    with engine.begin() as conn:
+        conn.execute(models.GeocodeCacheEntry.__table__.delete())
+
+
+def _run(label: str, fake: FakeGeocoder, provider: str, n: int) -> None:
+    addresses = _addresses(n)
+    expected = [fake_coords(_build_query(*a)) for a in addresses]
+
+    _forget()
+    fake.times.clear()
+    start = time.perf_counter()
+    serial = [geocode_address(*a) for a in addresses]
+    serial_t = time.perf_counter() - start
+    serial_gap = fake.min_interval(provider)
+
+    time.sleep(1.0)  # let the rate limiter's schedule drain between runs
+    _forget()
+    fake.times.clear()
+    start = time.perf_counter()
+    batch = geocode_many(addresses)
+    batch_t = time.perf_counter() - start
+    batch_gap = fake.min_interval(provider)
+
+    # Same addresses again with only the geocode_cache table warm: no requests at all.
+    geocode_cache.clear()
+    fake.times.clear()
+    start = time.perf_counter()
+    again = geocode_many(addresses)
+    cached_t = time.perf_counter() - start
+    assert again == batch and not fake.times, "cached run went to the network"
+
+    assert serial == batch, "geocode_many changed results or their order"
+    if provider == "nominatim" or "MAPBOX_TOKEN" not in os.environ:
+        # Misses fall through from Mapbox to Nominatim, so only an all-Nominatim run compares exactly.
+        assert batch == expected
+    print(
+        f"{label:<10} {n:>5} {serial_t:>9.1f} {batch_t:>9.1f} {serial_t / batch_t:>8.1f}x"
+        f" {serial_gap * 1e3:>13.0f} {batch_gap * 1e3:>12.0f} {cached_t * 1e3:>10.1f}"
+    )
+
+
+def main() -> None:
+    Base.metadata.create_all(bind=engine)
+    with FakeGeocoder(latency=LATENCY) as fake:
+        os.environ["MAPBOX_GEOCODE_URL"] = fake.mapbox_url
+        os.environ["NOMINATIM_URL"] = fake.nominatim_url
+        print(f"{'provider':<10} {'rows':>5} {'serial s':>9} {'batch s':>9} {'speedup':>9} {'serial gap ms':>13} {'batch gap ms':>12} {'cached ms':>10}")
+        os.environ["MAPBOX_TOKEN"] = "fake"
+        _run("mapbox", fake, "mapbox", MAPBOX_ROWS)
+        del os.environ["MAPBOX_TOKEN"]
+        _run("nominatim", fake, "nominatim", NOMINATIM_ROWS)
+    os.remove(_DB_PATH)
+
+
+if __name__ == "__main__":
+    main()
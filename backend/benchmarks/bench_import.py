@@ -0,0 +1,220 @@
+"""
+Benchmark: read-all CSV import vs the streaming importer.
+
+The read-all path is the original POST /api/imports/batches body: read the
+upload into bytes, decode it to one string, run one ILIKE duplicate query per
+row, build every ImportItem in a list and add_all at the end. The streaming path
+is app.importer: decode from the file, parse row by row, match each
+IMPORT_CHUNK_SIZE chunk against existing businesses with one indexed query and
+insert it. The catalog is seeded with EXISTING businesses, some of which the
+file repeats; rows carry coordinates so neither path geocodes. Reports wall
+time and peak traced memory; the streaming peak should stay flat as the file
+grows.
+
+Run from backend/ (uses a throwaway SQLite file):
+    python -m benchmarks.bench_import
+"""
+
+import csv
+import io
+import os
+import random
+import tempfile
+import time
+import tracemalloc
+from typing import Callable, Tuple
+
+_DIR = tempfile.mkdtemp()
+_DB_PATH = os.path.join(_DIR, "bench_import.db")
+os.environ["DATABASE_URL_LOCAL"] = f"sqlite:///{_DB_PATH}"
+os.environ.setdefault("APP_ENV", "local")
+
+from app import models  # noqa: E402
+from app.models_user import User, UserRole  # noqa: E402
+from app.database import Base, SessionLocal, engine  # noqa: E402
+from app.importer import (  # noqa: E402
+    REQUIRED_COLUMNS,
+    build_location,
+    compute_status,
+    dedupe_key,
+    ingest_rows,
+    normalize_text,
+    open_csv,
+    safe_float,
+)
+
+SIZES = [5_000, 20_000, 50_000]
+EXISTING = 5_000  # businesses already in the catalog; every 20th row of the file matches one
+CENTER = (39.9526, -75.1652)
+
+
+def _write_csv(n: int) -> str:
+    path = os.path.join(_DIR, f"import_{n}.csv")
+    rng = random.Random(n)
+    lat0, lng0 = CENTER
+    with open(path, "w", newline="", encoding="utf-8") as f:
+        writer = csv.writer(f)
+        writer.writerow(REQUIRED_COLUMNS)
+        for i in range(n):
+            # Every 50th row repeats an earlier one, to exercise in-batch duplicates.
+            j = i - 1 if i % 50 == 49 else i
+            writer.writerow(
+                [
+                    f"Business {j}",
+                    "Family-owned shop serving the neighbourhood since 1987.",
+                    "215-555-0100",
+                    "",
+                    f"{lat0 + rng.uniform(-0.5, 0.5):.6f}",
+                    f"{lng0 + rng.uniform(-0.5, 0.5):.6f}",
+                    f"{j} Market St",
+                    "Philadelphia",
+                    "PA",
+                    "19107",
+                ]
+            )
+    return path
+
+
+def _ilike_duplicate(db, *, name, address1, city, state, zip_code):
+    query = db.query(models.Business).filter(models.Business.name.ilike(name))
+    if address1:
+        query = query.filter(models.Business.address1.ilike(address1))
+    if city:
+        query = query.filter(models.Business.city.ilike(city))
+    if state:
+        query = query.filter(models.Business.state.ilike(state))
+    if zip_code:
+        query = query.filter(models.Business.zip.ilike(zip_code))
+    return query.first()
+
+
+def _new_batch(db) -> models.ImportBatch:
+    batch = models.ImportBatch(created_by_id=1, total_rows=0)
+    db.add(batch)
+    db.flush()
+    return batch
+
+
+def read_all_import(path: str) -> int:
+    with SessionLocal() as db, open(path, "rb") as upload:
+        reader = csv.DictReader(io.StringIO(upload.read().decode("utf-8")))
+        batch = _new_batch(db)
+        seen = set()
+        items = []
+        for row in reader:
+            name = normalize_text(row.get("name"))
+            if not name:
+                continue
+            address1 = normalize_text(row.get("address1"))
+            city = normalize_text(row.get("city"))
+            state = normalize_text(row.get("state"))
+            zip_code = normalize_text(row.get("zip"))
+            lat = safe_float(row.get("lat"))
+            lng = safe_float(row.get("lng"))
+            dup = _ilike_duplicate(db, name=name, address1=address1, city=city, state=state, zip_code=zip_code)
+            key = dedupe_key(name, address1, city, state, zip_code)
+            if key in seen:
+                status, error = models.ImportItemStatus.DUPLICATE_PENDING.value, "Duplicate in batch."
+            else:
+                seen.add(key)
+                status = compute_status(
+                    duplicate_of_business_id=dup.id if dup else None, lat=lat, lng=lng, error_message=None
+                )
+                error = None
+            items.append(
+                models.ImportItem(
+                    batch_id=batch.id,
+                    status=status,
+                    error_message=error,
+                    name=name,
+                    description=normalize_text(row.get("description")),
+                    phone_number=normalize_text(row.get("phone_number")),
+                    location=normalize_text(row.get("location")) or build_location(address1, city, state, zip_code),
+                    lat=lat,
+                    lng=lng,
+                    address1=address1,
+                    city=city,
+                    state=state,
+                    zip=zip_code,
+                    duplicate_of_business_id=dup.id if dup else None,
+                )
+            )
+        db.add_all(items)
+        db.commit()
+        return len(items)
+
+
+def streaming_import(path: str) -> int:
+    with SessionLocal() as db, open(path, "rb") as upload:
+        reader = open_csv(upload)
+        batch = _new_batch(db)
+        written = ingest_rows(db, batch, reader)
+        db.commit()
+        return written
+
+
+def _reset() -> None:
+    Base.metadata.drop_all(bind=engine)
+    Base.metadata.create_all(bind=engine)
+    with SessionLocal() as db:
+        db.add(User(id=1, email="bench@example.com", password_hash="x", role=UserRole.ADMIN))
+        db.commit()
+    rows = [
+        {
+            "name": f"BUSINESS {i * 20 if i % 2 else i * 20 + 1_000_000}",
+            "address1": f"{i * 20} Market St",
+            "city": "Philadelphia",
+            "state": "PA",
+            "zip": "19107",
+            "lat": CENTER[0],
+            "lng": CENTER[1],
+            "hide_address": False,
+            "is_approved": True,
+        }
+        for i in range(EXISTING)
+    ]
+    with engine.begin() as conn:
+        conn.execute(models.Business.__table__.insert(), rows)
+
+
+def _measure(fn: Callable[[], int]) -> Tuple[float, float, int]:
+    _reset()
+    start = time.perf_counter()
+    fn()
+    elapsed = time.perf_counter() - start
+    _reset()
+    tracemalloc.start()
+    rows = fn()
+    _, peak = tracemalloc.get_traced_memory()
+    tracemalloc.stop()
+    return elapsed, peak / 2**20, rows
+
+
+def _outcome() -> list:
+    with SessionLocal() as db:
+        return (
+            db.query(models.ImportItem.name, models.ImportItem.status, models.ImportItem.duplicate_of_business_id)
+            .order_by(models.ImportItem.id)
+            .all()
+        )
+
+
+def main() -> None:
+    print(f"{'rows':>8} {'file MiB':>9} {'read-all s':>11} {'read-all MiB':>13} {'stream s':>9} {'stream MiB':>11}")
+    for n in SIZES:
+        path = _write_csv(n)
+        old_t, old_mem, old_rows = _measure(lambda: read_all_import(path))
+        old_outcome = _outcome()
+        new_t, new_mem, new_rows = _measure(lambda: streaming_import(path))
+        assert new_rows == old_rows == n, (old_rows, new_rows)
+        assert _outcome() == old_outcome, "streaming import classified rows differently"
+        print(
+            f"{n:>8} {os.path.getsize(path) / 2**20:>9.1f} {old_t:>11.2f} {old_mem:>13.1f}"
+            f" {new_t:>9.2f} {new_mem:>11.1f}"
+        )
+        os.remove(path)
+    os.remove(_DB_PATH)
+
+
+if __name__ == "__main__":
+    main()
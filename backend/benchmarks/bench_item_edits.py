@@ -0,0 +1,138 @@
+"""
+Benchmark: one PATCH /api/imports/items/{id} per row vs PATCH /batches/{id}/items.
+
+Fixes a batch of NEEDS_FIX items (no coordinates) by giving each one lat/lng,
+against a catalog of existing businesses some of the items duplicate. The
+per-row path calls update_item once per item, as the admin page used to: a
+duplicate lookup and a commit each. The bulk path sends every edit to
+update_batch_items, which applies them with one match_duplicates pass and one
+commit. Both must leave the items with the same statuses and duplicate links.
+Reports wall time, SQL statements and commits.
+
+Run from backend/ (uses a throwaway SQLite file):
+    python -m benchmarks.bench_item_edits
+"""
+
+import os
+import random
+import tempfile
+import time
+
+_DB_PATH = os.path.join(tempfile.mkdtemp(), "bench_item_edits.db")
+os.environ["DATABASE_URL_LOCAL"] = f"sqlite:///{_DB_PATH}"
+os.environ.setdefault("APP_ENV", "local")
+
+from sqlalchemy import event  # noqa: E402
+
+from app import models, schemas  # noqa: E402
+from app.database import Base, SessionLocal, engine  # noqa: E402
+from app.import_counts import reconcile_counts  # noqa: E402
+from app.models_user import User, UserRole  # noqa: E402
+from app.routers.imports import update_batch_items, update_item  # noqa: E402
+
+SIZES = [100, 1_000, 5_000]
+EXISTING = 20_000
+CENTER = (39.9526, -75.1652)
+
+
+def _coords(rng: random.Random) -> tuple:
+    return CENTER[0] + rng.uniform(-0.5, 0.5), CENTER[1] + rng.uniform(-0.5, 0.5)
+
+
+def _seed(n: int) -> tuple:
+    """A batch of n coordinate-less items; every fifth repeats an existing business."""
+    Base.metadata.drop_all(bind=engine)
+    Base.metadata.create_all(bind=engine)
+    rng = random.Random(n)
+    businesses = [
+        {"name": f"Existing {i}", "address1": f"{i} Walnut St", "city": "Philadelphia", "state": "PA",
+         "zip": "19103", "lat": lat, "lng": lng, "hide_address": False, "is_approved": True}
+        for i, (lat, lng) in ((i, _coords(rng)) for i in range(EXISTING))
+    ]
+    with SessionLocal() as db:
+        db.add(User(id=1, email="bench@example.com", password_hash="x", role=UserRole.ADMIN))
+        batch = models.ImportBatch(created_by_id=1, total_rows=n)
+        db.add(batch)
+        db.commit()
+        batch_id = batch.id
+    items, fixes = [], []
+    for i in range(n):
+        if i % 5 == 0:
+            existing = businesses[rng.randrange(EXISTING)]
+            name, address1, coords = existing["name"], existing["address1"], (existing["lat"], existing["lng"])
+        else:
+            name, address1, coords = f"Business {i}", f"{i} Market St", _coords(rng)
+        items.append({
+            "batch_id": batch_id, "status": models.ImportItemStatus.NEEDS_FIX.value,
+            "error_message": "Missing or invalid coordinates.", "name": name, "address1": address1,
+            "city": "Philadelphia", "state": "PA", "zip": "19103",
+        })
+        fixes.append(coords)
+    with engine.begin() as conn:
+        conn.execute(models.Business.__table__.insert(), businesses)
+        conn.execute(models.ImportItem.__table__.insert(), items)
+    with SessionLocal() as db:
+        reconcile_counts(db)
+        db.commit()
+        ids = [item_id for (item_id,) in db.query(models.ImportItem.id).order_by(models.ImportItem.id)]
+    return batch_id, [{"id": item_id, "lat": lat, "lng": lng} for item_id, (lat, lng) in zip(ids, fixes)]
+
+
+def per_row(batch_id: int, edits: list) -> None:
+    with SessionLocal() as db:
+        for edit in edits:
+            update_item(edit["id"], schemas.ImportItemUpdate(lat=edit["lat"], lng=edit["lng"]), _=None, db=db)
+
+
+def bulk(batch_id: int, edits: list) -> None:
+    with SessionLocal() as db:
+        update_batch_items(batch_id, [schemas.ImportItemBulkUpdate(**edit) for edit in edits], _=None, db=db)
+
+
+def _outcome(batch_id: int) -> list:
+    with SessionLocal() as db:
+        return (
+            db.query(models.ImportItem.id, models.ImportItem.status, models.ImportItem.duplicate_of_business_id)
+            .filter(models.ImportItem.batch_id == batch_id)
+            .order_by(models.ImportItem.id)
+            .all()
+        )
+
+
+def _run(fn, n: int):
+    batch_id, edits = _seed(n)
+    counts = {"statements": 0, "commits": 0}
+
+    def statement(*args):
+        counts["statements"] += 1
+
+    def commit(conn):
+        counts["commits"] += 1
+
+    event.listen(engine, "before_cursor_execute", statement)
+    event.listen(engine, "commit", commit)
+    try:
+        start = time.perf_counter()
+        fn(batch_id, edits)
+        elapsed = time.perf_counter() - start
+    finally:
+        event.remove(engine, "before_cursor_execute", statement)
+        event.remove(engine, "commit", commit)
+    return elapsed, counts, _outcome(batch_id)
+
+
+def main() -> None:
+    print(f"{'edits':>6} {'per-row s':>10} {'stmts':>7} {'commits':>8} {'bulk s':>8} {'stmts':>6} {'commits':>8} {'speedup':>8}")
+    for n in SIZES:
+        old_t, old_counts, old_outcome = _run(per_row, n)
+        new_t, new_counts, new_outcome = _run(bulk, n)
+        assert new_outcome == old_outcome, "bulk edit resolved items differently"
+        print(
+            f"{n:>6} {old_t:>10.2f} {old_counts['statements']:>7} {old_counts['commits']:>8}"
+            f" {new_t:>8.2f} {new_counts['statements']:>6} {new_counts['commits']:>8} {old_t / new_t:>7.1f}x"
+        )
+    os.remove(_DB_PATH)
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,105 @@
+"""
+Benchmark: full ORM listing vs the ?fields=pin projection.
+
+Both paths produce the JSON body for one /api/businesses page. The ORM path
+hydrates Business objects, validates them into SmallBusiness and encodes the
+result the way FastAPI does; the projection path selects four columns with
+Core and dumps the tuples. Reports best wall time and peak traced memory.
+
+Run from backend/ (uses a throwaway SQLite file):
+    python -m benchmarks.bench_projection
+"""
+
+import json
+import os
+import random
+import tempfile
+import time
+import tracemalloc
+from typing import Callable, Tuple
+
+_DB_PATH = os.path.join(tempfile.mkdtemp(), "bench_projection.db")
+os.environ["DATABASE_URL_LOCAL"] = f"sqlite:///{_DB_PATH}"
+os.environ.setdefault("APP_ENV", "local")
+
+from fastapi.encoders import jsonable_encoder  # noqa: E402
+
+from app import crud, models, models_user, schemas  # noqa: E402,F401  (models_user registers User)
+from app.database import Base, SessionLocal, engine  # noqa: E402
+from app.projections import PIN_FIELDS, columns_for, render_rows  # noqa: E402
+
+SIZES = [1_000, 10_000, 50_000]
+CENTER = (39.9526, -75.1652)
+
+
+def _seed(n: int) -> None:
+    Base.metadata.drop_all(bind=engine)
+    Base.metadata.create_all(bind=engine)
+    rng = random.Random(n)
+    lat0, lng0 = CENTER
+    rows = [
+        {
+            "name": f"Business {i}",
+            "description": "Family-owned shop serving the neighbourhood since 1987. " * 3,
+            "phone_number": "215-555-0100",
+            "address1": f"{i} Market St",
+            "city": "Philadelphia",
+            "state": "PA",
+            "zip": "19107",
+            "lat": lat0 + rng.uniform(-0.5, 0.5),
+            "lng": lng0 + rng.uniform(-0.5, 0.5),
+            "hide_address": False,
+            "is_approved": True,
+        }
+        for i in range(n)
+    ]
+    with engine.begin() as conn:
+        conn.execute(models.Business.__table__.insert(), rows)
+
+
+def orm_listing(n: int) -> bytes:
+    with SessionLocal() as db:
+        items = crud.search_businesses(db, limit=n)
+        payload = [schemas.SmallBusiness.model_validate(b) for b in items]
+        return json.dumps(jsonable_encoder(payload)).encode("utf-8")
+
+
+def pin_listing(n: int) -> bytes:
+    with SessionLocal() as db:
+        rows = crud.search_business_rows(db, columns_for(PIN_FIELDS), limit=n)
+        return render_rows(PIN_FIELDS, rows)
+
+
+def _measure(fn: Callable[[], bytes], repeat: int) -> Tuple[float, float, int]:
+    best = float("inf")
+    for _ in range(repeat):
+        start = time.perf_counter()
+        fn()
+        best = min(best, time.perf_counter() - start)
+    tracemalloc.start()
+    body = fn()
+    _, peak = tracemalloc.get_traced_memory()
+    tracemalloc.stop()
+    return best, peak / 2**20, len(body)
+
+
+def main() -> None:
+    print(f"{'rows':>8} {'orm ms':>9} {'orm MiB':>8} {'pin ms':>8} {'pin MiB':>8} {'body KiB orm/pin':>17} {'speedup':>8}")
+    for n in SIZES:
+        _seed(n)
+        repeat = 5 if n <= 10_000 else 3
+        orm_t, orm_mem, orm_len = _measure(lambda: orm_listing(n), repeat)
+        pin_t, pin_mem, pin_len = _measure(lambda: pin_listing(n), repeat)
+
+        full = json.loads(orm_listing(n))
+        assert json.loads(pin_listing(n)) == [{k: b[k] for k in PIN_FIELDS} for b in full]
+
+        print(
+            f"{n:>8} {orm_t * 1e3:>9.1f} {orm_mem:>8.1f} {pin_t * 1e3:>8.1f} {pin_mem:>8.1f}"
+            f" {orm_len / 1024:>8.0f}/{pin_len / 1024:<8.0f} {orm_t / pin_t:>7.1f}x"
+        )
+    os.remove(_DB_PATH)
+
+
+if __name__ == "__main__":
+    main()
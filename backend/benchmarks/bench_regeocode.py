@@ -0,0 +1,137 @@
+"""
+Benchmark: one POST /api/imports/items/{id}/regeocode per item vs the batch job.
+
+Seeds a batch of NEEDS_GEOCODE items, many sharing an address and a few at
+addresses the geocoder does not know, against benchmarks/fake_geocoder.py
+with a fixed latency and both providers rate limited. The per-item path calls
+regeocode_item once per item, as an admin clicking through the rows would: one
+serial lookup (repeats answered from the geocode cache), duplicate match and
+commit each. The batch path runs app.import_regeocode.regeocode_batch, the
+body of POST /batches/{id}/regeocode: distinct addresses geocoded
+concurrently, written back a chunk at a time. The geocode cache is emptied
+before each run and both must leave the items with the same coordinates and
+statuses. Reports wall time, geocoder requests and commits (the geocode
+cache's write-through of each answer included). The batch path is bound by
+the rate limits: requests / 50 seconds.
+
+Run from backend/ (uses a throwaway SQLite file):
+    python -m benchmarks.bench_regeocode
+"""
+
+import os
+import tempfile
+import time
+
+_DB_PATH = os.path.join(tempfile.mkdtemp(), "bench_regeocode.db")
+os.environ["DATABASE_URL_LOCAL"] = f"sqlite:///{_DB_PATH}"
+os.environ.setdefault("APP_ENV", "local")
+os.environ["MAPBOX_TOKEN"] = "fake"
+# Read when app.geocode is imported; a hosted plan's limits, not Nominatim's public 1 req/s.
+os.environ["MAPBOX_RATE_LIMIT"] = "50"
+os.environ["NOMINATIM_RATE_LIMIT"] = "50"
+
+from sqlalchemy import event  # noqa: E402
+
+from app import models  # noqa: E402
+from app.database import Base, SessionLocal, engine  # noqa: E402
+from app.geocode import geocode_cache  # noqa: E402
+from app.import_counts import reconcile_counts  # noqa: E402
+from app.import_regeocode import regeocode_batch  # noqa: E402
+from app.models_user import User, UserRole  # noqa: E402
+from app.routers.imports import regeocode_item  # noqa: E402
+from benchmarks.fake_geocoder import FakeGeocoder  # noqa: E402
+
+LATENCY = 0.1  # seconds per geocoder request
+SIZES = [(500, 100), (3_000, 600)]  # (items, distinct addresses)
+
+
+def _seed(items: int, addresses: int) -> int:
+    Base.metadata.drop_all(bind=engine)
+    Base.metadata.create_all(bind=engine)
+    geocode_cache.clear()
+    with SessionLocal() as db:
+        db.add(User(id=1, email="bench@example.com", password_hash="x", role=UserRole.ADMIN))
+        batch = models.ImportBatch(created_by_id=1, total_rows=items)
+        db.add(batch)
+        db.commit()
+        batch_id = batch.id
+    rows = []
+    for i in range(items):
+        j = i % addresses
+        street = f"{j} Nowhere Ln" if j % 20 == 19 else f"{j} Market St"
+        rows.append({
+            "batch_id": batch_id, "status": models.ImportItemStatus.NEEDS_GEOCODE.value, "name": f"Business {i}",
+            "address1": street, "city": "Philadelphia", "state": "PA", "zip": "19107",
+        })
+    with engine.begin() as conn:
+        conn.execute(models.ImportItem.__table__.insert(), rows)
+    with SessionLocal() as db:
+        reconcile_counts(db)
+        db.commit()
+    return batch_id
+
+
+def per_item(batch_id: int) -> None:
+    with SessionLocal() as db:
+        ids = [
+            item_id
+            for (item_id,) in db.query(models.ImportItem.id)
+            .filter(models.ImportItem.batch_id == batch_id)
+            .order_by(models.ImportItem.id)
+        ]
+        for item_id in ids:
+            regeocode_item(item_id, _=None, db=db)
+
+
+def batch_job(batch_id: int) -> None:
+    with SessionLocal() as db:
+        regeocode_batch(db, batch_id)
+
+
+def _outcome(batch_id: int) -> list:
+    with SessionLocal() as db:
+        return (
+            db.query(models.ImportItem.id, models.ImportItem.status, models.ImportItem.lat, models.ImportItem.lng)
+            .filter(models.ImportItem.batch_id == batch_id)
+            .order_by(models.ImportItem.id)
+            .all()
+        )
+
+
+def _run(fn, fake: FakeGeocoder, items: int, addresses: int):
+    batch_id = _seed(items, addresses)
+    fake.requests.clear()
+    commits = {"n": 0}
+
+    def commit(conn):
+        commits["n"] += 1
+
+    event.listen(engine, "commit", commit)
+    try:
+        start = time.perf_counter()
+        fn(batch_id)
+        elapsed = time.perf_counter() - start
+    finally:
+        event.remove(engine, "commit", commit)
+    time.sleep(0.5)  # let the rate limiter's schedule drain between runs
+    return elapsed, sum(fake.requests.values()), commits["n"], _outcome(batch_id)
+
+
+def main() -> None:
+    with FakeGeocoder(latency=LATENCY) as fake:
+        os.environ["MAPBOX_GEOCODE_URL"] = fake.mapbox_url
+        os.environ["NOMINATIM_URL"] = fake.nominatim_url
+        print(f"{'items':>6} {'addrs':>6} {'per-item s':>11} {'requests':>9} {'commits':>8} {'batch s':>8} {'requests':>9} {'commits':>8} {'speedup':>8}")
+        for items, addresses in SIZES:
+            old_t, old_req, old_commits, old_outcome = _run(per_item, fake, items, addresses)
+            new_t, new_req, new_commits, new_outcome = _run(batch_job, fake, items, addresses)
+            assert new_outcome == old_outcome, "batch re-geocode resolved items differently"
+            print(
+                f"{items:>6} {addresses:>6} {old_t:>11.2f} {old_req:>9} {old_commits:>8}"
+                f" {new_t:>8.2f} {new_req:>9} {new_commits:>8} {old_t / new_t:>7.1f}x"
+            )
+    os.remove(_DB_PATH)
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,133 @@
+"""
+Local stand-in for the Mapbox and Nominatim geocoding APIs.
+
+Answers both URL shapes app/geocode.py uses with deterministic coordinates
+(derived from the query text) after a fixed latency, plus up to ``jitter``
+seconds more per query (also derived from the text, so concurrent answers
+come back out of order), and records each request's provider and arrival
+time so rate limits can be checked. Queries containing "nowhere" get an
+empty result.
+
+Standalone, for trying imports against it:
+    python -m benchmarks.fake_geocoder --port 8765 --latency 0.2
+    MAPBOX_TOKEN=fake MAPBOX_GEOCODE_URL=http://127.0.0.1:8765/mapbox/ \\
+    NOMINATIM_URL=http://127.0.0.1:8765/nominatim uvicorn app.main:app
+
+In-process, as benchmarks/bench_geocode.py does:
+    with FakeGeocoder(latency=0.05) as fake:
+        os.environ["NOMINATIM_URL"] = fake.nominatim_url
+"""
+
+import argparse
+import hashlib
+import json
+import threading
+import time
+import urllib.parse
+from collections import Counter
+from http.server import BaseHTTPRequestHandler, ThreadingHTTPServer
+from typing import List, Optional, Tuple
+
+CENTER = (39.9526, -75.1652)
+
+
+def fake_coords(query: str) -> Optional[Tuple[float, float]]:
+    if "nowhere" in query.lower():
+        return None
+    digest = hashlib.sha1(query.encode("utf-8")).digest()
+    lat = CENTER[0] + (digest[0] - 128) / 256
+    lng = CENTER[1] + (digest[1] - 128) / 256
+    return round(lat, 6), round(lng, 6)
+
+
+class FakeGeocoder:
+    """Threaded HTTP server on 127.0.0.1; use as a context manager."""
+
+    def __init__(self, port: int = 0, latency: float = 0.05, jitter: float = 0.0):
+        self.latency = latency
+        self.jitter = jitter
+        self.requests: Counter = Counter()
+        self.times: List[Tuple[str, float]] = []  # (provider, monotonic arrival)
+        self._lock = threading.Lock()
+        fake = self
+
+        class Handler(BaseHTTPRequestHandler):
+            def do_GET(self) -> None:
+                parsed = urllib.parse.urlparse(self.path)
+                if parsed.path.startswith("/mapbox/"):
+                    provider = "mapbox"
+                    query = urllib.parse.unquote(parsed.path[len("/mapbox/"):].removesuffix(".json"))
+                elif parsed.path == "/nominatim":
+                    provider = "nominatim"
+                    query = urllib.parse.parse_qs(parsed.query).get("q", [""])[0]
+                else:
+                    self.send_error(404)
+                    return
+                with fake._lock:
+                    fake.requests[provider] += 1
+                    fake.times.append((provider, time.monotonic()))
+                time.sleep(fake.latency + fake.jitter * hashlib.sha1(query.encode("utf-8")).digest()[2] / 255)
+                coords = fake_coords(query)
+                if provider == "mapbox":
+                    body = {"features": [{"center": [coords[1], coords[0]]}] if coords else []}
+                else:
+                    body = [{"lat": str(coords[0]), "lon": str(coords[1])}] if coords else []
+                data = json.dumps(body).encode("utf-8")
+                self.send_response(200)
+                self.send_header("Content-Type", "application/json")
+                self.send_header("Content-Length", str(len(data)))
+                self.end_headers()
+                self.wfile.write(data)
+
+            def log_message(self, format: str, *args: object) -> None:
+                pass
+
+        self.server = ThreadingHTTPServer(("127.0.0.1", port), Handler)
+        self.server.daemon_threads = True
+        self._thread: Optional[threading.Thread] = None
+
+    @property
+    def base_url(self) -> str:
+        host, port = self.server.server_address[:2]
+        return f"http://{host}:{port}"
+
+    @property
+    def mapbox_url(self) -> str:
+        return self.base_url + "/mapbox/"
+
+    @property
+    def nominatim_url(self) -> str:
+        return self.base_url + "/nominatim"
+
+    def min_interval(self, provider: str) -> Optional[float]:
+        """Shortest gap in seconds between two consecutive requests from ``provider``."""
+        stamps = sorted(t for p, t in self.times if p == provider)
+        gaps = [b - a for a, b in zip(stamps, stamps[1:])]
+        return min(gaps) if gaps else None
+
+    def __enter__(self) -> "FakeGeocoder":
+        self._thread = threading.Thread(target=self.server.serve_forever, daemon=True)
+        self._thread.start()
+        return self
+
+    def __exit__(self, *exc: object) -> None:
+        self.server.shutdown()
+        self.server.server_close()
+
+
+def main() -> None:
+    parser = argparse.ArgumentParser(description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter)
+    parser.add_argument("--port", type=int, default=8765)
+    parser.add_argument("--latency", type=float, default=0.2)
+    args = parser.parse_args()
+    with FakeGeocoder(port=args.port, latency=args.latency) as fake:
+        print(f"mapbox:    {fake.mapbox_url}")
+        print(f"nominatim: {fake.nominatim_url}")
+        try:
+            threading.Event().wait()
+        except KeyboardInterrupt:
+            pass
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,52 @@
+# backend/tests/conftest.py
+# Points the app at a throwaway SQLite file before any test imports
+# app.database, gives each test that asks for it an empty database, and runs
+# the geocoder against benchmarks/fake_geocoder.py.
+#
+# Run from backend/:
+#     python -m pytest
+# Postgres-only cases run when TEST_POSTGRES_URL names a disposable database.
+
+import os
+import tempfile
+
+_DB_PATH = os.path.join(tempfile.mkdtemp(), "test.db")
+os.environ["APP_ENV"] = "local"
+os.environ["DATABASE_URL_LOCAL"] = f"sqlite:///{_DB_PATH}"
+
+import pytest  # noqa: E402
+
+from app import geocode, models, models_user  # noqa: E402,F401  (register every table on Base)
+from app.catalog import ensure_catalog_state  # noqa: E402
+from app.database import Base, engine  # noqa: E402
+from app.geo_backend import geo_backend  # noqa: E402
+from app.text_search import text_search  # noqa: E402
+from benchmarks.fake_geocoder import FakeGeocoder  # noqa: E402
+
+
+@pytest.fixture
+def fresh_db():
+    """The app's engine over a new database file, set up as at API startup."""
+    engine.dispose()
+    if os.path.exists(_DB_PATH):
+        os.remove(_DB_PATH)  # also drops the R*Tree and FTS tables create_all does not know about
+    Base.metadata.create_all(bind=engine)
+    geo_backend.install(engine)
+    ensure_catalog_state(engine)
+    text_search.install(engine)
+    yield engine
+
+
+@pytest.fixture
+def fake_geocoder(fresh_db, monkeypatch):
+    """Fake geocoder behind both providers, unlimited rate limits and an empty geocode cache."""
+    with FakeGeocoder(latency=0.01) as server:
+        monkeypatch.setenv("MAPBOX_TOKEN", "fake")
+        monkeypatch.setenv("MAPBOX_GEOCODE_URL", server.mapbox_url)
+        monkeypatch.setenv("NOMINATIM_URL", server.nominatim_url)
+        monkeypatch.setenv("MAPBOX_RATE_LIMIT", "0")
+        monkeypatch.setenv("NOMINATIM_RATE_LIMIT", "0")
+        monkeypatch.setattr(geocode, "PROVIDERS", [geocode.MapboxGeocoder(), geocode.NominatimGeocoder()])
+        geocode.geocode_cache.clear()
+        yield server
+        geocode.geocode_cache.clear()
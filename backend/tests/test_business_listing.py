@@ -0,0 +1,39 @@
+"""
+GET /api/businesses: skip and limit bounds, plain and keyset-paged.
+"""
+
+import pytest
+from fastapi.testclient import TestClient
+
+from app import models
+from app.database import SessionLocal
+from app.main import app
+from app.response_cache import response_cache
+
+
+@pytest.fixture
+def client(fresh_db, monkeypatch):
+    monkeypatch.setattr(response_cache, "enabled", False)
+    with SessionLocal() as db:
+        db.execute(
+            models.Business.__table__.insert(),
+            [{"name": f"Business {i}", "lat": 40.0, "lng": -75.0 + i / 100, "is_approved": True} for i in range(3)],
+        )
+        db.commit()
+    with TestClient(app) as c:
+        yield c
+
+
+@pytest.mark.parametrize("cursor", [None, ""], ids=["plain", "paged"])
+@pytest.mark.parametrize("params", [{"limit": 0}, {"limit": -1}, {"limit": 501}, {"skip": -1}])
+def test_out_of_range_skip_and_limit_are_rejected(client, params, cursor):
+    if cursor is not None:
+        params = {**params, "cursor": cursor}
+    assert client.get("/api/businesses/", params=params).status_code == 422
+
+
+@pytest.mark.parametrize("limit,expected", [(1, 1), (500, 3)])
+def test_limit_bounds_are_inclusive(client, limit, expected):
+    assert len(client.get("/api/businesses/", params={"limit": limit}).json()) == expected
+    page = client.get("/api/businesses/", params={"limit": limit, "cursor": ""}).json()
+    assert len(page["items"]) == expected and (page["next_cursor"] is not None) == (expected < 3)
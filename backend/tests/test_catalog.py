@@ -0,0 +1,68 @@
+"""
+Catalog ETags: derived from the persisted catalog version only, so every
+worker agrees on them, and withheld while a committed write has not yet
+synced the in-process index.
+"""
+
+import pytest
+from fastapi.testclient import TestClient
+
+from app import models
+from app.catalog import bump_catalog_version
+from app.database import SessionLocal
+from app.main import app
+from app.spatial_index import business_index
+
+URL = "/api/businesses/"
+
+
+@pytest.fixture
+def client(fresh_db):
+    with SessionLocal() as db:
+        db.add(models.Business(name="Corner Cafe", lat=39.95, lng=-75.16, is_approved=True))
+        db.commit()
+    with TestClient(app) as c:
+        yield c
+
+
+def test_etag_does_not_depend_on_process_state(client, monkeypatch):
+    etag = client.get(URL).headers["etag"]
+    monkeypatch.setattr(business_index, "version", business_index.version + 41)  # another worker, or a restart
+    assert client.get(URL).headers["etag"] == etag
+    assert client.get(URL, headers={"If-None-Match": etag}).status_code == 304
+
+
+def test_write_moves_the_etag(client):
+    etag = client.get(URL).headers["etag"]
+    with SessionLocal() as db:
+        bump_catalog_version(db)
+        db.commit()
+    business_index.apply([], [])
+    assert client.get(URL, headers={"If-None-Match": etag}).status_code == 200
+    assert client.get(URL).headers["etag"] != etag
+
+
+def test_reads_between_commit_and_sync_are_not_cacheable(client):
+    etag = client.get(URL).headers["etag"]
+    with SessionLocal() as db:
+        business = db.query(models.Business).one()
+        business.name = "Corner Cafe & Bakery"
+        bump_catalog_version(db)
+        db.commit()
+
+        response = client.get(URL, headers={"If-None-Match": etag})
+        assert response.status_code == 200
+        assert "etag" not in response.headers and response.headers["cache-control"] == "no-store"
+
+        business_index.sync(business)
+    assert client.get(URL).headers["etag"] != etag
+
+
+@pytest.mark.parametrize("undo", ["rollback", "close"])
+def test_undone_write_leaves_nothing_pending(client, undo):
+    etag = client.get(URL).headers["etag"]
+    db = SessionLocal()
+    bump_catalog_version(db)
+    getattr(db, undo)()
+    db.close()
+    assert client.get(URL, headers={"If-None-Match": etag}).status_code == 304
@@ -0,0 +1,58 @@
+"""
+Fuzzy duplicate matching: scoring of near-duplicates and the SQL prefilter
+in load_index(), which must load every business the in-memory blocking
+could pair with a row.
+"""
+
+import pytest
+
+from app import models
+from app.database import SessionLocal
+from app.dedupe import DUPLICATE_THRESHOLD, confidence, load_index, profile, row_profile
+
+
+def test_near_duplicate_names_score_above_threshold():
+    row = profile(0, "Joes Pizza", "12 Market Street", "19103", 39.9526, -75.1652)
+    business = profile(1, "Joe's Pizza LLC", "12 Market St", "19103", 39.9527, -75.1652)
+    assert confidence(row, business) >= DUPLICATE_THRESHOLD
+
+
+def test_different_house_numbers_lower_the_score():
+    row = profile(0, "Joes Pizza", "12 Market St", "19103", None, None)
+    same = profile(1, "Joe's Pizza", "12 Market St", "19103", None, None)
+    other = profile(2, "Joe's Pizza", "98 Market St", "19103", None, None)
+    assert confidence(row, other) < confidence(row, same)
+
+
+def test_unrelated_names_never_match():
+    row = profile(0, "Joes Pizza", "12 Market St", "19103", 39.9526, -75.1652)
+    business = profile(1, "Liberty Hardware", "12 Market St", "19103", 39.9526, -75.1652)
+    assert confidence(row, business) is None
+
+
+def _add_business(zip_code, lat=None, lng=None) -> int:
+    with SessionLocal() as db:
+        business = models.Business(
+            name="Joe's Pizza LLC", address1="12 Market St", zip=zip_code, lat=lat, lng=lng, is_approved=True
+        )
+        db.add(business)
+        db.commit()
+        return business.id
+
+
+@pytest.mark.parametrize("stored_zip", ["19103", "19103-1234", " 19103 ", "191031234"])
+@pytest.mark.parametrize("row_coords", [(None, None), (39.9526, -75.1652)], ids=["row-ungeocoded", "row-geocoded"])
+def test_load_index_matches_on_zip5(fresh_db, stored_zip, row_coords):
+    business_id = _add_business(stored_zip)
+    row = row_profile({"name": "Joes Pizza", "address1": "12 Market Street", "zip": "19103-0001",
+                       "lat": row_coords[0], "lng": row_coords[1]})
+    with SessionLocal() as db:
+        match = load_index(db, [row]).best_match(row)
+    assert match is not None and match.business_id == business_id
+
+
+def test_load_index_skips_other_zips(fresh_db):
+    _add_business("19104-1234")
+    row = row_profile({"name": "Joes Pizza", "address1": "12 Market Street", "zip": "19103"})
+    with SessionLocal() as db:
+        assert load_index(db, [row]).best_match(row) is None
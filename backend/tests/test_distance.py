@@ -0,0 +1,82 @@
+"""
+Nearest-first ranking in app/distance.py, and keyset paging over it when many
+businesses share coordinates (one building, or ZIP-centroid geocodes): every
+id must come back exactly once, in (distance, id) order.
+"""
+
+import random
+
+import pytest
+from fastapi.testclient import TestClient
+
+from app import crud, models
+from app.database import SessionLocal
+from app.distance import VECTORIZE_MIN_CANDIDATES, rank_by_distance
+from app.main import app
+from app.response_cache import response_cache
+from app.spatial_index import SpatialIndex
+
+CENTER = (40.0, -75.0)
+SPOTS = [(40.01, -75.0), (39.99, -75.0), (40.0, -75.02)]  # the first two are equidistant
+
+
+def _candidates(n: int, seed: int) -> list:
+    rng = random.Random(seed)
+    ids = rng.sample(range(1, 10 * n), n)
+    return [(row_id, *rng.choice(SPOTS)) for row_id in ids]
+
+
+def _page_through(candidates: list, limit: int) -> list:
+    seen, after = [], None
+    while True:
+        page = rank_by_distance(*CENTER, candidates, radius_km=50.0, k=limit, after=after)
+        seen.extend(page)
+        if len(page) < limit:
+            return seen
+        after = page[-1]
+
+
+@pytest.mark.parametrize("n", [VECTORIZE_MIN_CANDIDATES - 1, 120, 1000])
+@pytest.mark.parametrize("limit", [1, 7, 25])
+def test_keyset_pages_over_tied_distances_return_every_row_once(n, limit):
+    for seed in range(20):
+        candidates = _candidates(n, seed)
+        seen = _page_through(candidates, limit)
+        assert [row_id for _, row_id in seen] == [row_id for _, row_id in sorted(seen)]
+        assert sorted(row_id for _, row_id in seen) == sorted(row_id for row_id, _, _ in candidates)
+
+
+@pytest.mark.parametrize("k", [1, 5, 40, 119])
+def test_k_nearest_are_the_k_smallest_pairs(k):
+    candidates = _candidates(120, k)
+    everything = rank_by_distance(*CENTER, candidates)
+    assert rank_by_distance(*CENTER, candidates, k=k) == everything[:k]
+
+
+@pytest.fixture(params=["spatial-index", "geo-backend"])
+def tied_businesses(request, fresh_db, monkeypatch):
+    """120 approved businesses on two coordinates, searched through either radius path."""
+    monkeypatch.setattr(crud, "business_index", SpatialIndex(enabled=request.param == "spatial-index"))
+    monkeypatch.setattr(response_cache, "enabled", False)
+    rows = [
+        {"name": f"Business {i}", "lat": SPOTS[i % 2][0], "lng": SPOTS[i % 2][1], "is_approved": True}
+        for i in range(120)
+    ]
+    with SessionLocal() as db:
+        db.execute(models.Business.__table__.insert(), rows)
+        db.commit()
+        return [row_id for (row_id,) in db.query(models.Business.id)]
+
+
+def test_radius_listing_pages_return_every_tied_business_once(tied_businesses):
+    seen, cursor = [], ""
+    with TestClient(app) as client:
+        while cursor is not None:
+            response = client.get(
+                "/api/businesses/", params={"near": "40.0,-75.0", "radius_km": 50, "limit": 25, "cursor": cursor}
+            )
+            assert response.status_code == 200
+            page = response.json()
+            seen.extend(item["id"] for item in page["items"])
+            cursor = page["next_cursor"]
+    assert len(seen) == len(set(seen)) and sorted(seen) == sorted(tied_businesses)
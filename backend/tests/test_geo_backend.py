@@ -0,0 +1,219 @@
+"""
+One suite for every geo backend: bbox filtering, radius ranking and keyset
+paging must return the same ids in the same order whichever backend runs
+them. The Python and R*Tree backends run on a fresh SQLite file per test;
+PostgresGeoBackend runs when TEST_POSTGRES_URL names a disposable database
+(its tables are dropped and created again).
+"""
+
+import os
+import random
+
+import pytest
+from sqlalchemy import text
+from sqlalchemy.orm import Session
+
+from app import models
+from app.database import Base, build_engine
+from app.geo import haversine_km
+from app.geo_backend import PostgresGeoBackend, PythonGeoBackend, SQLiteRTreeGeoBackend
+
+TEST_POSTGRES_URL = os.getenv("TEST_POSTGRES_URL")
+
+CENTER = (39.9526, -75.1652)
+RADIUS_KM = 15.0
+BBOX = (-75.25, 39.90, -75.10, 40.00)  # (west, south, east, north)
+
+
+def _seed_rows() -> list:
+    """Businesses around CENTER, some sharing coordinates and some without any.
+
+    Points whose distance is within 2% of RADIUS_KM are skipped: earthdistance
+    uses a slightly larger Earth than haversine_km, so the backends may
+    legitimately disagree right at the edge.
+    """
+    rng = random.Random(8)
+    rows = []
+    while len(rows) < 400:
+        lat, lng = CENTER[0] + rng.uniform(-0.3, 0.3), CENTER[1] + rng.uniform(-0.3, 0.3)
+        if abs(haversine_km(*CENTER, lat, lng) - RADIUS_KM) < RADIUS_KM * 0.02:
+            continue
+        rows.append({"lat": lat, "lng": lng})
+    rows += [{"lat": rows[0]["lat"], "lng": rows[0]["lng"]} for _ in range(3)]  # distance ties break by id
+    rows += [{"lat": None, "lng": None} for _ in range(5)]
+    return [{"name": f"Business {i}", "is_approved": True, "hide_address": False, **row} for i, row in enumerate(rows)]
+
+
+ROWS = _seed_rows()
+
+
+@pytest.fixture(params=[PythonGeoBackend, SQLiteRTreeGeoBackend, PostgresGeoBackend], ids=lambda cls: cls.name)
+def backend_db(request, tmp_path):
+    """(backend, session) over a database holding ROWS."""
+    backend_cls = request.param
+    if backend_cls is PostgresGeoBackend:
+        if not TEST_POSTGRES_URL:
+            pytest.skip("TEST_POSTGRES_URL is not set")
+        bind = build_engine(TEST_POSTGRES_URL)
+    else:
+        bind = build_engine(f"sqlite:///{tmp_path / 'geo.db'}")
+    Base.metadata.drop_all(bind=bind)
+    Base.metadata.create_all(bind=bind)
+    backend = backend_cls()
+    backend.install(bind)
+    with bind.begin() as conn:
+        conn.execute(models.Business.__table__.insert(), ROWS)
+    session = Session(bind)
+    yield backend, session
+    session.close()
+    if backend_cls is PostgresGeoBackend:
+        Base.metadata.drop_all(bind=bind)
+    bind.dispose()
+
+
+def _expected_bbox(session: Session) -> list:
+    west, south, east, north = BBOX
+    return [
+        biz_id
+        for biz_id, lat, lng in session.query(models.Business.id, models.Business.lat, models.Business.lng)
+        .order_by(models.Business.id)
+        if lat is not None and south <= lat <= north and west <= lng <= east
+    ]
+
+
+def _expected_ranking(session: Session) -> list:
+    ranked = [
+        (haversine_km(*CENTER, lat, lng), biz_id)
+        for biz_id, lat, lng in session.query(models.Business.id, models.Business.lat, models.Business.lng)
+        if lat is not None
+    ]
+    return [biz_id for d, biz_id in sorted(ranked) if d <= RADIUS_KM]
+
+
+def test_installs_native_index(backend_db):
+    backend, _ = backend_db
+    if isinstance(backend, SQLiteRTreeGeoBackend):
+        assert backend.rtree
+    if isinstance(backend, PostgresGeoBackend):
+        assert backend.earthdistance
+
+
+def test_filter_bbox(backend_db):
+    backend, session = backend_db
+    found = [
+        biz.id
+        for biz in backend.filter_bbox(session.query(models.Business), BBOX).order_by(models.Business.id)
+    ]
+    assert found and found == _expected_bbox(session)
+
+
+def test_rank_within(backend_db):
+    backend, session = backend_db
+    expected = _expected_ranking(session)
+    ranked = backend.rank_within(session.query(models.Business), *CENTER, RADIUS_KM, skip=0, limit=len(ROWS))
+    assert [biz_id for _, biz_id in ranked] == expected
+    distances = [d for d, _ in ranked]
+    assert distances == sorted(distances)
+    assert all(d <= RADIUS_KM for d in distances)
+
+
+def test_rank_within_skip(backend_db):
+    backend, session = backend_db
+    expected = _expected_ranking(session)
+    page = backend.rank_within(session.query(models.Business), *CENTER, RADIUS_KM, skip=10, limit=10)
+    assert [biz_id for _, biz_id in page] == expected[10:20]
+
+
+def test_rank_within_keyset_pages(backend_db):
+    backend, session = backend_db
+    expected = _expected_ranking(session)
+    found, after = [], None
+    while True:
+        page = backend.rank_within(
+            session.query(models.Business), *CENTER, RADIUS_KM, skip=0, limit=7, after=after
+        )
+        if not page:
+            break
+        found += [biz_id for _, biz_id in page]
+        after = page[-1]
+    assert found == expected
+
+
+def test_rank_within_respects_base_query(backend_db):
+    backend, session = backend_db
+    q = session.query(models.Business).filter(models.Business.id % 2 == 0)
+    ranked = backend.rank_within(q, *CENTER, RADIUS_KM, skip=0, limit=len(ROWS))
+    assert [biz_id for _, biz_id in ranked] == [i for i in _expected_ranking(session) if i % 2 == 0]
+
+
+@pytest.fixture
+def rtree_db(tmp_path):
+    bind = build_engine(f"sqlite:///{tmp_path / 'rtree.db'}")
+    Base.metadata.create_all(bind=bind)
+    backend = SQLiteRTreeGeoBackend()
+    backend.install(bind)
+    assert backend.rtree
+    session = Session(bind)
+    yield backend, session
+    session.close()
+    bind.dispose()
+
+
+def _rtree_rows(session: Session) -> dict:
+    found = session.execute(text(f"SELECT id, min_lat, max_lat, min_lng, max_lng FROM {SQLiteRTreeGeoBackend.RTREE}"))
+    return {row[0]: row[1:] for row in found}
+
+
+def _assert_in_sync(session: Session) -> None:
+    """Every located business has exactly its (float32-rounded) point in the R*Tree, nothing else does."""
+    rows = _rtree_rows(session)
+    located = {
+        biz_id: (lat, lng)
+        for biz_id, lat, lng in session.query(models.Business.id, models.Business.lat, models.Business.lng)
+        if lat is not None and lng is not None
+    }
+    assert set(rows) == set(located)
+    for biz_id, (lat, lng) in located.items():
+        min_lat, max_lat, min_lng, max_lng = rows[biz_id]
+        assert min_lat <= lat <= max_lat and max_lat - min_lat < 1e-4
+        assert min_lng <= lng <= max_lng and max_lng - min_lng < 1e-4
+
+
+def test_rtree_backfills_existing_rows(tmp_path):
+    bind = build_engine(f"sqlite:///{tmp_path / 'backfill.db'}")
+    Base.metadata.create_all(bind=bind)
+    with bind.begin() as conn:
+        conn.execute(models.Business.__table__.insert(), ROWS)
+    SQLiteRTreeGeoBackend().install(bind)
+    with Session(bind) as session:
+        _assert_in_sync(session)
+    bind.dispose()
+
+
+def test_rtree_triggers_follow_insert_update_delete(rtree_db):
+    backend, session = rtree_db
+    placed = models.Business(name="Placed", lat=39.95, lng=-75.16)
+    unplaced = models.Business(name="Unplaced")
+    session.add_all([placed, unplaced])
+    session.commit()
+    _assert_in_sync(session)
+    assert placed.id in _rtree_rows(session) and unplaced.id not in _rtree_rows(session)
+
+    placed.lat, placed.lng = 40.44, -79.99  # moved across the state
+    unplaced.lat, unplaced.lng = 39.96, -75.17
+    session.commit()
+    _assert_in_sync(session)
+    near_old = [b.id for b in backend.filter_bbox(session.query(models.Business), (-75.2, 39.9, -75.1, 40.0))]
+    near_new = [b.id for b in backend.filter_bbox(session.query(models.Business), (-80.1, 40.4, -79.9, 40.5))]
+    assert near_old == [unplaced.id] and near_new == [placed.id]
+
+    placed.name = "Renamed"  # not a coordinate change
+    unplaced.lat = unplaced.lng = None
+    session.commit()
+    _assert_in_sync(session)
+    assert unplaced.id not in _rtree_rows(session)
+
+    session.delete(placed)
+    session.commit()
+    _assert_in_sync(session)
+    assert _rtree_rows(session) == {}
@@ -0,0 +1,125 @@
+"""
+The geocoding layer against benchmarks/fake_geocoder.py: results in input
+order, provider fallback, per-provider rate limits and the geocode cache
+(LRU and table, hits, misses and TTL expiry).
+"""
+
+import time
+from concurrent.futures import ThreadPoolExecutor
+from datetime import datetime, timedelta
+
+from sqlalchemy import update
+
+from app import geocode, models
+from app.geocode import GeocodeStats, MapboxGeocoder, NominatimGeocoder, RateLimiter, geocode_cache, geocode_many
+from benchmarks.fake_geocoder import fake_coords
+
+
+def _address(i: int, street: str = "Market St") -> tuple:
+    return (f"{i} {street}", "Philadelphia", "PA", "19107")
+
+
+def _query(address: tuple) -> str:
+    return ", ".join(address)
+
+
+def test_results_follow_input_order(fake_geocoder):
+    fake_geocoder.jitter = 0.05  # answers arrive out of input order
+    addresses = [_address(i) for i in range(40)]
+    addresses[7] = (None, None, None, None)
+    addresses[12] = addresses[3]
+    results = geocode_many(addresses)
+    expected = [fake_coords(_query(a)) if a[0] else None for a in addresses]
+    assert results == expected
+    assert fake_geocoder.requests["mapbox"] == 38  # 40 minus the empty and the repeated address
+    assert fake_geocoder.requests["nominatim"] == 0
+
+
+def test_falls_back_to_the_next_provider(fake_geocoder):
+    addresses = [_address(1), _address(2, "Nowhere Ln"), _address(3)]
+    assert geocode_many(addresses) == [fake_coords(_query(addresses[0])), None, fake_coords(_query(addresses[2]))]
+    assert fake_geocoder.requests == {"mapbox": 3, "nominatim": 1}
+
+
+def test_mapbox_is_skipped_without_a_token(fake_geocoder, monkeypatch):
+    monkeypatch.delenv("MAPBOX_TOKEN")
+    assert geocode_many([_address(1)]) == [fake_coords(_query(_address(1)))]
+    assert fake_geocoder.requests == {"nominatim": 1}
+
+
+def test_rate_limit_spaces_requests(fake_geocoder, monkeypatch):
+    monkeypatch.delenv("MAPBOX_TOKEN")
+    monkeypatch.setenv("NOMINATIM_RATE_LIMIT", "20")  # one request per 50 ms
+    monkeypatch.setattr(geocode, "PROVIDERS", [MapboxGeocoder(), NominatimGeocoder()])
+    start = time.monotonic()
+    geocode_many([_address(i) for i in range(10)])
+    assert time.monotonic() - start >= 9 * 0.05
+    assert fake_geocoder.requests["nominatim"] == 10
+    # Requests leave on a 50 ms schedule; the k-th cannot arrive sooner than
+    # k slots after the first, less however late the first one arrived.
+    stamps = sorted(t for provider, t in fake_geocoder.times if provider == "nominatim")
+    assert all(t - stamps[0] >= k * 0.05 - 0.02 for k, t in enumerate(stamps))
+
+
+def test_rate_limiter_is_shared_across_threads():
+    limiter = RateLimiter(50.0)
+    stamps = []
+    with ThreadPoolExecutor(max_workers=8) as pool:
+        for _ in pool.map(lambda _: (limiter.wait(), stamps.append(time.monotonic())), range(16)):
+            pass
+    stamps.sort()
+    assert stamps[-1] - stamps[0] >= 15 * 0.02 * 0.9
+
+
+def test_repeat_lookups_are_cache_hits(fake_geocoder):
+    addresses = [_address(i) for i in range(10)] + [_address(1, "Nowhere Ln")]
+    first = geocode_many(addresses)
+    requests = sum(fake_geocoder.requests.values())
+
+    stats = GeocodeStats()
+    assert geocode_many(addresses, stats=stats) == first
+    assert sum(fake_geocoder.requests.values()) == requests  # answers and the miss came from the LRU
+    assert stats.lookups == 11 and stats.hit_ratio == 1.0
+
+    geocode_cache.clear()
+    assert geocode_many(addresses) == first
+    assert sum(fake_geocoder.requests.values()) == requests  # ... and from the geocode_cache table
+
+
+def test_cache_is_keyed_case_and_space_insensitively(fake_geocoder):
+    geocode_many([("1 Market St", "Philadelphia", "PA", "19107")])
+    geocode_many([("1  MARKET st", "philadelphia", "pa", "19107")])
+    assert fake_geocoder.requests["mapbox"] == 1
+
+
+def test_expired_lru_entries_are_fetched_again(fake_geocoder, monkeypatch):
+    monkeypatch.setattr(geocode_cache, "ttl", 0.2)
+    geocode_many([_address(1)])
+    geocode_many([_address(1)])
+    assert fake_geocoder.requests["mapbox"] == 1
+    time.sleep(0.3)
+    geocode_many([_address(1)])
+    assert fake_geocoder.requests["mapbox"] == 2
+
+
+def test_misses_expire_before_answers(fake_geocoder, monkeypatch):
+    monkeypatch.setattr(geocode_cache, "miss_ttl", 86400.0)
+    found, missing = _address(1), _address(2, "Nowhere Ln")
+    geocode_many([found, missing])
+    assert fake_geocoder.requests == {"mapbox": 2, "nominatim": 1}
+
+    table = models.GeocodeCacheEntry.__table__
+    with geocode_cache.bind.begin() as conn:
+        conn.execute(update(table).values(fetched_at=datetime.utcnow() - timedelta(days=2)))
+    geocode_cache.clear()
+
+    assert geocode_many([found, missing]) == [fake_coords(_query(found)), None]
+    # The two-day-old answer is within GEOCODE_CACHE_TTL; the miss is past miss_ttl.
+    assert fake_geocoder.requests == {"mapbox": 3, "nominatim": 2}
+
+
+def test_disabled_cache_always_calls_providers(fake_geocoder, monkeypatch):
+    monkeypatch.setattr(geocode_cache, "enabled", False)
+    geocode_many([_address(1)])
+    geocode_many([_address(1)])
+    assert fake_geocoder.requests["mapbox"] == 2
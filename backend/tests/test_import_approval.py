@@ -0,0 +1,67 @@
+"""
+Bulk approval: every approved item links to the business created from it,
+including when another writer inserts businesses while a chunk is approved.
+"""
+
+import pytest
+
+from app import import_approval, models
+from app.database import SessionLocal, engine
+from app.import_approval import approve_items
+from app.models_user import User, UserRole
+
+Status = models.ImportItemStatus
+
+
+@pytest.fixture
+def batch(fresh_db):
+    """25 READY items, one without coordinates, after a deleted business freed the top id."""
+    with SessionLocal() as db:
+        db.add(User(id=1, email="admin@example.com", password_hash="x", role=UserRole.ADMIN))
+        batch = models.ImportBatch(created_by_id=1, total_rows=25)
+        db.add(batch)
+        db.execute(models.Business.__table__.insert(), [{"name": f"Existing {i}"} for i in range(5)])
+        db.execute(models.Business.__table__.delete().where(models.Business.name == "Existing 4"))
+        db.commit()
+        rows = [
+            {"batch_id": batch.id, "name": f"Item {i}", "status": Status.READY.value,
+             "lat": None if i == 7 else 40.0 + i / 100, "lng": -75.0}
+            for i in range(25)
+        ]
+        db.execute(models.ImportItem.__table__.insert(), rows)
+        db.commit()
+        return batch.id
+
+
+def _assert_linked(batch_id: int) -> None:
+    with SessionLocal() as db:
+        items = db.query(models.ImportItem).filter(models.ImportItem.batch_id == batch_id).all()
+        for item in items:
+            if item.name == "Item 7":
+                assert item.status == Status.NEEDS_FIX.value and item.approved_business_id is None
+                continue
+            assert item.status == Status.APPROVED.value
+            business = db.get(models.Business, item.approved_business_id)
+            assert (business.name, business.lat, business.is_approved) == (item.name, item.lat, True)
+
+
+def test_approved_items_link_to_their_businesses(batch):
+    with SessionLocal() as db:
+        assert approve_items(db, batch, reviewer_id=1, chunk_size=10) == 24
+    _assert_linked(batch)
+
+
+def test_other_writers_businesses_are_not_linked(batch, monkeypatch):
+    record_transitions = import_approval.record_transitions
+
+    def with_concurrent_insert(db, batch_id, changes):
+        with engine.begin() as conn:  # lands before this chunk takes the write lock
+            conn.execute(models.Business.__table__.insert(), [{"name": "Someone else"}])
+        record_transitions(db, batch_id, changes)
+
+    monkeypatch.setattr(import_approval, "record_transitions", with_concurrent_insert)
+    with SessionLocal() as db:
+        assert approve_items(db, batch, reviewer_id=1, chunk_size=10) == 24
+    _assert_linked(batch)
+    with SessionLocal() as db:
+        assert db.query(models.Business).filter(models.Business.name == "Someone else").count() == 3
@@ -0,0 +1,156 @@
+"""
+Batch re-geocoding against benchmarks/fake_geocoder.py: regeocode_batch()
+itself, then the job through POST/GET /api/imports/batches/{id}/regeocode.
+"""
+
+import time
+
+import pytest
+from fastapi.testclient import TestClient
+from sqlalchemy import func
+
+from app import models
+from app.auth import get_current_user
+from app.database import SessionLocal
+from app.import_counts import reconcile_counts, status_counts
+from app.import_regeocode import regeocode_batch
+from app.main import app
+from app.models_user import User, UserRole
+from benchmarks.fake_geocoder import fake_coords
+
+Status = models.ImportItemStatus
+
+
+def _query(item: dict) -> str:
+    return ", ".join([item["address1"], item["city"], item["state"], item["zip"]])
+
+
+@pytest.fixture
+def batch(fake_geocoder):
+    """A batch with 30 unresolved items over 10 addresses (every fifth unknown), plus resolved ones."""
+    with SessionLocal() as db:
+        db.add(User(id=1, email="admin@example.com", password_hash="x", role=UserRole.ADMIN))
+        batch = models.ImportBatch(created_by_id=1, total_rows=33)
+        db.add(batch)
+        db.commit()
+        batch_id = batch.id
+    rows = []
+    for i in range(30):
+        j = i % 10
+        rows.append({
+            "batch_id": batch_id, "name": f"Business {i}",
+            "status": (Status.NEEDS_GEOCODE if i % 2 else Status.NEEDS_FIX).value,
+            "address1": f"{j} Nowhere Ln" if j % 5 == 4 else f"{j} Market St",
+            "city": "Philadelphia", "state": "PA", "zip": "19107",
+        })
+    ready = {"name": "Placed", "address1": "1 Elm St", "city": "Philadelphia", "state": "PA", "zip": "19107",
+             "lat": 40.0, "lng": -75.0, "batch_id": batch_id}
+    rows.append({**ready, "status": Status.READY.value})
+    rows.append({**ready, "status": Status.APPROVED.value})
+    rows.append({**ready, "status": Status.REJECTED.value, "lat": None, "lng": None})
+    with SessionLocal() as db:
+        db.execute(models.ImportItem.__table__.insert(), rows)
+        reconcile_counts(db)
+        db.commit()
+    return batch_id
+
+
+def _items(batch_id: int) -> dict:
+    with SessionLocal() as db:
+        items = db.query(models.ImportItem).filter(models.ImportItem.batch_id == batch_id)
+        return {item.id: {c.name: getattr(item, c.name) for c in item.__table__.columns} for item in items}
+
+
+def _assert_counters_reconciled(batch_id: int) -> None:
+    with SessionLocal() as db:
+        kept = status_counts(db.get(models.ImportBatch, batch_id))
+        actual = dict(
+            db.query(models.ImportItem.status, func.count())
+            .filter(models.ImportItem.batch_id == batch_id)
+            .group_by(models.ImportItem.status)
+        )
+        reconcile_counts(db, [batch_id])
+        db.commit()
+        assert status_counts(db.get(models.ImportBatch, batch_id)) == kept
+    assert {status: n for status, n in kept.items() if n} == actual
+
+
+def _assert_resolved(before: dict, after: dict) -> None:
+    for item_id, item in before.items():
+        if item["status"] not in (Status.NEEDS_GEOCODE.value, Status.NEEDS_FIX.value):
+            assert after[item_id] == item  # resolved items are left alone
+        elif "Nowhere" in item["address1"]:
+            assert after[item_id]["status"] == Status.NEEDS_FIX.value
+            assert after[item_id]["error_message"] == "Geocoding failed."
+            assert after[item_id]["lat"] is None
+        else:
+            assert (after[item_id]["lat"], after[item_id]["lng"]) == fake_coords(_query(item))
+            assert after[item_id]["status"] == Status.READY.value
+            assert after[item_id]["geocode_precision"] == models.GeocodePrecision.ADDRESS.value
+
+
+def test_regeocode_batch_locates_unresolved_items(batch, fake_geocoder):
+    before = _items(batch)
+    with SessionLocal() as db:
+        job = regeocode_batch(db, batch, chunk_size=3)
+    assert (job.items, job.addresses, job.addresses_done) == (30, 10, 10)
+    assert (job.located, job.failed) == (24, 6)
+    # Each distinct address once per provider it reached: 10 Mapbox, 2 unknown ones on to Nominatim.
+    assert fake_geocoder.requests == {"mapbox": 10, "nominatim": 2}
+    _assert_resolved(before, _items(batch))
+    _assert_counters_reconciled(batch)
+    with SessionLocal() as db:
+        stored = db.get(models.ImportBatch, batch)
+        assert (stored.geocode_lookups, stored.geocode_cache_hits) == (10, 0)
+
+
+def test_regeocode_batch_again_only_retries_failures(batch, fake_geocoder):
+    with SessionLocal() as db:
+        regeocode_batch(db, batch)
+        job = regeocode_batch(db, batch)
+    assert (job.items, job.addresses, job.located, job.failed) == (6, 2, 0, 6)
+    assert job.stats.hit_ratio == 1.0  # misses are cached
+    assert fake_geocoder.requests == {"mapbox": 10, "nominatim": 2}
+    _assert_counters_reconciled(batch)
+
+
+@pytest.fixture
+def client(batch):
+    app.dependency_overrides[get_current_user] = lambda: User(id=1, email="admin@example.com", role=UserRole.ADMIN)
+    with TestClient(app) as c:
+        yield c
+    app.dependency_overrides.pop(get_current_user, None)
+
+
+def _wait(client: TestClient, batch_id: int) -> dict:
+    deadline = time.monotonic() + 30
+    while (progress := client.get(f"/api/imports/batches/{batch_id}/regeocode").json())["status"] == "RUNNING":
+        assert time.monotonic() < deadline, progress
+        time.sleep(0.02)
+    return progress
+
+
+def test_regeocode_endpoint_runs_job_to_completion(client, batch):
+    before = _items(batch)
+    assert client.get(f"/api/imports/batches/{batch}/regeocode").status_code == 404  # no job yet
+
+    started = client.post(f"/api/imports/batches/{batch}/regeocode")
+    assert started.status_code == 202
+    progress = _wait(client, batch)
+    assert progress["status"] == "COMPLETE"
+    assert (progress["items"], progress["addresses"], progress["addresses_done"]) == (30, 10, 10)
+    assert (progress["located"], progress["failed"]) == (24, 6)
+    assert progress["finished_at"] is not None and progress["eta_seconds"] is None
+
+    _assert_resolved(before, _items(batch))
+    _assert_counters_reconciled(batch)
+    summary = next(b for b in client.get("/api/imports/batches").json() if b["batch"]["id"] == batch)
+    assert (summary["ready"], summary["needs_fix"], summary["needs_geocode"]) == (25, 6, 0)
+
+
+def test_regeocode_endpoint_refuses_missing_and_importing_batches(client, batch):
+    assert client.post("/api/imports/batches/999/regeocode").status_code == 404
+    with SessionLocal() as db:
+        db.get(models.ImportBatch, batch).status = models.ImportBatchStatus.PROCESSING.value
+        db.commit()
+    assert client.post(f"/api/imports/batches/{batch}/regeocode").status_code == 409
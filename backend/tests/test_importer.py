@@ -0,0 +1,44 @@
+"""
+Exact duplicate matching of import rows against existing businesses
+(match_existing), including names outside ASCII.
+"""
+
+import pytest
+
+from app import models
+from app.database import SessionLocal
+from app.importer import match_existing
+
+
+def _add_business(name: str, **fields) -> int:
+    with SessionLocal() as db:
+        business = models.Business(name=name, **fields)
+        db.add(business)
+        db.commit()
+        return business.id
+
+
+@pytest.mark.parametrize("stored,row", [
+    ("CAFÉ DU MONDE", "CAFÉ DU MONDE"),
+    ("CAFÉ DU MONDE", "CAFÉ du monde"),
+    ("Crème Brûlée Co", "crème brûlée co"),
+    ("Joe's Pizza", "JOE'S PIZZA"),
+])
+def test_names_match_ignoring_case(fresh_db, stored, row):
+    business_id = _add_business(stored)
+    with SessionLocal() as db:
+        assert match_existing(db, [{"name": row}]) == [business_id]
+
+
+def test_address_fields_must_agree_where_given(fresh_db):
+    first = _add_business("Bäckerei Müller", city="Philadelphia", zip="19103")
+    second = _add_business("Bäckerei Müller", city="Pittsburgh", zip="15222")
+    rows = [
+        {"name": "Bäckerei Müller", "city": "PITTSBURGH"},
+        {"name": "Bäckerei Müller", "zip": "19103"},
+        {"name": "Bäckerei Müller"},
+        {"name": "Bäckerei Müller", "city": "Erie"},
+        {"name": "Bäckerei Schmidt"},
+    ]
+    with SessionLocal() as db:
+        assert match_existing(db, rows) == [second, first, first, None, None]
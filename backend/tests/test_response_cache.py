@@ -0,0 +1,284 @@
+"""
+Response cache: both storage backends (the in-process LRU, and RedisBackend
+over FakeRedis, an in-memory stand-in for redis.Redis), TTL expiry, scope
+invalidation, the generation guard against bodies rendered across a catalog
+change, and the public business reads end to end.
+"""
+
+import fnmatch
+import threading
+import time
+
+import pytest
+from fastapi.testclient import TestClient
+
+from app import crud, models, schemas
+from app.database import SessionLocal
+from app.main import app
+from app.models_user import User, UserRole
+from app.response_cache import (
+    DetailScope,
+    ListingScope,
+    MemoryBackend,
+    RedisBackend,
+    ResponseCache,
+    listing_scope,
+    response_cache,
+)
+from app.spatial_index import IndexedBusiness, business_index
+
+
+class FakeRedis:
+    """The redis.Redis calls RedisBackend makes, in memory, with ``px`` expiry."""
+
+    def __init__(self) -> None:
+        self._lock = threading.Lock()
+        self._data = {}  # name -> (expires_at or None, value)
+
+    def _live(self, name: str):
+        entry = self._data.get(name)
+        if entry is not None and entry[0] is not None and entry[0] <= time.monotonic():
+            del self._data[name]
+            return None
+        return entry
+
+    def get(self, name: str):
+        with self._lock:
+            entry = self._live(name)
+            return None if entry is None else entry[1]
+
+    def set(self, name: str, value: bytes, px=None) -> bool:
+        with self._lock:
+            self._data[name] = (time.monotonic() + px / 1000 if px else None, value)
+            return True
+
+    def delete(self, *names: str) -> int:
+        with self._lock:
+            return sum(self._data.pop(name, None) is not None for name in names)
+
+    def scan_iter(self, match: str = "*"):
+        with self._lock:
+            names = [name for name in list(self._data) if self._live(name) and fnmatch.fnmatchcase(name, match)]
+        return iter(names)
+
+
+@pytest.fixture(params=["memory", "redis"])
+def backend(request):
+    return MemoryBackend() if request.param == "memory" else RedisBackend(client=FakeRedis())
+
+
+def _entry(business_id: int, lat: float = 39.95, lng: float = -75.16) -> IndexedBusiness:
+    return IndexedBusiness(business_id, f"Business {business_id}", lat, lng)
+
+
+def test_backend_round_trip(backend):
+    backend.set("a", b"1", 60)
+    backend.set("b", b"2", 60)
+    assert backend.get("a") == b"1" and backend.get("missing") is None
+    backend.delete(["a", "missing"])
+    assert backend.get("a") is None and backend.get("b") == b"2"
+    backend.clear()
+    assert backend.get("b") is None
+
+
+def test_backend_entries_expire(backend):
+    backend.set("short", b"1", 0.05)
+    backend.set("long", b"2", 60)
+    time.sleep(0.1)
+    assert backend.get("short") is None
+    assert backend.get("long") == b"2"
+
+
+def test_redis_backend_prefixes_keys_and_clears_only_its_own():
+    client = FakeRedis()
+    client.set("someone-else", b"x")
+    backend = RedisBackend(client=client)
+    backend.set("k", b"v", 60)
+    assert client.get(RedisBackend.PREFIX + "k") == b"v"
+    backend.clear()
+    assert client.get("someone-else") == b"x"
+    assert backend.get("k") is None
+
+
+def test_cache_ttl_expiry(backend):
+    cache = ResponseCache(backend, ttl=0.05)
+    key = cache.key("detail", {"id": 1}, 0)
+    cache.put(key, b"body", DetailScope(1), cache.generation)
+    assert cache.get(key) == b"body"
+    time.sleep(0.1)
+    assert cache.get(key) is None
+    assert (cache.hits, cache.misses) == (1, 1)
+
+
+def test_shared_backends_namespace_keys_by_catalog_version():
+    assert ResponseCache(MemoryBackend()).key("detail", {"id": 1}, 7) == "detail?id=1"
+    shared = ResponseCache(RedisBackend(client=FakeRedis()))
+    assert shared.key("detail", {"id": 1}, 7) != shared.key("detail", {"id": 1}, 8)
+
+
+def test_detail_scope():
+    scope = DetailScope(5)
+    assert scope.affected_by(5, None)
+    assert not scope.affected_by(6, _entry(6))
+
+
+def test_listing_scope_by_id():
+    # Second full page of a plain listing: ids 11..20.
+    scope = listing_scope(bbox=None, near=None, skip=0, after=(10,), keys=[(i,) for i in range(11, 21)], full=True)
+    assert scope.affected_by(15, None)  # on the page (deleted or changed)
+    assert not scope.affected_by(5, _entry(5))  # before the cursor
+    assert not scope.affected_by(25, _entry(25))  # after the last row of a full page
+    last_page = listing_scope(bbox=None, near=None, skip=0, after=(20,), keys=[(21,), (22,)], full=False)
+    assert last_page.affected_by(30, _entry(30))  # would be appended to a short page
+    offset = listing_scope(bbox=None, near=None, skip=20, after=None, keys=[(21,)], full=True)
+    assert offset.affected_by(1, _entry(1))  # every earlier row shifts an offset page
+
+
+def test_listing_scope_by_bbox_and_radius():
+    bbox = (-75.2, 39.9, -75.1, 40.0)
+    in_bbox = ListingScope(bbox=bbox, near=None, offset=False, member_ids=frozenset({1}), after=None, last=None)
+    assert in_bbox.affected_by(2, _entry(2, 39.95, -75.15))
+    assert not in_bbox.affected_by(3, _entry(3, 40.5, -75.15))  # outside the viewport
+    assert not in_bbox.affected_by(4, None)  # removed, and was not on the page
+    assert in_bbox.affected_by(1, None)  # removed from the page
+
+    center = (39.95, -75.15, 2.0)
+    near = ListingScope(bbox=None, near=center, offset=False, member_ids=frozenset({1}), after=None, last=(1.0, 1))
+    assert near.affected_by(5, _entry(5, 39.951, -75.15))  # ~0.1 km, sorts before the last row
+    assert not near.affected_by(6, _entry(6, 39.96, -75.15))  # ~1.1 km, after the last row of a full page
+    assert not near.affected_by(7, _entry(7, 40.2, -75.15))  # outside the radius
+
+
+def test_invalidate_drops_only_affected_entries(backend):
+    cache = ResponseCache(backend)
+    plain = listing_scope(bbox=None, near=None, skip=0, after=None, keys=[(1,), (2,)], full=True)
+    cache.put("detail-1", b"1", DetailScope(1), cache.generation)
+    cache.put("detail-2", b"2", DetailScope(2), cache.generation)
+    cache.put("list", b"[1,2]", plain, cache.generation)
+
+    cache.invalidate(2, _entry(2))
+    assert cache.get("detail-1") == b"1"
+    assert cache.get("detail-2") is None and cache.get("list") is None
+    assert cache.invalidations == 2
+
+    cache.invalidate(9, _entry(9))  # sorts after the full page, unrelated to detail 1
+    assert cache.get("detail-1") == b"1"
+
+
+def test_generation_guard_drops_bodies_rendered_across_a_change(backend):
+    cache = ResponseCache(backend)
+    generation = cache.generation
+    cache.invalidate(3, _entry(3))  # a write lands while the body is rendered
+    cache.put("detail-1", b"stale", DetailScope(1), generation)
+    assert cache.get("detail-1") is None
+
+    generation = cache.generation
+    cache.put("detail-1", b"fresh", DetailScope(1), generation)
+    assert cache.get("detail-1") == b"fresh"
+
+    generation = cache.generation
+    cache.clear()
+    cache.put("detail-1", b"stale", DetailScope(1), generation)
+    assert cache.get("detail-1") is None
+
+
+def test_forgotten_scopes_take_their_bodies_along(backend):
+    cache = ResponseCache(backend)
+    cache.max_scopes = 2
+    for i in range(3):
+        cache.put(f"detail-{i}", b"x", DetailScope(i), cache.generation)
+    assert cache.get("detail-0") is None  # could no longer be invalidated, so not served
+    assert cache.get("detail-2") == b"x"
+
+
+@pytest.fixture
+def api(fresh_db, backend, monkeypatch):
+    """TestClient with the app's response cache on ``backend``; searches go through SQL."""
+    monkeypatch.setattr(business_index, "enabled", False)
+    monkeypatch.setattr(response_cache, "backend", backend)
+    monkeypatch.setattr(response_cache, "enabled", True)
+    response_cache.clear()
+    with SessionLocal() as db:
+        db.add(User(id=1, email="admin@example.com", password_hash="x", role=UserRole.ADMIN))
+        db.commit()
+    with TestClient(app) as client:
+        yield client
+    response_cache.clear()
+
+
+def _create(name: str, lat: float, lng: float) -> int:
+    with SessionLocal() as db:
+        payload = schemas.SmallBusinessCreate(name=name, lat=lat, lng=lng, address1="1 Market St")
+        return crud.create_business(db, payload, approved=True).id
+
+
+def _rereview(business_id: int, hide_address: bool) -> None:
+    """Update an approved business the way re-approving its submission does."""
+    with SessionLocal() as db:
+        submission = models.BusinessSubmission(
+            owner_id=1, name="x", hide_address=hide_address, created_business_id=business_id
+        )
+        db.add(submission)
+        db.commit()
+        crud.approve_business_submission(db, submission.id, reviewer=db.get(User, 1))
+
+
+def _fetch(client: TestClient, url: str):
+    hits, misses = response_cache.hits, response_cache.misses
+    response = client.get(url)
+    return response, ("hit" if response_cache.hits > hits else "miss" if response_cache.misses > misses else None)
+
+
+def test_detail_is_invalidated_by_an_update(api):
+    business_id = _create("Corner Cafe", 39.95, -75.16)
+    other_id = _create("Far Away", 41.0, -74.0)
+    url = f"/api/businesses/{business_id}"
+    assert _fetch(api, url)[1] == "miss"
+    response, outcome = _fetch(api, url)
+    assert outcome == "hit" and response.json()["hide_address"] is False
+
+    _rereview(business_id, hide_address=True)
+    response, outcome = _fetch(api, url)
+    assert outcome == "miss" and response.json()["hide_address"] is True
+
+    _rereview(other_id, hide_address=True)
+    # Locally only the changed business's entries go; a shared store moves every key to the new version.
+    assert _fetch(api, url)[1] == ("miss" if response_cache.backend.shared else "hit")
+
+
+def test_listing_is_invalidated_by_a_delete(api):
+    inside = [_create(f"Inside {i}", 39.95 + i / 1000, -75.16) for i in range(3)]
+    outside = _create("Outside", 41.0, -74.0)
+    url = "/api/businesses/?bbox=-75.2,39.9,-75.1,40.0"
+    response, outcome = _fetch(api, url)
+    assert outcome == "miss" and [b["id"] for b in response.json()] == inside
+    assert _fetch(api, url)[1] == "hit"
+
+    with SessionLocal() as db:
+        crud.delete_business(db, outside)
+    assert _fetch(api, url)[1] == ("miss" if response_cache.backend.shared else "hit")
+
+    with SessionLocal() as db:
+        crud.delete_business(db, inside[1])
+    response, outcome = _fetch(api, url)
+    assert outcome == "miss" and [b["id"] for b in response.json()] == [inside[0], inside[2]]
+    assert api.get(f"/api/businesses/{inside[1]}").status_code == 404
+
+
+def test_body_rendered_across_a_write_is_not_cached(api, monkeypatch):
+    business_id = _create("Corner Cafe", 39.95, -75.16)
+    other_id = _create("Elsewhere", 39.96, -75.17)
+    get_business = crud.get_business
+
+    def racing_get_business(db, requested_id):
+        found = get_business(db, requested_id)
+        business_index.discard(other_id)  # another request's write lands mid-render
+        return found
+
+    monkeypatch.setattr(crud, "get_business", racing_get_business)
+    url = f"/api/businesses/{business_id}"
+    assert _fetch(api, url)[1] == "miss"
+    assert _fetch(api, url)[1] == "miss"  # not stored, since it may predate the write
+    monkeypatch.setattr(crud, "get_business", get_business)
+    assert _fetch(api, url)[1] == "miss"
+    assert _fetch(api, url)[1] == "hit"
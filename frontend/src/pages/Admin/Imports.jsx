@@ -34,6 +34,9 @@ const statusBadgeClass = (status) => {
   }
 };
 
+// Items are fetched a page at a time; "Load more" follows next_cursor.
+const ITEM_PAGE_SIZE = 200;
+
 export default function AdminImports() {
   const { role, isAuthenticated } = useAuth();
   const isAdmin = role === 'ADMIN';
@@ -48,9 +51,13 @@ export default function AdminImports() {
 
   const [expanded, setExpanded] = useState({});
   const [batchItems, setBatchItems] = useState({});
+  const [itemPages, setItemPages] = useState({});
+  const [itemFilters, setItemFilters] = useState({});
   const [selected, setSelected] = useState({});
   const [editing, setEditing] = useState({});
   const [mergeTargets, setMergeTargets] = useState({});
+  const [progress, setProgress] = useState({});
+  const [regeocodeJobs, setRegeocodeJobs] = useState({});
 
   const loadBatches = useCallback(async () => {
     if (!isAdmin) return;
@@ -70,14 +77,95 @@ export default function AdminImports() {
     loadBatches();
   }, [loadBatches]);
 
-  const loadBatchItems = useCallback(async (batchId) => {
-    try {
-      const data = await fetchJson(`/api/imports/batches/${batchId}`);
-      setBatchItems((prev) => ({ ...prev, [batchId]: data.items || [] }));
-    } catch (e) {
-      setError(e.message || 'Failed to load batch items');
-    }
-  }, []);
+  // Uploads are imported in the background; poll their progress until they finish.
+  const processingIds = useMemo(
+    () => batches.filter((s) => s.batch.status === 'PROCESSING').map((s) => s.batch.id),
+    [batches]
+  );
+
+  useEffect(() => {
+    if (!processingIds.length) return undefined;
+    const timer = setInterval(async () => {
+      try {
+        const reports = await Promise.all(
+          processingIds.map((id) => fetchJson(`/api/imports/batches/${id}/progress`))
+        );
+        setProgress((prev) => {
+          const next = { ...prev };
+          reports.forEach((r) => {
+            next[r.batch_id] = r;
+          });
+          return next;
+        });
+        if (reports.some((r) => r.status !== 'PROCESSING')) {
+          await loadBatches();
+        }
+      } catch (e) {
+        setError(e.message || 'Failed to load import progress');
+      }
+    }, 2000);
+    return () => clearInterval(timer);
+  }, [processingIds, loadBatches]);
+
+  const loadBatchItems = useCallback(
+    async (batchId, { more = false, filters } = {}) => {
+      const { status = '', q = '', approximate = false } = filters || itemFilters[batchId] || {};
+      const params = new URLSearchParams({ limit: String(ITEM_PAGE_SIZE) });
+      if (status) params.set('status', status);
+      if (approximate) params.set('precision', 'ZIP');
+      if (q.trim()) params.set('q', q.trim());
+      const cursor = more ? itemPages[batchId]?.next_cursor : null;
+      if (cursor) params.set('cursor', cursor);
+      try {
+        const data = await fetchJson(`/api/imports/batches/${batchId}/items?${params}`);
+        const page = data.items || [];
+        setBatchItems((prev) => ({ ...prev, [batchId]: cursor ? [...(prev[batchId] || []), ...page] : page }));
+        setItemPages((prev) => ({ ...prev, [batchId]: { total: data.total, next_cursor: data.next_cursor } }));
+      } catch (e) {
+        setError(e.message || 'Failed to load batch items');
+      }
+    },
+    [itemFilters, itemPages]
+  );
+
+  // Batch re-geocode jobs also run in the background; poll them the same way.
+  const regeocodingIds = useMemo(
+    () => Object.values(regeocodeJobs).filter((job) => job.status === 'RUNNING').map((job) => job.batch_id),
+    [regeocodeJobs]
+  );
+
+  useEffect(() => {
+    if (!regeocodingIds.length) return undefined;
+    const timer = setInterval(async () => {
+      try {
+        const reports = await Promise.all(
+          regeocodingIds.map((id) => fetchJson(`/api/imports/batches/${id}/regeocode`))
+        );
+        setRegeocodeJobs((prev) => {
+          const next = { ...prev };
+          reports.forEach((r) => {
+            next[r.batch_id] = r;
+          });
+          return next;
+        });
+        const finished = reports.filter((r) => r.status !== 'RUNNING').map((r) => r.batch_id);
+        if (finished.length) {
+          await loadBatches();
+          await Promise.all(finished.filter((id) => expanded[id]).map((id) => loadBatchItems(id)));
+        }
+      } catch (e) {
+        setError(e.message || 'Failed to load re-geocode progress');
+      }
+    }, 2000);
+    return () => clearInterval(timer);
+  }, [regeocodingIds, loadBatches, loadBatchItems, expanded]);
+
+  const changeItemFilters = (batchId, patch) => {
+    const filters = { ...(itemFilters[batchId] || {}), ...patch };
+    setItemFilters((prev) => ({ ...prev, [batchId]: filters }));
+    setSelected((prev) => ({ ...prev, [batchId]: [] }));
+    loadBatchItems(batchId, { filters });
+  };
 
   const toggleBatch = async (batchId) => {
     const isOpen = !!expanded[batchId];
@@ -181,6 +269,38 @@ export default function AdminImports() {
     });
   };
 
+  const saveAllEdits = async (batchId) => {
+    const ids = (batchItems[batchId] || []).map((item) => item.id).filter((id) => editing[id]);
+    if (!ids.length) return;
+    setError('');
+    try {
+      const results = await fetchJson(`/api/imports/batches/${batchId}/items`, {
+        method: 'PATCH',
+        headers: { 'Content-Type': 'application/json' },
+        body: JSON.stringify(ids.map((id) => ({ id, ...editing[id] }))),
+      });
+      const failed = results.filter((result) => result.error);
+      results.filter((result) => !result.error).forEach((result) => cancelEdit(result.id));
+      if (failed.length) {
+        setError(failed.map((result) => `Item #${result.id}: ${result.error}`).join(' '));
+      }
+      await loadBatchItems(batchId);
+      await loadBatches();
+    } catch (e) {
+      setError(e.message || 'Update failed');
+    }
+  };
+
+  const regeocodeBatch = async (batchId) => {
+    setError('');
+    try {
+      const job = await fetchJson(`/api/imports/batches/${batchId}/regeocode`, { method: 'POST' });
+      setRegeocodeJobs((prev) => ({ ...prev, [batchId]: job }));
+    } catch (e) {
+      setError(e.message || 'Re-geocode failed');
+    }
+  };
+
   const handleRegeocode = async (itemId, batchId) => {
     setError('');
     try {
@@ -357,7 +477,37 @@ export default function AdminImports() {
                     <div className="font-semibold text-lg">Batch #{batch.id}</div>
                     <div className="text-xs opacity-70">
                       {batch.source_name || 'Untitled source'} | {batch.total_rows} rows
+                      {batch.geocode_lookups > 0 &&
+                        ` | geocode cache ${Math.round((100 * batch.geocode_cache_hits) / batch.geocode_lookups)}% hits`}
                     </div>
+                    {batch.status === 'PROCESSING' && (
+                      <div className="text-xs opacity-70">
+                        {(() => {
+                          const p = progress[batch.id];
+                          const processed = p ? p.processed_rows : batch.processed_rows;
+                          const expected = batch.expected_rows != null ? ` of ~${batch.expected_rows}` : '';
+                          const rate = p && p.rows_per_second ? `, ${Math.round(p.rows_per_second)} rows/s` : '';
+                          const eta = p && p.eta_seconds != null ? `, ~${Math.ceil(p.eta_seconds)}s left` : '';
+                          return `Importing: ${processed}${expected} rows read${rate}${eta}`;
+                        })()}
+                      </div>
+                    )}
+                    {regeocodeJobs[batch.id] && (
+                      <div className="text-xs opacity-70">
+                        {(() => {
+                          const job = regeocodeJobs[batch.id];
+                          if (job.status === 'RUNNING') {
+                            const eta = job.eta_seconds != null ? `, ~${Math.ceil(job.eta_seconds)}s left` : '';
+                            return `Re-geocoding: ${job.addresses_done} of ${job.addresses} addresses${eta}`;
+                          }
+                          if (job.status === 'FAILED') return `Re-geocode failed: ${job.error_message}`;
+                          return `Re-geocoded ${job.items} rows: ${job.located} located, ${job.failed} not found`;
+                        })()}
+                      </div>
+                    )}
+                    {batch.status === 'FAILED' && (
+                      <div className="text-xs text-red-400">Import failed: {batch.error_message}</div>
+                    )}
                   </div>
                   <div className="flex items-center gap-2">
                     <button
@@ -367,6 +517,16 @@ export default function AdminImports() {
                     >
                       {expanded[batch.id] ? 'Hide' : 'View'}
                     </button>
+                    {summary.needs_geocode + summary.needs_fix > 0 && batch.status !== 'PROCESSING' && (
+                      <button
+                        type="button"
+                        className="px-3 py-1 rounded-full btn-ghost"
+                        onClick={() => regeocodeBatch(batch.id)}
+                        disabled={regeocodeJobs[batch.id]?.status === 'RUNNING'}
+                      >
+                        Re-geocode unresolved
+                      </button>
+                    )}
                     <button
                       type="button"
                       className="px-3 py-1 rounded-full btn-primary"
@@ -406,11 +566,64 @@ export default function AdminImports() {
                       >
                         Reject selected
                       </button>
+                      {items.some((item) => editing[item.id]) && (
+                        <button
+                          type="button"
+                          className="px-3 py-1 rounded-full btn-primary"
+                          onClick={() => saveAllEdits(batch.id)}
+                        >
+                          Save all edits ({items.filter((item) => editing[item.id]).length})
+                        </button>
+                      )}
                       {hasSelected && (
                         <div className="text-xs opacity-70">Tip: only ready rows will auto approve.</div>
                       )}
                     </div>
 
+                    <div className="flex flex-wrap items-center gap-3 text-xs">
+                      <select
+                        className="px-2 py-1 rounded-lg"
+                        value={itemFilters[batch.id]?.status || ''}
+                        onChange={(e) => changeItemFilters(batch.id, { status: e.target.value })}
+                        aria-label="Filter by status"
+                      >
+                        <option value="">All statuses</option>
+                        {Object.entries(STATUS_LABELS).map(([value, label]) => (
+                          <option key={value} value={value}>
+                            {label}
+                          </option>
+                        ))}
+                      </select>
+                      <form
+                        onSubmit={(e) => {
+                          e.preventDefault();
+                          changeItemFilters(batch.id, { q: new FormData(e.currentTarget).get('q') || '' });
+                        }}
+                      >
+                        <input
+                          name="q"
+                          type="search"
+                          className="px-2 py-1 rounded-lg"
+                          placeholder="Search name or city"
+                          defaultValue={itemFilters[batch.id]?.q || ''}
+                          maxLength={200}
+                        />
+                      </form>
+                      <label className="flex items-center gap-1">
+                        <input
+                          type="checkbox"
+                          checked={!!itemFilters[batch.id]?.approximate}
+                          onChange={(e) => changeItemFilters(batch.id, { approximate: e.target.checked })}
+                        />
+                        Approximate coords only
+                      </label>
+                      {itemPages[batch.id] && (
+                        <span className="opacity-70">
+                          Showing {items.length} of {itemPages[batch.id].total}
+                        </span>
+                      )}
+                    </div>
+
                     <div className="overflow-auto border border-[var(--border)] rounded-lg">
                       <table className="min-w-full text-xs">
                         <thead>
@@ -456,6 +669,13 @@ export default function AdminImports() {
                                     {item.error_message && (
                                       <div className="text-[11px] text-red-300">{item.error_message}</div>
                                     )}
+                                    {item.status === 'DUPLICATE_PENDING' && item.duplicate_of_business_id && (
+                                      <div className="text-[11px] opacity-70">
+                                        Matches business #{item.duplicate_of_business_id}
+                                        {item.duplicate_confidence != null &&
+                                          ` (${Math.round(item.duplicate_confidence * 100)}% confidence)`}
+                                      </div>
+                                    )}
                                     {edit && (
                                       <div className="mt-2 grid gap-2">
                                         <input
@@ -572,7 +792,14 @@ export default function AdminImports() {
                                   </td>
                                   <td className="p-2">
                                     {item.lat != null && item.lng != null ? (
-                                      <span>{item.lat.toFixed(4)}, {item.lng.toFixed(4)}</span>
+                                      <span>
+                                        {item.lat.toFixed(4)}, {item.lng.toFixed(4)}
+                                        {item.geocode_precision === 'ZIP' && (
+                                          <span className="block text-orange-400" title="Placed at the ZIP code centroid">
+                                            approx. (ZIP)
+                                          </span>
+                                        )}
+                                      </span>
                                     ) : (
                                       <span>-</span>
                                     )}
@@ -654,6 +881,15 @@ export default function AdminImports() {
                         </tbody>
                       </table>
                     </div>
+                    {itemPages[batch.id]?.next_cursor && (
+                      <button
+                        type="button"
+                        className="px-3 py-1 rounded-full btn-ghost text-xs"
+                        onClick={() => loadBatchItems(batch.id, { more: true })}
+                      >
+                        Load more
+                      </button>
+                    )}
                   </div>
                 )}
               </div>